@@ -0,0 +1,188 @@
+"""Compare the query plans of the company evaluations listing with and without
+the managed indexes of the company_evaluations table.
+
+The benchmark seeds the table with generated evaluations, then explains the
+listing queries built by ratings.cruds.crud, for both orders of every sort,
+twice: with the single column company_id index the table used to have, and
+with the indexes declared on models.CompanyEvaluation, followed by the keyset
+pages deep into the listing. Everything runs in one transaction that is rolled
+back at the end, so the database is left untouched.
+
+Usage:
+    python -m benchmarks.company_evaluations_query_plans --rows 2000000
+"""
+
+# Python
+import argparse
+import time
+
+# SQLAlchemy
+from sqlalchemy import text
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.config.database import SessionLocal, engine
+
+
+SEED_EVALUATIONS = """
+INSERT INTO company_evaluations (
+    company_id, job_title, content_type, rating, career_development_rating,
+    diversity_equal_opportunity_rating, working_environment_rating, salary_rating,
+    job_location, applicant_email, start_date, salary, currency_type,
+    salary_frequency, recommended_a_friend, allows_remote_work, is_legally_company,
+    utility_counter, non_utility_counter, created_at, updated_at
+)
+SELECT
+    1 + i % :companies,
+    (ARRAY['Backend Engineer', 'Frontend Developer', 'Data Scientist',
+           'Product Manager', 'Qa Analyst'])[1 + i % 5],
+    'Evaluation number ' || i || ' ' || md5(i::text),
+    (1 + i % 9) / 2.0 + 0.5,
+    (ARRAY['Good', 'Regular', 'Bad'])[1 + i % 3],
+    (ARRAY['Good', 'Regular', 'Bad'])[1 + i / 3 % 3],
+    (ARRAY['Good', 'Regular', 'Bad'])[1 + i / 9 % 3],
+    (ARRAY['Good', 'Regular', 'Bad'])[1 + i / 27 % 3],
+    (ARRAY['Mexico', 'Colombia', 'Chile', 'Argentina', 'Peru'])[1 + i / 7 % 5],
+    'applicant' || i || '@example.com',
+    DATE '2020-01-01',
+    1000 + i % 5000,
+    'USD',
+    'Month',
+    i % 2,
+    i / 2 % 2,
+    1,
+    i % 97,
+    i % 13,
+    TIMESTAMP '2021-01-01' + i * INTERVAL '1 minute',
+    TIMESTAMP '2021-01-01' + i * INTERVAL '1 minute'
+FROM generate_series(1, :rows) AS i
+"""
+
+LISTING_QUERIES = {
+    "Sort by rating DESC": dict(rating="DESC"),
+    "Sort by rating ASC": dict(rating="ASC"),
+    "Sort by helpfulness DESC": dict(helpfulness="DESC"),
+    "Sort by helpfulness ASC": dict(helpfulness="ASC"),
+    "Sort by date DESC": dict(date="DESC"),
+    "Sort by date ASC": dict(date="ASC"),
+    "Filter by job title": dict(job_title="engineer"),
+    "Filter by content": dict(content_type="number 42"),
+    "Filter by job location": dict(job_location="olomb"),
+}
+
+
+def explain(session, query) -> str:
+    statement = query.compile(dialect=session.bind.dialect)
+    plan = session.connection().exec_driver_sql(
+        f"EXPLAIN (ANALYZE, COSTS OFF) {statement}", statement.params
+    )
+    return "\n".join(row[0] for row in plan)
+
+
+def explain_listing_queries(session, company_id: int, page_size: int):
+    for name, parameters in LISTING_QUERIES.items():
+        filters = dict(
+            job_title=None,
+            content_type=None,
+            job_location=None,
+            helpfulness=None,
+            rating=None,
+            date=None,
+        )
+        filters.update(parameters)
+        query = crud.select_company_evaluations_by_company_id(
+            company_id=company_id, **filters
+        ).limit(page_size)
+
+        print(f"--- {name}")
+        print(explain(session, query))
+        print()
+
+
+KEYSET_QUERIES = {
+    f"Keyset by {sort or 'id'} {order}": dict(sort=sort, order=order)
+    for sort in (None, "rating", "helpfulness", "date")
+    for order in ("DESC", "ASC")
+}
+
+
+def explain_keyset_queries(session, company_id: int, page_size: int, depth: int):
+    """Explain the keyset pages that start after the first depth evaluations"""
+    for name, parameters in KEYSET_QUERIES.items():
+        filters = dict(
+            company_id=company_id, job_title=None, content_type=None, job_location=None
+        )
+        skipped = session.execute(
+            crud.select_company_evaluations_by_cursor(
+                **filters, **parameters, cursor=None, size=depth
+            )
+        ).scalars()
+        cursor = crud.build_company_evaluations_cursor_page(
+            skipped.all(), **parameters, size=depth
+        )["next_cursor"]
+        query = crud.select_company_evaluations_by_cursor(
+            **filters, **parameters, cursor=cursor, size=page_size
+        )
+
+        print(f"--- {name}, after {depth} evaluations")
+        print(explain(session, query))
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--keyset-depth", type=int, default=5000)
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(engine)
+    managed_indexes = models.CompanyEvaluation.__table__.indexes
+
+    session = SessionLocal()
+    try:
+        print(f"Seeding {args.rows} company evaluations")
+        started_at = time.perf_counter()
+        session.execute(
+            text(SEED_EVALUATIONS), {"rows": args.rows, "companies": args.companies}
+        )
+        print(f"Seeded in {time.perf_counter() - started_at:.1f}s\n")
+
+        for index in managed_indexes:
+            session.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_company_evaluations_company_id "
+                "ON company_evaluations (company_id)"
+            )
+        )
+        session.execute(text("ANALYZE company_evaluations"))
+
+        print("========== Without the managed indexes ==========\n")
+        explain_listing_queries(session, company_id=1, page_size=args.page_size)
+
+        session.execute(text("DROP INDEX ix_company_evaluations_company_id"))
+        started_at = time.perf_counter()
+        for index in managed_indexes:
+            index.create(session.connection())
+        print(f"Managed indexes built in {time.perf_counter() - started_at:.1f}s\n")
+        session.execute(text("ANALYZE company_evaluations"))
+
+        print("========== With the managed indexes ==========\n")
+        explain_listing_queries(session, company_id=1, page_size=args.page_size)
+        explain_keyset_queries(
+            session,
+            company_id=1,
+            page_size=args.page_size,
+            depth=args.keyset_depth,
+        )
+
+    finally:
+        session.rollback()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
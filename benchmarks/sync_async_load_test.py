@@ -0,0 +1,157 @@
+"""Compare the requests per second and latency of the sync and async database stacks.
+
+The benchmark serves the same crud operations twice, once with sync handlers
+using SessionLocal and ratings.cruds.crud, which run in the threadpool, and
+once with async handlers using AsyncSessionLocal and ratings.cruds.async_crud.
+Both stacks are served by uvicorn in a background thread and loaded with the
+same amount of concurrent clients.
+
+Usage:
+    python -m benchmarks.sync_async_load_test --requests 5000 --concurrency 100
+"""
+
+# Python
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+# FastAPI
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI
+
+# Project
+from ratings.app import get_async_database_session, get_database_session
+from ratings.cruds import async_crud, crud
+
+
+app = FastAPI()
+
+ENDPOINTS = {
+    "General ratings": "/{stack}/companies/{company_id}/general-ratings",
+    "Company evaluations": "/{stack}/companies/{company_id}/company-evaluations",
+    "Postulation status": "/{stack}/postulation-status",
+}
+
+
+@app.get("/sync/companies/{company_id}/general-ratings")
+def sync_general_ratings(company_id: int, db=Depends(get_database_session)):
+    return crud.get_company_general_ratings(db=db, company_id=company_id)
+
+
+@app.get("/async/companies/{company_id}/general-ratings")
+async def async_general_ratings(
+    company_id: int, db=Depends(get_async_database_session)
+):
+    return await async_crud.get_company_general_ratings(db=db, company_id=company_id)
+
+
+@app.get("/sync/companies/{company_id}/company-evaluations")
+def sync_company_evaluations(company_id: int, db=Depends(get_database_session)):
+    return crud.get_company_evaluations_by_cursor(
+        db,
+        company_id=company_id,
+        job_title=None,
+        content_type=None,
+        job_location=None,
+        sort="date",
+        order="DESC",
+        cursor=None,
+        size=50,
+    )
+
+
+@app.get("/async/companies/{company_id}/company-evaluations")
+async def async_company_evaluations(
+    company_id: int, db=Depends(get_async_database_session)
+):
+    return await async_crud.get_company_evaluations_by_cursor(
+        db,
+        company_id=company_id,
+        job_title=None,
+        content_type=None,
+        job_location=None,
+        sort="date",
+        order="DESC",
+        cursor=None,
+        size=50,
+    )
+
+
+@app.get("/sync/postulation-status")
+def sync_postulation_status(db=Depends(get_database_session)):
+    return crud.get_all_postulations_status(db=db)
+
+
+@app.get("/async/postulation-status")
+async def async_postulation_status(db=Depends(get_async_database_session)):
+    return await async_crud.get_all_postulations_status(db=db)
+
+
+async def load(url: str, requests: int, concurrency: int):
+    latencies = []
+    pending = iter(range(requests))
+
+    async def client_loop(client: httpx.AsyncClient):
+        for _ in pending:
+            started_at = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started_at)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started_at = time.perf_counter()
+        await asyncio.gather(*[client_loop(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def serve(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.1)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--company-id", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = serve(args.port)
+    try:
+        print(f"{args.requests} requests, {args.concurrency} concurrent clients\n")
+        print(f"{'Endpoint':<22}{'Stack':<7}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, path in ENDPOINTS.items():
+            for stack in ("sync", "async"):
+                url = f"http://127.0.0.1:{args.port}" + path.format(
+                    stack=stack, company_id=args.company_id
+                )
+                # Warm up the connection pools before measuring
+                asyncio.run(load(url, args.concurrency, args.concurrency))
+                result = asyncio.run(load(url, args.requests, args.concurrency))
+                print(
+                    f"{name:<22}{stack:<7}{result['rps']:>10.0f}"
+                    f"{result['p50']:>10.1f}{result['p99']:>10.1f}"
+                )
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ CREATE DATABASE "jobplacement-ratings"
 
 \c jobplacement-ratings;
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE company_evaluations
 (
     id bigserial NOT NULL,
@@ -32,6 +34,11 @@ CREATE TABLE company_evaluations
     non_utility_counter BIGINT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', job_title), 'A') ||
+        setweight(to_tsvector('simple', content_type), 'B') ||
+        setweight(to_tsvector('simple', job_location), 'C')
+    ) STORED,
     PRIMARY KEY (id),
     CONSTRAINT career_development_rating_check CHECK (career_development_rating = ANY (ARRAY['Good', 'Regular', 'Bad'])),
     CONSTRAINT diversity_equal_opportunity_rating_check CHECK (diversity_equal_opportunity_rating = ANY (ARRAY['Good', 'Regular', 'Bad'])),
@@ -48,6 +55,60 @@ CREATE TABLE company_evaluations
 ALTER TABLE IF EXISTS company_evaluations
     OWNER to postgres;
 
+CREATE INDEX ix_company_evaluations_company_id_id ON company_evaluations (company_id, id);
+CREATE INDEX ix_company_evaluations_company_id_rating ON company_evaluations (company_id, rating, id);
+CREATE INDEX ix_company_evaluations_company_id_utility_counter ON company_evaluations (company_id, utility_counter, id);
+CREATE INDEX ix_company_evaluations_company_id_created_at ON company_evaluations (company_id, created_at, id);
+CREATE INDEX ix_company_evaluations_job_title_trgm ON company_evaluations USING gin (job_title gin_trgm_ops);
+CREATE INDEX ix_company_evaluations_content_type_trgm ON company_evaluations USING gin (content_type gin_trgm_ops);
+CREATE INDEX ix_company_evaluations_job_location_trgm ON company_evaluations USING gin (job_location gin_trgm_ops);
+CREATE INDEX ix_company_evaluations_search_vector ON company_evaluations USING gin (search_vector);
+
+CREATE TABLE company_rating_summaries
+(
+    company_id bigint NOT NULL,
+    total_reviews integer NOT NULL DEFAULT 0,
+    career_development_rating_sum integer NOT NULL DEFAULT 0,
+    diversity_equal_opportunity_rating_sum integer NOT NULL DEFAULT 0,
+    working_environment_rating_sum integer NOT NULL DEFAULT 0,
+    salary_rating_sum integer NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
+    career_development_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    diversity_equal_opportunity_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    working_environment_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    salary_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    company_rating_average double precision GENERATED ALWAYS AS ((career_development_rating_sum + diversity_equal_opportunity_rating_sum + working_environment_rating_sum + salary_rating_sum)::float / NULLIF(total_reviews * 4, 0)) STORED,
+    career_development_rating_average double precision GENERATED ALWAYS AS (career_development_rating_sum::float / NULLIF(total_reviews, 0)) STORED,
+    diversity_equal_opportunity_rating_average double precision GENERATED ALWAYS AS (diversity_equal_opportunity_rating_sum::float / NULLIF(total_reviews, 0)) STORED,
+    working_environment_rating_average double precision GENERATED ALWAYS AS (working_environment_rating_sum::float / NULLIF(total_reviews, 0)) STORED,
+    salary_rating_average double precision GENERATED ALWAYS AS (salary_rating_sum::float / NULLIF(total_reviews, 0)) STORED,
+    PRIMARY KEY (company_id)
+);
+
+CREATE INDEX ix_leaderboard_company_rating_average ON company_rating_summaries (company_rating_average DESC, total_reviews DESC, company_id) WHERE total_reviews > 0;
+CREATE INDEX ix_leaderboard_career_development_rating_average ON company_rating_summaries (career_development_rating_average DESC, total_reviews DESC, company_id) WHERE total_reviews > 0;
+CREATE INDEX ix_leaderboard_diversity_equal_opportunity_rating_average ON company_rating_summaries (diversity_equal_opportunity_rating_average DESC, total_reviews DESC, company_id) WHERE total_reviews > 0;
+CREATE INDEX ix_leaderboard_working_environment_rating_average ON company_rating_summaries (working_environment_rating_average DESC, total_reviews DESC, company_id) WHERE total_reviews > 0;
+CREATE INDEX ix_leaderboard_salary_rating_average ON company_rating_summaries (salary_rating_average DESC, total_reviews DESC, company_id) WHERE total_reviews > 0;
+
+CREATE TABLE company_rating_trends
+(
+    company_id bigint NOT NULL,
+    period_type VARCHAR(10) NOT NULL,
+    period_start DATE NOT NULL,
+    total_reviews integer NOT NULL DEFAULT 0,
+    career_development_rating_sum integer NOT NULL DEFAULT 0,
+    diversity_equal_opportunity_rating_sum integer NOT NULL DEFAULT 0,
+    working_environment_rating_sum integer NOT NULL DEFAULT 0,
+    salary_rating_sum integer NOT NULL DEFAULT 0,
+    career_development_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    diversity_equal_opportunity_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    working_environment_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    salary_rating_sum_of_squares integer NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
+    PRIMARY KEY (company_id, period_type, period_start)
+);
+
 CREATE TABLE postulation_status(
     id bigserial NOT NULL,
     name VARCHAR(70) NOT NULL,
@@ -78,6 +139,7 @@ CREATE TABLE applicants (
     FOREIGN KEY (postulation_status_id) REFERENCES postulation_status(id),
     CONSTRAINT tracking_code_unique UNIQUE (tracking_code)
 );
+CREATE INDEX ix_applicants_tracking_code_paternal_last_name ON applicants (tracking_code, paternal_last_name);
 
 CREATE TABLE reporting_reason_types(
     id bigserial NOT NULL,
@@ -159,6 +221,23 @@ CREATE TABLE recruitment_process_evaluations(
     CONSTRAINT recruitment_process_period_check CHECK (recruitment_process_period = ANY (ARRAY['Hour', 'Day','Week','Month','Year']))
 );
 
+CREATE TABLE outbox_events(
+    id bigserial NOT NULL,
+    event_type VARCHAR(70) NOT NULL,
+    payload JSONB NOT NULL,
+    idempotency_key VARCHAR(64) NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
+    delivered_at TIMESTAMP,
+    failed_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP(0)::TIMESTAMP,
+    PRIMARY KEY (id),
+    UNIQUE (idempotency_key)
+);
+
+CREATE INDEX ix_outbox_events_pending ON outbox_events (available_at, id) WHERE delivered_at IS NULL AND failed_at IS NULL;
+
 
 INSERT INTO postulation_status(name) VALUES ('Applied');
 INSERT INTO postulation_status(name) VALUES ('Interviews');
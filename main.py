@@ -1,14 +1,31 @@
-import uvicorn
+import argparse
+
+from ratings.config.server import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    run_development,
+    run_production,
+)
 
 
 def main():
 
-    uvicorn.run(
-        "ratings.app:app",
-        host='0.0.0.0',
-        port=8000,
-        reload=True,
+    parser = argparse.ArgumentParser(description="Serve the Jobplacement Ratings API")
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Development mode: a single process that reloads on code changes",
     )
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    args = parser.parse_args()
+
+    if args.reload:
+        run_development(host=args.host, port=args.port)
+    else:
+        run_production(host=args.host, port=args.port, workers=args.workers)
 
 
 if __name__ == "__main__":
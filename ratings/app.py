@@ -1,7 +1,8 @@
 # Python
 from typing import List, Optional
-import os
-import time
+import asyncio
+import re
+import tempfile
 
 
 # FastAPI
@@ -16,21 +17,54 @@ from fastapi import (
     Path,
     Body,
     Query,
+    Request,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_pagination import Page, add_pagination, paginate
-from fastapi.responses import JSONResponse
+from fastapi_pagination import Page, add_pagination
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, RedirectResponse
 from pydantic import EmailStr, HttpUrl
 
 # SQLAlchemy
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # Project
+from ratings.clients.upstream import upstream_client
 from ratings.routes import example_root
-from ratings.cruds import crud
+from ratings.cruds import async_crud, crud
+from ratings.cruds.vote_buffer import (
+    VOTE_BUFFER_ENABLED,
+    buffer_evaluation_vote,
+    vote_buffer,
+)
 from ratings.models import models
+from ratings.response_cache import (
+    COMPANY_RATINGS_TAG,
+    RESPONSE_CACHE_CONTROL,
+    RESPONSE_CACHE_ENABLED,
+    CacheRule,
+    ResponseCacheMiddleware,
+    company_tag,
+    response_cache,
+)
 from ratings.schemas import schemas
-from ratings.config.database import SessionLocal, engine
+from ratings.storage import storage
+from ratings.utils import enums
+from ratings.utils.bulk_import import BULK_IMPORT_MAX_SIZE, import_company_evaluations
+from ratings.utils.uploads import (
+    UPLOAD_REQUEST_MAX_SIZE,
+    RequestSizeLimitMiddleware,
+    StagedUploads,
+)
+from ratings.config.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    async_pool_stats,
+    engine,
+    pool_stats,
+)
 
 
 models.Base.metadata.create_all(engine)
@@ -40,6 +74,50 @@ app: FastAPI = FastAPI(
     title="Jobplacement - Ratings API",
 )
 
+# Read endpoints whose responses are cached, and the tags invalidating them
+RESPONSE_CACHE_RULES = [
+    CacheRule(
+        re.compile(r"/api/v1/companies/general-ratings"),
+        lambda match, query: [
+            company_tag(int(company_id))
+            for company_id in query.getlist("company_ids")
+            if company_id.isdigit()
+        ],
+    ),
+    CacheRule(
+        re.compile(r"/api/v1/companies/leaderboard"),
+        lambda match, query: [COMPANY_RATINGS_TAG],
+    ),
+    CacheRule(
+        re.compile(
+            r"/api/v1/companies/(?P<id>\d+)/(general-ratings|rating-trends|"
+            r"salary-insights|company-evaluations(/keyset|/search|/facets)?)"
+        ),
+        lambda match, query: [company_tag(int(match["id"]))],
+    ),
+    CacheRule(
+        re.compile(r"/api/v1/(reporting-reason-types|postulation-status)"),
+        lambda match, query: [],
+    ),
+]
+
+# Added before CORSMiddleware, so cached responses get the CORS headers too
+if RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=response_cache,
+        rules=RESPONSE_CACHE_RULES,
+        cache_control=RESPONSE_CACHE_CONTROL,
+    )
+
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_sizes={
+        "/api/v1/applicants": UPLOAD_REQUEST_MAX_SIZE,
+        "/api/v1/company-evaluations/bulk": BULK_IMPORT_MAX_SIZE,
+    },
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -49,7 +127,37 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def start_vote_buffer():
+    if VOTE_BUFFER_ENABLED:
+        vote_buffer.start()
+
+
+@app.on_event("shutdown")
+def stop_vote_buffer():
+    if VOTE_BUFFER_ENABLED:
+        vote_buffer.stop()
+
+
+@app.on_event("shutdown")
+async def close_upstream_client():
+    upstream_client.close()
+    await upstream_client.aclose()
+
+
+@app.on_event("shutdown")
+async def close_response_cache():
+    await response_cache.aclose()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
+
+
 def get_database_session():
+    # One session per request, so its identity map and its memo of lookups
+    # (see crud.memoize) are discarded with the request
     session_local_db = SessionLocal()
     try:
         yield session_local_db
@@ -57,59 +165,286 @@ def get_database_session():
         session_local_db.close()
 
 
+async def get_async_database_session():
+    async with AsyncSessionLocal() as async_session_db:
+        yield async_session_db
+
+
 # Companies Path operations
 
 
 @app.get(
-    path="/api/v1/companies/{id}/general-ratings",
+    path="/api/v1/companies/general-ratings",
     tags=["Companies"],
     status_code=status.HTTP_200_OK,
-    summary="Get the general ratings from a company",
+    summary="Get the general ratings from several companies",
 )
-def get_general_ratings(
-    session_local_db: Session = Depends(get_database_session),
-    id: int = Path(..., gt=0, example=1, title="Company ID"),
+async def get_companies_general_ratings(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    company_ids: List[int] = Query(
+        ...,
+        example=[1, 2],
+        title="Company IDs",
+        description=(
+            "IDs of the companies, repeated as company_ids=1&company_ids=2, "
+            f"up to {crud.GENERAL_RATINGS_MAX_COMPANIES}"
+        ),
+    ),
+    rating_mode: enums.RatingMode = Query(
+        default=enums.RatingMode.mean, description="mean, bayesian or wilson"
+    ),
 ):
+    """
+    This Path Operation returns the general ratings of several companies with
+    a single database query, in the order of the company IDs. Duplicated IDs
+    are returned once.
 
-    total_company_evaluations = crud.get_amount_of_company_evaluation_by_id(
-        db=session_local_db, company_id=id
-    )
-    gral_company_rating = crud.calculate_gral_company_rating(
-        db=session_local_db, company_id=id
-    )
-    gral_career_development_rating = crud.calculate_gral_career_development_rating(
-        db=session_local_db, company_id=id
+    # Parameters:
+    - Query parameters:
+        - **company_ids: List[int]** -> IDs of the companies, up to
+          GENERAL_RATINGS_MAX_COMPANIES (50 by default).
+        - **rating_mode: str** (optional) -> mean, bayesian or wilson, mean by
+          default. See the general ratings of a company.
+
+    # Returns:
+    - The company information and the general ratings of every company. The
+      company information is null for IDs unknown to the companies service.
+    """
+    company_ids = crud.parse_company_ids(company_ids)
+
+    general_ratings, companies_directory = await asyncio.gather(
+        async_crud.get_companies_general_ratings(
+            db=async_session_db, company_ids=company_ids, rating_mode=rating_mode
+        ),
+        crud.aget_companies_directory(),
     )
-    gral_diversity_equal_opportunity_rating = (
-        crud.calculate_gral_diversity_equal_opportunity_rating(
-            db=session_local_db, company_id=id
-        )
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "data": [
+                {
+                    "company_information": companies_directory.get(company_id),
+                    **general_ratings[company_id],
+                }
+                for company_id in company_ids
+            ],
+        },
     )
-    gral_working_environment_rating = crud.calculate_gral_working_environment_rating(
-        db=session_local_db, company_id=id
+
+
+@app.get(
+    path="/api/v1/companies/leaderboard",
+    tags=["Companies"],
+    status_code=status.HTTP_200_OK,
+    summary="Get the best rated companies",
+)
+async def get_company_leaderboard(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    criteria: enums.LeaderboardCriteria = Query(
+        default=enums.LeaderboardCriteria.overall,
+        description="Rating the companies are ranked by",
+    ),
+    min_reviews: int = Query(
+        default=1, ge=1, description="Minimum amount of evaluations of a company"
+    ),
+    size: int = Query(
+        default=10,
+        ge=1,
+        le=crud.LEADERBOARD_MAX_SIZE,
+        description="Amount of companies",
+    ),
+):
+    """
+    This Path Operation returns the best rated companies, read from the
+    precomputed averages of the company rating summaries.
+
+    # Parameters:
+    - Query parameters:
+        - **criteria: str** (optional) -> overall, career-development,
+          diversity-equal-opportunity, working-environment or salary.
+        - **min_reviews: int** (optional) -> 1 by default.
+        - **size: int** (optional) -> 10 by default, up to LEADERBOARD_MAX_SIZE.
+
+    # Returns:
+    - The position, the company information and the general ratings of every
+      company, best rated first. Ties are ranked by amount of evaluations.
+    - Companies are ranked by the unrounded **average** of the weights of the
+      criteria, also returned, while **company_rating** is the mean of the
+      rounded criteria ratings. Companies with the same company_rating can
+      therefore be in any order, and rounding can put a company above another
+      with a company_rating 0.1 higher.
+    """
+    summaries, companies_directory = await asyncio.gather(
+        async_crud.get_company_leaderboard(
+            db=async_session_db,
+            criteria=criteria,
+            min_reviews=min_reviews,
+            size=size,
+        ),
+        crud.aget_companies_directory(),
     )
-    gral_salary_rating = crud.calculate_gral_salary_rating(
-        db=session_local_db, company_id=id
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "data": [
+                {
+                    "position": position,
+                    "company_information": companies_directory.get(summary.company_id),
+                    "average": getattr(summary, crud.LEADERBOARD_AVERAGES[criteria]),
+                    **crud.build_general_ratings(summary),
+                }
+                for position, summary in enumerate(summaries, start=1)
+            ],
+        },
     )
 
-    company = crud.get_company_by_id(company_id=id)
+
+@app.get(
+    path="/api/v1/companies/{id}/general-ratings",
+    tags=["Companies"],
+    status_code=status.HTTP_200_OK,
+    summary="Get the general ratings from a company",
+)
+async def get_general_ratings(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, example=1, title="Company ID"),
+    rating_mode: enums.RatingMode = Query(
+        default=enums.RatingMode.mean, description="mean, bayesian or wilson"
+    ),
+):
+    """
+    This Path Operation returns the general ratings of a company.
+
+    # Parameters:
+    - Query parameters:
+        - **rating_mode: str** (optional) -> how the ratings of every criteria
+          are averaged:
+            - **mean**: plain average, the default.
+            - **bayesian**: average shrunk towards RATING_PRIOR_MEAN as if
+              RATING_PRIOR_WEIGHT more evaluations had that rating, so a few
+              evaluations can not outrank many.
+            - **wilson**: lower bound of the Wilson score interval of the
+              average, at the confidence of RATING_CONFIDENCE_Z.
+
+    # Returns:
+    - The company information, the amount of evaluations, the general rating
+      and the rating of every criteria.
+    """
+    general_ratings, company = await asyncio.gather(
+        async_crud.get_company_general_ratings(
+            db=async_session_db, company_id=id, rating_mode=rating_mode
+        ),
+        crud.aget_company_by_id(company_id=id),
+    )
 
     return JSONResponse(
         status_code=200,
         content={
             "data": {
                 "company_information": company,
-                "company_rating": gral_company_rating,
-                "total_reviews": total_company_evaluations,
-                "gral_career_development_rating": gral_career_development_rating,
-                "gral_diversity_equal_opportunity_rating": gral_diversity_equal_opportunity_rating,
-                "gral_working_environment_rating": gral_working_environment_rating,
-                "gral_salary_rating": gral_salary_rating,
+                **general_ratings,
             },
         },
     )
 
 
+@app.get(
+    path="/api/v1/companies/{id}/rating-trends",
+    tags=["Companies"],
+    status_code=status.HTTP_200_OK,
+    summary="Get the ratings from a company in each of the last weeks or months",
+)
+async def get_rating_trends(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, example=1, title="Company ID"),
+    period: enums.TrendPeriod = Query(
+        default=enums.TrendPeriod.month, description="week or month"
+    ),
+    periods: int = Query(
+        default=12,
+        ge=1,
+        le=crud.RATING_TRENDS_MAX_PERIODS,
+        description="Amount of periods, the current one included",
+    ),
+    rating_mode: enums.RatingMode = Query(
+        default=enums.RatingMode.mean, description="mean, bayesian or wilson"
+    ),
+):
+    """
+    This Path Operation returns the ratings of a company in each of the last
+    weeks or months, read from buckets updated when the evaluations are created.
+
+    # Parameters:
+    - Query parameters:
+        - **period: str** (optional) -> week, starting on Monday, or month,
+          month by default.
+        - **periods: int** (optional) -> 12 by default, up to
+          RATING_TRENDS_MAX_PERIODS.
+        - **rating_mode: str** (optional) -> mean, bayesian or wilson. See the
+          general ratings of a company.
+
+    # Returns:
+    - The first day, the amount of evaluations, the general rating and the
+      rating of every criteria of every period, oldest first. Periods without
+      evaluations are included with zero ratings.
+    """
+    if id not in await crud.aget_companies_directory():
+        raise HTTPException(status_code=404, detail="Company Not Found")
+
+    trends = await async_crud.get_company_rating_trends(
+        db=async_session_db,
+        company_id=id,
+        period=period,
+        periods=periods,
+        rating_mode=rating_mode,
+    )
+
+    return JSONResponse(status_code=200, content={"data": trends})
+
+
+@app.get(
+    path="/api/v1/companies/{id}/salary-insights",
+    tags=["Companies"],
+    status_code=status.HTTP_200_OK,
+    summary="Get the salary percentiles from a company",
+)
+async def get_salary_insights(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, example=1, title="Company ID"),
+    job_title: Optional[str] = Query(None, min_length=3, max_length=70),
+    currency: enums.CurrencyCodeISO4217 = Query(
+        default=enums.CurrencyCodeISO4217.usd,
+        description="Currency of the salaries",
+    ),
+):
+    """
+    This Path Operation returns the percentiles of the salaries of a company,
+    converted to a yearly amount in a currency.
+
+    # Parameters:
+    - Query parameters:
+        - **job_title: str** (optional) -> only the salaries of this job title.
+        - **currency: str** (optional) -> MXN, COP, CLP, USD or EUR, USD by
+          default. Salaries are converted with the exchange rates of
+          SALARY_FX_RATES, and hourly, daily, weekly and monthly salaries are
+          multiplied by the payments of a full time year.
+
+    # Returns:
+    - The amount, p25, median and p75 of all the salaries and of the salaries of
+      every job title, most reported job titles first.
+    """
+    if id not in await crud.aget_companies_directory():
+        raise HTTPException(status_code=404, detail="Company Not Found")
+
+    salary_insights = await async_crud.get_company_salary_insights(
+        db=async_session_db, company_id=id, job_title=job_title, currency=currency
+    )
+
+    return JSONResponse(status_code=200, content={"data": salary_insights})
+
+
 # Company Evaluations Path Operations
 
 
@@ -120,8 +455,8 @@ def get_general_ratings(
     response_model=Page[schemas.CompanyEvaluationOut],
     summary="Get Company Evaluations By Company ID",
 )
-def get_company_evaluations_by_company_id(
-    session_local_db: Session = Depends(get_database_session),
+async def get_company_evaluations_by_company_id(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
     id: int = Path(..., gt=0, title="Company ID", example=1, description="Company ID"),
     job_title: Optional[str] = Query(None, min_length=3, max_length=70),
     content_type: Optional[str] = Query(None, max_length=280),
@@ -130,9 +465,9 @@ def get_company_evaluations_by_company_id(
     rating: Optional[str] = Query(default=None, min_length=3, max_length=4),
     date: Optional[str] = Query(default=None, min_length=3, max_length=4),
 ):
-    if crud.check_company_id_exist(id) != -1:
-        company_evaluations = crud.get_company_evaluations_by_company_id(
-            session_local_db,
+    if id in await crud.aget_companies_directory():
+        page = await async_crud.get_company_evaluations_by_company_id(
+            async_session_db,
             company_id=id,
             job_title=job_title,
             content_type=content_type,
@@ -142,7 +477,7 @@ def get_company_evaluations_by_company_id(
             date=date,
         )
 
-        if len(company_evaluations) == 0:
+        if page.total == 0:
             return JSONResponse(
                 status_code=200,
                 content={
@@ -153,12 +488,172 @@ def get_company_evaluations_by_company_id(
     else:
         raise HTTPException(status_code=404, detail="Company Not Found")
 
-    return paginate(company_evaluations)
+    return page
 
 
 add_pagination(app)
 
 
+@app.get(
+    path="/api/v1/companies/{id}/company-evaluations/facets",
+    tags=["Company Evaluations"],
+    status_code=status.HTTP_200_OK,
+    summary="Get the facets of the Company Evaluations By Company ID",
+)
+async def get_company_evaluation_facets(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, title="Company ID", example=1, description="Company ID"),
+    job_title: Optional[str] = Query(None, min_length=3, max_length=70),
+    content_type: Optional[str] = Query(None, max_length=280),
+    job_location: Optional[str] = Query(None, max_length=70),
+):
+    """
+    This Path Operation returns, for the evaluations of a company matching the
+    filters of the listing, the amount of evaluations of every job location,
+    job title, remote work option and currency, computed with a single query.
+
+    # Parameters:
+    - Query parameters:
+        - **job_title: str** (optional) -> Text contained in the job title.
+        - **content_type: str** (optional) -> Text contained in the content.
+        - **job_location: str** (optional) -> Text contained in the job location.
+
+    # Returns:
+    - The total amount of evaluations matching the filters and, for every
+      facet, its most frequent values with their amount of evaluations, up to
+      EVALUATION_FACETS_MAX_VALUES (20 by default).
+    """
+    if id not in await crud.aget_companies_directory():
+        raise HTTPException(status_code=404, detail="Company Not Found")
+
+    facets = await async_crud.get_company_evaluation_facets(
+        async_session_db,
+        company_id=id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+    )
+
+    return JSONResponse(status_code=200, content={"data": facets})
+
+
+@app.get(
+    path="/api/v1/companies/{id}/company-evaluations/keyset",
+    tags=["Company Evaluations"],
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.CompanyEvaluationCursorPage,
+    summary="Get Company Evaluations By Company ID Using a Cursor",
+)
+async def get_company_evaluations_by_cursor(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, title="Company ID", example=1, description="Company ID"),
+    job_title: Optional[str] = Query(None, min_length=3, max_length=70),
+    content_type: Optional[str] = Query(None, max_length=280),
+    job_location: Optional[str] = Query(None, max_length=70),
+    sort: Optional[enums.CompanyEvaluationSort] = Query(default=None),
+    order: enums.SortOrder = Query(default=enums.SortOrder.desc),
+    cursor: Optional[str] = Query(default=None, max_length=200),
+    size: int = Query(50, ge=1, le=100, description="Page size"),
+):
+    """
+    This Path Operation returns the evaluations of a company one page at a time.
+
+    Every page costs the same no matter how deep it is, so prefer it over the
+    page number pagination to go through all the evaluations of a company.
+
+    # Parameters:
+    - Query parameters:
+        - **sort: str** (optional) -> rating, helpfulness or date. Evaluations are sorted by id when it is omitted.
+        - **order: str** (optional) -> ASC or DESC, DESC by default.
+        - **cursor: str** (optional) -> The next_cursor of the previous page. Omit it to get the first page.
+        - **size: int** (optional) -> Amount of evaluations per page.
+
+    # Returns:
+    - The evaluations of the page and the next_cursor, which is null on the last page.
+    """
+    if id not in await crud.aget_companies_directory():
+        raise HTTPException(status_code=404, detail="Company Not Found")
+
+    return await async_crud.get_company_evaluations_by_cursor(
+        async_session_db,
+        company_id=id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+        sort=sort.value if sort else None,
+        order=order.value,
+        cursor=cursor,
+        size=size,
+    )
+
+
+@app.get(
+    path="/api/v1/company-evaluations/search",
+    tags=["Company Evaluations"],
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.CompanyEvaluationSearchPage,
+    summary="Search the evaluations of every company",
+)
+async def search_company_evaluations(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    q: str = Query(..., min_length=1, max_length=100, example="remote work"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+):
+    """
+    This Path Operation searches the evaluations of every company.
+
+    Evaluations are matched by the words of their job title, content and job
+    location, and sorted by relevance, matches in the job title first. Every
+    word of the search has to match, and also matches the words starting with
+    it.
+
+    # Parameters:
+    - Query parameters:
+        - **q: str** -> Words to search.
+        - **page: int** (optional) -> Number of the page, 1 by default.
+        - **size: int** (optional) -> Amount of evaluations per page.
+
+    # Returns:
+    - The evaluations of the page with their rank and a snippet of their
+      content, HTML escaped with the matched words inside <mark> tags, and the
+      total amount of matching evaluations.
+    """
+    return await async_crud.search_company_evaluations(
+        async_session_db, search=q, company_id=None, page=page, size=size
+    )
+
+
+@app.get(
+    path="/api/v1/companies/{id}/company-evaluations/search",
+    tags=["Company Evaluations"],
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.CompanyEvaluationSearchPage,
+    summary="Search the evaluations of a company",
+)
+async def search_company_evaluations_by_company_id(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, title="Company ID", example=1, description="Company ID"),
+    q: str = Query(..., min_length=1, max_length=100, example="remote work"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+):
+    """
+    This Path Operation searches the evaluations of a company, like the search
+    of the evaluations of every company.
+
+    # Returns:
+    - The evaluations of the page with their rank and snippet, and the total
+      amount of matching evaluations of the company.
+    """
+    if id not in await crud.aget_companies_directory():
+        raise HTTPException(status_code=404, detail="Company Not Found")
+
+    return await async_crud.search_company_evaluations(
+        async_session_db, search=q, company_id=id, page=page, size=size
+    )
+
+
 @app.post(
     path="/api/v1/companies/{id}/company-evaluation",
     tags=["Company Evaluations"],
@@ -215,6 +710,47 @@ def create_company_evaluation(
     )
 
 
+@app.post(
+    path="/api/v1/company-evaluations/bulk",
+    tags=["Company Evaluations"],
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.CompanyEvaluationBulkReport,
+    summary="Import Many Company Evaluations from an NDJSON or CSV File",
+)
+async def bulk_create_company_evaluations(
+    request: Request,
+    format: enums.BulkImportFormat = Query(
+        default=enums.BulkImportFormat.ndjson, description="ndjson or csv"
+    ),
+    session_local_db: Session = Depends(get_database_session),
+):
+    """
+    This Path Operation imports the company evaluations of the request body,
+    one per line in NDJSON or one per row in CSV with a header row.
+
+    # Parameters:
+    - Request body: the fields of the company evaluation creation plus **company_id: int**.
+    - Query parameters:
+        - **format: str** (optional) -> ndjson or csv, ndjson by default.
+
+    # Returns:
+    - The amount of rows received, imported and rejected, the line and the errors
+      of every rejected row, and the rows imported per second. Valid rows are
+      imported even when other rows are rejected.
+    """
+    with tempfile.TemporaryFile() as file:
+        async for chunk in request.stream():
+            await run_in_threadpool(file.write, chunk)
+        file.seek(0)
+
+        return await run_in_threadpool(
+            import_company_evaluations,
+            db=session_local_db,
+            file=file,
+            format=format,
+        )
+
+
 @app.patch(
     path="/api/v1/company-evaluations/{id}/increase-utility-rating",
     tags=["Company Evaluations"],
@@ -232,13 +768,19 @@ def increse_evaluation_utility_rating(
         description="Company Evaluation ID",
     ),
 ):
-    company_evaluation = crud.get_company_evaluation_by_id(db=session_local_db, id=id)
+    if VOTE_BUFFER_ENABLED:
+        company_evaluation = buffer_evaluation_vote(
+            db=session_local_db, company_evaluation_id=id, counter="utility_counter"
+        )
+    else:
+        company_evaluation = crud.increse_evaluation_utility_rating(
+            db=session_local_db, company_evaluation_id=id
+        )
+
     if company_evaluation is None:
         raise HTTPException(status_code=404, detail="Company Evaluation Not Found")
 
-    return crud.increse_evaluation_utility_rating(
-        db=session_local_db, company_evaluation_id=id
-    )
+    return company_evaluation
 
 
 @app.patch(
@@ -258,14 +800,19 @@ def increse_evaluation_non_utility_rating(
         description="Company Evaluation ID",
     ),
 ):
+    if VOTE_BUFFER_ENABLED:
+        company_evaluation = buffer_evaluation_vote(
+            db=session_local_db, company_evaluation_id=id, counter="non_utility_counter"
+        )
+    else:
+        company_evaluation = crud.increase_evaluation_non_utility_rating(
+            db=session_local_db, company_evaluation_id=id
+        )
 
-    company_evaluation = crud.get_company_evaluation_by_id(db=session_local_db, id=id)
     if company_evaluation is None:
         raise HTTPException(status_code=404, detail="Company Evaluation Not Found")
 
-    return crud.increase_evaluation_non_utility_rating(
-        db=session_local_db, company_evaluation_id=id
-    )
+    return company_evaluation
 
 
 @app.post(
@@ -318,10 +865,10 @@ def create_a_company_evaluation_report(
     tags=["Reporting Reason Types"],
     summary="Get the List of Reporting Reason Types",
 )
-def get_reporting_reason_types(
-    session_local_db: Session = Depends(get_database_session),
+async def get_reporting_reason_types(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
 ):
-    return crud.get_all_reporting_reason_types(db=session_local_db)
+    return await async_crud.get_all_reporting_reason_types(db=async_session_db)
 
 
 # Applicants path operations
@@ -334,7 +881,7 @@ def get_reporting_reason_types(
     tags=["Applicants"],
     summary="Register an Applicant who applies to a vacancy.",
 )
-def register_applicants(
+async def register_applicants(
     vacancy_id: int = Form(..., gt=0, title="Vacancy ID", description="Vacancy ID"),
     name: str = Form(
         ..., max_length=40, title="Applicant Name", description="Applicant Name"
@@ -374,59 +921,83 @@ def register_applicants(
     ),
     session_local_db: Session = Depends(get_database_session),
 ):
-    if crud.check_vacancy_id_exist(vacancy_id=vacancy_id) != -1:
+    if vacancy_id in await crud.aget_vacancies_directory():
 
-        ROOT_DIR = os.getcwd()
-        # Save the cv files
-        if not cv_file:
+        # The cv and the motivation letter are only published once the
+        # applicant is inserted, and before it is committed, so a failed
+        # registration leaves no documents behind, and a registered applicant
+        # never misses them
+        async with StagedUploads() as documents:
             cv_file_name = None
+            if cv_file:
+                cv_file_name = await documents.stage(cv_file, prefix="cv")
 
-        elif cv_file.content_type not in ["application/pdf"]:
-            raise HTTPException(400, detail="Invalid document type")
-        else:
-            cv_file_name = f"cv_{int(time.time())}.pdf"
-            file_location_cv = f"/static/{cv_file_name}"
-            with open(ROOT_DIR + file_location_cv, "wb+") as file_object:
-                file_object.write(cv_file.file.read())
-
-        # Save the motivation letter
-        if not motivation_letter_file:
             motivation_letter_file_name = None
-
-        elif motivation_letter_file.content_type not in ["application/pdf"]:
-            raise HTTPException(400, detail="Invalid document type")
-
-        else:
-            motivation_letter_file_name = f"ml_{int(time.time())}.pdf"
-            file_location_motivation_letter = (
-                f"/static/{motivation_letter_file_name}.pdf"
+            if motivation_letter_file:
+                motivation_letter_file_name = await documents.stage(
+                    motivation_letter_file, prefix="ml"
+                )
+
+            applicant = await run_in_threadpool(
+                crud.create_applicant,
+                db=session_local_db,
+                vacancy_id=vacancy_id,
+                name=name,
+                paternal_last_name=paternal_last_name,
+                maternal_last_name=maternal_last_name,
+                email=email,
+                cellphone=cellphone,
+                linkedin_url=linkedin_url,
+                cv_url=cv_file_name,
+                motivation_letter_url=motivation_letter_file_name,
+                country=country,
+                city=city,
+                job_title=job_title,
+                company=company,
+                commit=False,
             )
-            with open(ROOT_DIR + file_location_motivation_letter, "wb+") as file_object:
-                file_object.write(motivation_letter_file.file.read())
 
-        applicant = crud.create_applicant(
-            db=session_local_db,
-            vacancy_id=vacancy_id,
-            name=name,
-            paternal_last_name=paternal_last_name,
-            maternal_last_name=maternal_last_name,
-            email=email,
-            cellphone=cellphone,
-            linkedin_url=linkedin_url,
-            cv_url=cv_file_name,
-            motivation_letter_url=motivation_letter_file_name,
-            country=country,
-            city=city,
-            job_title=job_title,
-            company=company,
+        return await run_in_threadpool(
+            crud.commit_applicant, db=session_local_db, applicant=applicant
         )
+    else:
+        raise HTTPException(status_code=404, detail="Vacancy Not Found")
 
-        # integration of applicant in enterprise database
-        crud.create_vacancy_applicant(vacancy_id=vacancy_id, applicant_id=applicant.id)
 
-        return applicant
+@app.get(
+    path="/api/v1/applicants/{id}/documents/{document}",
+    status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+    tags=["Applicants"],
+    summary="Download the CV or the Motivation Letter of an Applicant",
+)
+async def get_applicant_document(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
+    id: int = Path(..., gt=0, title="Applicant ID", description="Applicant ID"),
+    document: enums.ApplicantDocument = Path(
+        ..., title="Document", description="cv or motivation-letter"
+    ),
+):
+    """
+    This Path Operation redirects to the URL where the document can be downloaded,
+    so the file itself is never served by the API.
+
+    # Returns:
+    - A redirect to the document, which is a presigned URL when the documents are
+      stored in S3.
+    """
+    applicant = await async_crud.get_applicant_by_id(db=async_session_db, id=id)
+
+    if document == enums.ApplicantDocument.cv:
+        file_name = applicant.cv_url
     else:
-        raise HTTPException(status_code=404, detail="Vacancy Not Found")
+        file_name = applicant.motivation_letter_url
+
+    if not file_name:
+        raise HTTPException(status_code=404, detail="Document Not Found")
+
+    return RedirectResponse(
+        await storage.url(file_name), status_code=status.HTTP_307_TEMPORARY_REDIRECT
+    )
 
 
 @app.post(
@@ -468,7 +1039,7 @@ def create_recruitment_process_evaluation(
     request_body: schemas.RecruitmentProcessEvaluationCreate = Body(...),
     id: int = Path(..., gt=0, title="Company ID", description="Company ID"),
 ):
-    if crud.check_company_id_exist(company_id=id) == -1:
+    if crud.check_company_id_exist(company_id=id, db=session_local_db) == -1:
         raise HTTPException(status_code=404, detail="Company Not found")
 
     return crud.create_a_recruitment_process_evaluation(
@@ -481,8 +1052,8 @@ def create_recruitment_process_evaluation(
     tags=["Applicants"],
     status_code=status.HTTP_200_OK,
 )
-def get_application_process(
-    session_local_db: Session = Depends(get_database_session),
+async def get_application_process(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
     tracking_code: str = Path(
         ..., max_length=8, title="Tracking Code", description="Tracking Code"
     ),
@@ -491,18 +1062,15 @@ def get_application_process(
     ),
 ):
 
-    applicant_process = crud.get_application_process(
-        db=session_local_db,
+    applicant_process = await async_crud.get_application_process(
+        db=async_session_db,
         tracking_code=tracking_code,
         paternal_last_name=paternal_last_name,
     )
-    if applicant_process is None:
-        raise HTTPException(
-            status_code=404,
-            detail="Process Application Not Found, Please check your information",
-        )
+    vacancy = await crud.aget_vacancy_by_id(applicant_process["vacancy_id"])
 
-    return applicant_process
+    # Fields of the applicant win over the fields of the vacancy with its name
+    return {**vacancy, **applicant_process}
 
 
 @app.get(
@@ -512,11 +1080,11 @@ def get_application_process(
     tags=["Postulation status"],
     summary="Get a List of Postulation Status",
 )
-def get_postulation_status_list(
-    session_local_db: Session = Depends(get_database_session),
+async def get_postulation_status_list(
+    async_session_db: AsyncSession = Depends(get_async_database_session),
 ):
 
-    postulation_list = crud.get_all_postulations_status(db=session_local_db)
+    postulation_list = await async_crud.get_all_postulations_status(db=async_session_db)
     if len(postulation_list) == 0:
         return JSONResponse(
             status_code=200,
@@ -539,7 +1107,7 @@ def get_applicants_by_vacancy_id(
     session_local_db: Session = Depends(get_database_session),
     vacancy_id: int = Path(..., gt=0, title="Vacancy ID", description="Vacancy ID"),
 ):
-    if crud.check_vacancy_id_exist(vacancy_id=vacancy_id) != -1:
+    if crud.check_vacancy_id_exist(vacancy_id=vacancy_id, db=session_local_db) != -1:
         applicants = crud.get_applicants_by_vacancy_id(
             db=session_local_db, vacancy_id=vacancy_id
         )
@@ -613,3 +1181,28 @@ def get_applicant_by_id(
         applicant_id=id,
         postulation_status_id=postulation_status_id,
     )
+
+
+# Database path operations
+
+
+@app.get(
+    path="/api/v1/database/pool-stats",
+    status_code=status.HTTP_200_OK,
+    tags=["Database"],
+    summary="Get the Statistics of the Database Connection Pools",
+)
+async def get_database_pool_stats():
+    """
+    This Path Operation returns the state of the connection pools of the sync
+    and the async engine, to size them from data.
+
+    # Returns:
+    - For every pool: its configuration, the connections in use, idle and in
+      overflow, the checkout counters since the process started and the time
+      waited to check out a connection, in milliseconds.
+    """
+    return {
+        "sync": pool_stats.snapshot(engine.pool),
+        "async": async_pool_stats.snapshot(async_engine.sync_engine.pool),
+    }
@@ -0,0 +1,161 @@
+# Python
+import asyncio
+import os
+import random
+import time
+import weakref
+
+# Typing
+from typing import Dict, Optional
+
+# Third-party libraries
+import httpx
+
+# Dotenv
+from dotenv import load_dotenv
+
+
+load_dotenv()
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", 5))
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", 2))
+UPSTREAM_BACKOFF = float(os.getenv("UPSTREAM_BACKOFF", 0.2))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 20))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", 10)
+)
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+class UpstreamClient:
+    """HTTP client for the companies and vacancies services
+
+    Connections are kept alive in a pool shared by every request. Every call has
+    a timeout, and failed calls are retried with an exponential backoff with full
+    jitter. Requests are available both as blocking and as async methods.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        retries: int,
+        backoff: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+    ):
+        self.timeout = httpx.Timeout(timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client = httpx.Client(timeout=self.timeout, limits=self.limits)
+        # Async connections belong to the event loop that opened them
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def get_json(self, url: str):
+        return self.request("GET", url).json()
+
+    def post_json(self, url: str, json: Dict, headers: Optional[Dict] = None):
+        return self.request("POST", url, json=json, headers=headers).json()
+
+    async def aget_json(self, url: str):
+        response = await self.arequest("GET", url)
+        return response.json()
+
+    async def apost_json(self, url: str, json: Dict, headers: Optional[Dict] = None):
+        response = await self.arequest("POST", url, json=json, headers=headers)
+        return response.json()
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying it when it fails
+
+        Only GET requests, or requests with an Idempotency-Key header, are
+        retried, so a failed request is never applied twice upstream.
+
+        Returns:
+            httpx.Response: The successful response
+
+        Raises:
+            httpx.HTTPError: When the request fails after every retry
+        """
+        for attempt in range(self._attempts(method, kwargs.get("headers"))):
+            if attempt > 0:
+                time.sleep(self._backoff_delay(attempt))
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except httpx.TransportError as error:
+                last_error = error
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = self._status_error(response)
+                continue
+
+            response.raise_for_status()
+            return response
+
+        raise last_error
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Async version of request"""
+        client = self._get_async_client()
+
+        for attempt in range(self._attempts(method, kwargs.get("headers"))):
+            if attempt > 0:
+                await asyncio.sleep(self._backoff_delay(attempt))
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as error:
+                last_error = error
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = self._status_error(response)
+                continue
+
+            response.raise_for_status()
+            return response
+
+        raise last_error
+
+    def close(self):
+        self._client.close()
+
+    async def aclose(self):
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._async_clients[loop] = client
+        return client
+
+    def _attempts(self, method: str, headers: Optional[Dict]) -> int:
+        if method == "GET" or (headers and "Idempotency-Key" in headers):
+            return self.retries + 1
+        return 1
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff * 2 ** (attempt - 1))
+
+    def _status_error(self, response: httpx.Response) -> httpx.HTTPStatusError:
+        return httpx.HTTPStatusError(
+            f"Upstream responded {response.status_code}",
+            request=response.request,
+            response=response,
+        )
+
+
+upstream_client = UpstreamClient(
+    timeout=UPSTREAM_TIMEOUT,
+    retries=UPSTREAM_RETRIES,
+    backoff=UPSTREAM_BACKOFF,
+    max_connections=UPSTREAM_MAX_CONNECTIONS,
+    max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+)
@@ -0,0 +1,44 @@
+"""Build the company rating trend buckets from the existing company evaluations.
+
+The evaluations are streamed in ID order, so the command can run on a live
+database: writes are only blocked while the buckets are emptied.
+
+Usage:
+    python -m ratings.commands.backfill_company_rating_trends
+    python -m ratings.commands.backfill_company_rating_trends --batch-size 50000
+"""
+
+# Python
+import argparse
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.config.database import SessionLocal, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Range of evaluation IDs aggregated per transaction",
+    )
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(engine)
+
+    session_local_db = SessionLocal()
+    try:
+        evaluations = crud.backfill_company_rating_trends(
+            db=session_local_db, batch_size=args.batch_size
+        )
+    finally:
+        session_local_db.close()
+
+    print(f"{evaluations} company evaluations were added to the rating trends")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Create the columns and indexes declared on the models that are missing in the database.
+
+The tables created by create_all already have their columns and indexes, but
+the ones added to an existing table have to be created with this command.
+Indexes are created concurrently, so the tables keep accepting writes meanwhile.
+
+Usage:
+    python -m ratings.commands.create_indexes
+"""
+
+# SQLAlchemy
+from sqlalchemy import DDL, inspect
+from sqlalchemy.schema import CreateColumn
+
+# Project
+from ratings.models import models
+from ratings.config.database import engine
+
+
+def main():
+    models.Base.metadata.create_all(engine)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+        inspector = inspect(conn)
+        for table in models.Base.metadata.sorted_tables:
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                print(f"Adding column {table.name}.{column.name}")
+                conn.execute(
+                    DDL(
+                        f"ALTER TABLE {table.name} "
+                        f"ADD COLUMN {CreateColumn(column).compile(conn)}"
+                    )
+                )
+
+            existing_indexes = {
+                index["name"] for index in inspector.get_indexes(table.name)
+            }
+
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+
+                print(f"Creating index {index.name}")
+                index.dialect_options["postgresql"]["concurrently"] = True
+                index.create(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Import the company evaluations of an NDJSON or CSV file.
+
+Every row has the fields of the company evaluation creation plus company_id.
+Valid rows are imported even when other rows are rejected, and the rejected
+rows are reported with their line.
+
+Usage:
+    python -m ratings.commands.import_company_evaluations reviews.ndjson
+    python -m ratings.commands.import_company_evaluations reviews.csv --chunk-size 5000
+"""
+
+# Python
+import argparse
+import json
+
+# Project
+from ratings.models import models
+from ratings.utils import enums
+from ratings.utils.bulk_import import BULK_IMPORT_CHUNK_SIZE, import_company_evaluations
+from ratings.config.database import SessionLocal, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file")
+    parser.add_argument(
+        "--format",
+        choices=[format.value for format in enums.BulkImportFormat],
+        help="Format of the file, guessed from its extension by default",
+    )
+    parser.add_argument("--chunk-size", type=int, default=BULK_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.file.lower().endswith(".csv") else "ndjson")
+
+    models.Base.metadata.create_all(engine)
+
+    session_local_db = SessionLocal()
+    try:
+        with open(args.file, "rb") as file:
+            report = import_company_evaluations(
+                session_local_db,
+                file=file,
+                format=enums.BulkImportFormat(format),
+                chunk_size=args.chunk_size,
+            )
+    finally:
+        session_local_db.close()
+
+    for error in report["errors"]:
+        print(f"Line {error['line']}: {'; '.join(error['errors'])}")
+    print(json.dumps({key: value for key, value in report.items() if key != "errors"}))
+
+
+if __name__ == "__main__":
+    main()
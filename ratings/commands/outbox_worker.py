@@ -0,0 +1,70 @@
+"""Deliver the outbox events to the upstream services.
+
+Events are written to the outbox_events table in the same transaction as the
+change that causes them, and delivered by this worker once committed. Several
+workers can run at the same time.
+
+Usage:
+    python -m ratings.commands.outbox_worker
+    python -m ratings.commands.outbox_worker --once
+"""
+
+# Python
+import argparse
+import logging
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.cruds import outbox
+from ratings.models import models
+from ratings.config.database import SessionLocal, engine
+
+
+load_dotenv()
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--once", action="store_true", help="Deliver the pending events and exit"
+    )
+    parser.add_argument("--batch-size", type=int, default=outbox.OUTBOX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    models.Base.metadata.create_all(engine)
+
+    # Finish the batch in progress before exiting
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+
+    with ThreadPoolExecutor(outbox.OUTBOX_CONCURRENCY) as executor:
+        while not stopped.is_set():
+            session_local_db = SessionLocal()
+            try:
+                claimed, delivered = outbox.deliver_outbox_events(
+                    session_local_db, executor, batch_size=args.batch_size
+                )
+            finally:
+                session_local_db.close()
+
+            if claimed:
+                logging.info("Delivered %s of %s outbox events", delivered, claimed)
+
+            # A full batch means more events are probably waiting
+            if claimed < args.batch_size:
+                if args.once:
+                    break
+                stopped.wait(OUTBOX_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()
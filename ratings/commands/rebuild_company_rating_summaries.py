@@ -0,0 +1,26 @@
+"""Recompute the company rating summaries from the company evaluations.
+
+Usage:
+    python -m ratings.commands.rebuild_company_rating_summaries
+"""
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.config.database import SessionLocal, engine
+
+
+def main():
+    models.Base.metadata.create_all(engine)
+
+    session_local_db = SessionLocal()
+    try:
+        fixed_summaries = crud.rebuild_company_rating_summaries(db=session_local_db)
+    finally:
+        session_local_db.close()
+
+    print(f"{fixed_summaries} company rating summaries were rebuilt")
+
+
+if __name__ == "__main__":
+    main()
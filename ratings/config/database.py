@@ -3,12 +3,17 @@ import os
 
 # SQLAlchemy
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 # Dotenv
 from dotenv import load_dotenv
 
+# Project
+from ratings.config.pool_stats import PoolStats, instrumented_pool_class
+
 load_dotenv()
 
 DB_CONNECTION = os.getenv("DB_CONNECTION")
@@ -16,6 +21,17 @@ DB_USERNAME = os.getenv("DB_USERNAME")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_DATABASE = os.getenv("DB_DATABASE")
+ASYNC_DB_CONNECTION = os.getenv("ASYNC_DB_CONNECTION", "postgresql+asyncpg")
+
+# Every process has a pool for each engine. The read endpoints use the async
+# engine, the writes, the commands and the outbox worker the sync one.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 3))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 2))
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", 5))
+DB_ASYNC_MAX_OVERFLOW = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
 
 SQLALCHEMY_DATABASE_URL = (
     DB_CONNECTION
@@ -29,10 +45,52 @@ SQLALCHEMY_DATABASE_URL = (
     + DB_DATABASE
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+SQLALCHEMY_ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    DB_CONNECTION, ASYNC_DB_CONNECTION, 1
+)
+
+# Most connections a process can open, adding up both pools
+DB_MAX_CONNECTIONS_PER_PROCESS = (
+    DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW
+)
+
+POOL_OPTIONS = dict(
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=instrumented_pool_class(QueuePool, pool_stats),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    **POOL_OPTIONS,
+)
+pool_stats.listen(engine)
+
+async_engine = create_async_engine(
+    SQLALCHEMY_ASYNC_DATABASE_URL,
+    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_stats),
+    pool_size=DB_ASYNC_POOL_SIZE,
+    max_overflow=DB_ASYNC_MAX_OVERFLOW,
+    **POOL_OPTIONS,
+)
+async_pool_stats.listen(async_engine.sync_engine)
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 Base = declarative_base()
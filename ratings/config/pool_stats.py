@@ -0,0 +1,139 @@
+# Python
+import threading
+import time
+from collections import deque
+from typing import Dict, Type
+
+# SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStats:
+    """Counters of the connections checked out from a pool and the time waited for them
+
+    The counters are updated by the pool events of the engine and by the
+    instrumented pool class, so they survive the pool being recreated.
+    """
+
+    def __init__(self, recent_waits: int = 1000):
+        """
+        Args:
+            recent_waits (int): Amount of recent checkouts used to compute the
+                percentiles of the wait time.
+        """
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.max_in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._recent_waits = deque(maxlen=recent_waits)
+        self._lock = threading.Lock()
+
+    def listen(self, engine):
+        """Update the counters with the pool events of an engine"""
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_wait(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self._recent_waits.append(wait)
+
+    def snapshot(self, pool: QueuePool) -> Dict:
+        """Return the current state of the pool together with the counters
+
+        Args:
+            pool (QueuePool): Current pool of the engine.
+
+        Returns:
+            Dict: Pool configuration, connections in use and wait times in milliseconds
+        """
+        with self._lock:
+            recent_waits = sorted(self._recent_waits)
+            counters = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "max_in_use": self.max_in_use,
+            }
+            total_wait = self.total_wait
+            max_wait = self.max_wait
+
+        def percentile(value: float) -> float:
+            if not recent_waits:
+                return 0.0
+            index = min(len(recent_waits) - 1, int(len(recent_waits) * value))
+            return round(recent_waits[index] * 1000, 3)
+
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **counters,
+            "wait_ms": {
+                "average": round(total_wait / counters["checkouts"] * 1000, 3)
+                if counters["checkouts"]
+                else 0.0,
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(max_wait * 1000, 3),
+            },
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.max_in_use = max(self.max_in_use, self.checkouts - self.checkins)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+
+def instrumented_pool_class(
+    pool_class: Type[QueuePool], stats: PoolStats
+) -> Type[QueuePool]:
+    """Return a subclass of a queue pool that records how long checkouts wait
+
+    Args:
+        pool_class (Type[QueuePool]): QueuePool or one of its subclasses.
+        stats (PoolStats): Stats where the wait times are recorded.
+    """
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except TimeoutError:
+                stats.record_wait(time.perf_counter() - started_at, timed_out=True)
+                raise
+            stats.record_wait(time.perf_counter() - started_at)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
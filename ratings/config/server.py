@@ -0,0 +1,123 @@
+# Python
+import logging
+import multiprocessing
+import os
+
+# Server
+import uvicorn
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.config.database import DB_MAX_CONNECTIONS_PER_PROCESS, engine
+from ratings.response_cache import RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_ENABLED
+
+load_dotenv()
+
+APP = "ratings.app:app"
+
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", min(multiprocessing.cpu_count(), 4)))
+SERVER_LOOP = os.getenv("SERVER_LOOP", "uvloop")
+SERVER_HTTP = os.getenv("SERVER_HTTP", "httptools")
+SERVER_PRELOAD = os.getenv("SERVER_PRELOAD", "true").lower() == "true"
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", 60))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", 0))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 0))
+# Postgres connections the workers may open together, leaving the rest of
+# max_connections to the outbox worker, the commands and the superuser
+SERVER_DB_CONNECTIONS = int(os.getenv("SERVER_DB_CONNECTIONS", 80))
+
+logger = logging.getLogger(__name__)
+
+
+class RatingsUvicornWorker(UvicornWorker):
+    """Uvicorn worker using the event loop and HTTP parser set in the environment"""
+
+    CONFIG_KWARGS = {"loop": SERVER_LOOP, "http": SERVER_HTTP}
+
+
+def dispose_preloaded_connections(server):
+    """Close the database connections opened while preloading the app
+
+    The workers are forked from the master process, so connections opened by
+    the master would be shared by all of them.
+    """
+    engine.dispose()
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn master that serves the app with several uvicorn workers"""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from ratings.app import app
+
+        return app
+
+
+def run_production(host: str, port: int, workers: int):
+    """Serve the app with a gunicorn master and several uvicorn workers
+
+    Workers finish the requests in flight for up to SERVER_GRACEFUL_TIMEOUT
+    seconds on shutdown, and the app is imported once by the master before
+    forking them when SERVER_PRELOAD is enabled.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind.
+        workers (int): Amount of worker processes.
+
+    Raises:
+        RuntimeError: If several workers would keep their own memory response
+            cache, where the invalidations of one worker can't reach the others.
+    """
+    if RESPONSE_CACHE_ENABLED and RESPONSE_CACHE_BACKEND == "memory" and workers > 1:
+        raise RuntimeError(
+            f"The memory response cache can't be shared by {workers} workers. "
+            "Set RESPONSE_CACHE_BACKEND=redis, or SERVER_WORKERS=1."
+        )
+
+    if workers * DB_MAX_CONNECTIONS_PER_PROCESS > SERVER_DB_CONNECTIONS:
+        logger.warning(
+            "%s workers can open up to %s database connections, more than the "
+            "%s of SERVER_DB_CONNECTIONS. Lower SERVER_WORKERS or the DB_*POOL_SIZE "
+            "and DB_*MAX_OVERFLOW settings.",
+            workers,
+            workers * DB_MAX_CONNECTIONS_PER_PROCESS,
+            SERVER_DB_CONNECTIONS,
+        )
+
+    ProductionServer(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": f"{__name__}.RatingsUvicornWorker",
+            "preload_app": SERVER_PRELOAD,
+            "timeout": SERVER_TIMEOUT,
+            "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+            "keepalive": SERVER_KEEPALIVE,
+            "max_requests": SERVER_MAX_REQUESTS,
+            "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+            "when_ready": dispose_preloaded_connections,
+            "accesslog": "-",
+        }
+    ).run()
+
+
+def run_development(host: str, port: int):
+    """Serve the app with a single uvicorn process that reloads on code changes"""
+    uvicorn.run(APP, host=host, port=port, reload=True)
@@ -0,0 +1,314 @@
+# Python
+from datetime import date
+from typing import Dict, List, Optional
+
+# FastAPI
+from fastapi import HTTPException
+from fastapi_pagination.ext.async_sqlalchemy import paginate
+
+# SQLAlchemy
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.utils import enums
+
+
+# Async versions of the crud functions awaited by the read heavy endpoints.
+# The statements are built by ratings.cruds.crud, so both versions always
+# run the same SQL. Writes only have the sync versions of ratings.cruds.crud.
+
+
+async def get_company_general_ratings(
+    db: AsyncSession,
+    company_id: int,
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> Dict:
+    """Async version of crud.get_company_general_ratings"""
+    try:
+        summary = await db.get(models.CompanyRatingSummary, company_id)
+
+        if summary is None:
+            summary = (
+                await db.execute(
+                    select(*crud.company_rating_aggregates()).where(
+                        models.CompanyEvaluation.company_id == company_id
+                    )
+                )
+            ).one()
+
+        return crud.build_general_ratings(summary, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_companies_general_ratings(
+    db: AsyncSession,
+    company_ids: List[int],
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> Dict[int, Dict]:
+    """Async version of crud.get_companies_general_ratings"""
+    try:
+        summaries = {
+            summary.company_id: summary
+            for summary in (
+                await db.execute(crud.select_company_rating_summaries(company_ids))
+            )
+            .scalars()
+            .all()
+        }
+
+        missing_company_ids = [
+            company_id for company_id in company_ids if company_id not in summaries
+        ]
+        if missing_company_ids:
+            summaries.update(
+                (row.company_id, row)
+                for row in await db.execute(
+                    crud.select_company_rating_aggregates(missing_company_ids)
+                )
+            )
+
+        return crud.build_companies_general_ratings(company_ids, summaries, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_company_leaderboard(
+    db: AsyncSession,
+    criteria: enums.LeaderboardCriteria,
+    min_reviews: int,
+    size: int,
+) -> List:
+    """Async version of crud.get_company_leaderboard"""
+    try:
+        return (
+            (
+                await db.execute(
+                    crud.select_company_leaderboard(criteria, min_reviews, size)
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_company_rating_trends(
+    db: AsyncSession,
+    company_id: int,
+    period: enums.TrendPeriod,
+    periods: int,
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> List[Dict]:
+    """Async version of crud.get_company_rating_trends"""
+    period_starts = crud.rating_trend_period_starts(period, periods, date.today())
+
+    try:
+        trends = (
+            (
+                await db.execute(
+                    crud.select_company_rating_trends(
+                        company_id, period, period_starts[0]
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        return crud.build_company_rating_trends(period_starts, trends, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_company_salary_insights(
+    db: AsyncSession,
+    company_id: int,
+    job_title: Optional[str],
+    currency: enums.CurrencyCodeISO4217,
+) -> Dict:
+    """Async version of crud.get_company_salary_insights"""
+    if currency.value not in crud.SALARY_FX_RATES:
+        raise HTTPException(status_code=400, detail="Currency Without Exchange Rate")
+
+    try:
+        rows = (
+            await db.execute(
+                crud.select_company_salary_insights(company_id, job_title, currency)
+            )
+        ).all()
+
+        return crud.build_salary_insights(rows, currency)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_company_evaluations_by_company_id(
+    db: AsyncSession,
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+    helpfulness: Optional[str],
+    rating: Optional[str],
+    date: Optional[str],
+):
+    """Return a page of the company evaluations matching the filters
+
+    Returns:
+        Page: Evaluations of the requested page and the total of evaluations
+    """
+    query = crud.select_company_evaluations_by_company_id(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+        helpfulness=helpfulness,
+        rating=rating,
+        date=date,
+    )
+
+    try:
+        return await paginate(db, query)
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_company_evaluation_facets(
+    db: AsyncSession,
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+) -> Dict:
+    """Async version of crud.get_company_evaluation_facets"""
+    query = crud.select_company_evaluation_facets(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+    )
+
+    try:
+        rows = (await db.execute(query)).all()
+    except SQLAlchemyError as error:
+        raise error
+
+    return crud.build_company_evaluation_facets(rows)
+
+
+async def get_company_evaluations_by_cursor(
+    db: AsyncSession,
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+    sort: Optional[str],
+    order: str,
+    cursor: Optional[str],
+    size: int,
+) -> Dict:
+    """Async version of crud.get_company_evaluations_by_cursor"""
+    query = crud.select_company_evaluations_by_cursor(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+        sort=sort,
+        order=order,
+        cursor=cursor,
+        size=size,
+    )
+
+    try:
+        company_evaluations = (await db.execute(query)).scalars().all()
+    except SQLAlchemyError as error:
+        raise error
+
+    return crud.build_company_evaluations_cursor_page(
+        company_evaluations, sort=sort, order=order, size=size
+    )
+
+
+async def search_company_evaluations(
+    db: AsyncSession, search: str, company_id: Optional[int], page: int, size: int
+) -> Dict:
+    """Async version of crud.search_company_evaluations"""
+    crud.check_search(search)
+    query = crud.select_company_evaluations_search(
+        search=search, company_id=company_id, page=page, size=size
+    )
+
+    total = 0
+    try:
+        rows = (await db.execute(query)).all()
+        if not rows and page > 1:
+            total = (
+                await db.execute(
+                    crud.select_company_evaluations_search_total(
+                        search=search, company_id=company_id
+                    )
+                )
+            ).scalar_one()
+    except SQLAlchemyError as error:
+        raise error
+
+    return crud.build_company_evaluations_search_page(
+        rows, page=page, size=size, total=total
+    )
+
+
+async def get_all_reporting_reason_types(db: AsyncSession) -> List[Dict]:
+    return (await db.execute(select(models.ReportingReasonType))).scalars().all()
+
+
+async def get_all_postulations_status(db: AsyncSession):
+    try:
+        return (await db.execute(select(models.PostulationStatus))).scalars().all()
+    except SQLAlchemyError as error:
+        raise error
+
+
+async def get_application_process(
+    db: AsyncSession, tracking_code: str, paternal_last_name: str
+):
+    """Async version of crud.get_application_process"""
+    query = crud.select_application_process(
+        tracking_code=tracking_code, paternal_last_name=paternal_last_name
+    )
+
+    try:
+        applicantion_process = (await db.execute(query)).unique().scalars().first()
+    except SQLAlchemyError as error:
+        raise error
+
+    return crud.build_application_process(applicantion_process)
+
+
+async def get_applicant_by_id(db: AsyncSession, id: int):
+    try:
+        applicant = (
+            (
+                await db.execute(
+                    crud.select_applicants().where(models.Applicant.id == id)
+                )
+            )
+            .scalars()
+            .first()
+        )
+        if applicant != None:
+            return applicant
+        else:
+            raise HTTPException(status_code=404, detail="Applicant Not Found")
+    except SQLAlchemyError as error:
+        raise error
@@ -1,42 +1,211 @@
 # Python
+import html
+import json
 import os
-import functools
-import operator
+import re
+import time
+import uuid
+from collections import defaultdict
+from types import SimpleNamespace
+from decimal import Decimal
 
 # Typing
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
 
 # Third-party libraries
+import httpx
 from fastapi import HTTPException
-from datetime import datetime
-from pydantic import EmailStr, HttpUrl
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import asc, desc
+from datetime import date, datetime, timedelta
+from pydantic import EmailStr, HttpUrl, ValidationError
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Insert, Select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    asc,
+    desc,
+    case,
+    column,
+    delete,
+    exists,
+    func,
+)
+from sqlalchemy import literal, literal_column, tuple_, type_coerce
+from sqlalchemy import select, text, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy import or_
 from sqlalchemy import and_
-import requests
 
 # Dotenv
 from dotenv import load_dotenv
 
 # Project
+from ratings.clients.upstream import upstream_client
 from ratings.models import models
+from ratings.response_cache import COMPANY_RATINGS_TAG, company_tag, response_cache
 from ratings.schemas import schemas
+from ratings.utils import enums
 from ratings.utils.utils import Util
+from ratings.utils.cache import TTLCache
 
 
 load_dotenv()
 COMPANIES_ENDPOINT = os.getenv("COMPANIES_ENDPOINT")
 VACANCIES_ENDPOINT = os.getenv("VACANCIES_ENDPOINT")
-AMOUNT_OF_COMPANY_CRITERIA = int(os.getenv("AMOUNT_OF_COMPANY_CRITERIA"))
+DIRECTORY_CACHE_TTL = float(os.getenv("DIRECTORY_CACHE_TTL", 300))
+DIRECTORY_CACHE_MAX_ENTRIES = int(os.getenv("DIRECTORY_CACHE_MAX_ENTRIES", 1024))
+BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", 1000))
+GENERAL_RATINGS_MAX_COMPANIES = int(os.getenv("GENERAL_RATINGS_MAX_COMPANIES", 50))
+LEADERBOARD_MAX_SIZE = int(os.getenv("LEADERBOARD_MAX_SIZE", 100))
+RATING_PRIOR_MEAN = float(os.getenv("RATING_PRIOR_MEAN", 3))
+RATING_PRIOR_WEIGHT = float(os.getenv("RATING_PRIOR_WEIGHT", 10))
+RATING_CONFIDENCE_Z = float(os.getenv("RATING_CONFIDENCE_Z", 1.96))
+RATING_TRENDS_MAX_PERIODS = int(os.getenv("RATING_TRENDS_MAX_PERIODS", 104))
+SEARCH_MAX_TERMS = int(os.getenv("SEARCH_MAX_TERMS", 8))
+EVALUATION_FACETS_MAX_VALUES = int(os.getenv("EVALUATION_FACETS_MAX_VALUES", 20))
+TRACKING_CODE_MAX_ATTEMPTS = int(os.getenv("TRACKING_CODE_MAX_ATTEMPTS", 5))
+# Value of one unit of every currency in a common reference currency
+SALARY_FX_RATES = json.loads(
+    os.getenv(
+        "SALARY_FX_RATES",
+        '{"USD": 1, "EUR": 1.08, "MXN": 0.055, "COP": 0.00025, "CLP": 0.0011}',
+    )
+)
+
+
+directory_cache = TTLCache(
+    ttl=DIRECTORY_CACHE_TTL, max_entries=DIRECTORY_CACHE_MAX_ENTRIES
+)
+
+
+def memoize(db: Optional[Session], key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the result of a lookup already made with the same session, or make it
+
+    Every request gets its own session, so a lookup repeated by the handler and
+    the crud functions of a request is only made once. Lookups finding nothing
+    (None) are not kept, so a later lookup finds what the request created since.
+
+    Args:
+        db (Optional[Session]): SQLAlchemy database session, None to always make
+            the lookup.
+        key (Hashable): Key of the lookup within the session.
+        loader (Callable[[], Any]): Function that makes the lookup.
+
+    Returns:
+        Any: The result of the lookup
+    """
+    if db is None:
+        return loader()
+
+    memo = db.info.setdefault("memo", {})
+    if key in memo:
+        return memo[key]
+
+    result = loader()
+    if result is not None:
+        memo[key] = result
+    return result
+
+
+def get_by_id(db: Session, model, id: int, options: Iterable = ()):
+    """Return an entity by primary key, looking it up once per session
+
+    The memo keeps a reference to the entity, which the identity map alone does
+    not, so it is not loaded again by a later lookup of the same request. Once
+    the session commits, the entity is refreshed on its next access as usual.
+
+    Lookups with other loader options are made again, so the options are
+    applied. Options are compared by identity, so lookups sharing them should
+    pass the same objects, like APPLICANT_LOADER_OPTIONS.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        model: Mapped class of the entity.
+        id (int): Primary key of the entity.
+        options (Iterable): Loader options of the lookup.
+    """
+    options = tuple(options)
+    return memoize(db, (model, id, options), lambda: db.get(model, id, options=options))
+
+
+def get_upstream_data(url: str):
+    """Request an upstream service and return the data of its response
+
+    Args:
+        url (str): URL of the upstream resource
+
+    Returns:
+        The data attribute of the JSON response
+    """
+    return upstream_client.get_json(url)["data"]
 
 
-def check_company_id_exist(company_id: int) -> int:
+async def aget_upstream_data(url: str):
+    """Async version of get_upstream_data"""
+    response = await upstream_client.aget_json(url)
+    return response["data"]
+
+
+def index_by_id(records: List[Dict]) -> Dict[int, Dict]:
+    return {record["id"]: record for record in records}
+
+
+def get_companies_directory(db: Optional[Session] = None) -> Dict[int, Dict]:
+    """Return the companies of the companies service indexed by id
+
+    The directory is cached in memory, so looking up a company does not request
+    the companies service until the cache entry expires, and memoized in the
+    session, so a request sees the same directory in all its lookups.
+    """
+    return memoize(
+        db,
+        "companies",
+        lambda: directory_cache.get(
+            "companies", lambda: index_by_id(get_upstream_data(COMPANIES_ENDPOINT))
+        ),
+    )
+
+
+async def aget_companies_directory() -> Dict[int, Dict]:
+    """Async version of get_companies_directory"""
+
+    async def load_companies():
+        return index_by_id(await aget_upstream_data(COMPANIES_ENDPOINT))
+
+    return await directory_cache.aget("companies", load_companies)
+
+
+def get_vacancies_directory(db: Optional[Session] = None) -> Dict[int, Dict]:
+    """Return the vacancies of the vacancies service indexed by id
+
+    See get_companies_directory.
+    """
+    return memoize(
+        db,
+        "vacancies",
+        lambda: directory_cache.get(
+            "vacancies", lambda: index_by_id(get_upstream_data(VACANCIES_ENDPOINT))
+        ),
+    )
+
+
+async def aget_vacancies_directory() -> Dict[int, Dict]:
+    """Async version of get_vacancies_directory"""
+
+    async def load_vacancies():
+        return index_by_id(await aget_upstream_data(VACANCIES_ENDPOINT))
+
+    return await directory_cache.aget("vacancies", load_vacancies)
+
+
+def check_company_id_exist(company_id: int, db: Optional[Session] = None) -> int:
     """Function to check if a company id exists
 
     Args:
         company_id (int): ID of the compnay to insert a company evaluation
+        db (Optional[Session]): Session of the request, to memoize the lookup.
 
     Returns:
         if company_id exist in the registers of companies
@@ -45,23 +214,18 @@ def check_company_id_exist(company_id: int) -> int:
             return int: -1 to indicate non-existence
     """
 
-    r = requests.get(COMPANIES_ENDPOINT)
-    companies_response = r.json()["data"]
-    list_of_company_ids = [company["id"] for company in companies_response]
-
-    try:
-        company_id = list_of_company_ids.index(company_id)
-    except:
-        company_id = -1
+    if company_id in get_companies_directory(db):
+        return company_id
 
-    return company_id
+    return -1
 
 
-def check_vacancy_id_exist(vacancy_id: int) -> int:
+def check_vacancy_id_exist(vacancy_id: int, db: Optional[Session] = None) -> int:
     """Function to check if a vacancy id exists
 
     Args:
         vacancy (int): ID of the compnay to insert a company evaluation
+        db (Optional[Session]): Session of the request, to memoize the lookup.
 
     Returns:
         if vacancy_id exist in the registers of companies
@@ -70,67 +234,116 @@ def check_vacancy_id_exist(vacancy_id: int) -> int:
             return int: -1 to indicate non-existence
     """
 
-    r = requests.get(VACANCIES_ENDPOINT)
-    vacancies_response = r.json()["data"]
-    list_of_company_ids = [vacancy["id"] for vacancy in vacancies_response]
+    if vacancy_id in get_vacancies_directory(db):
+        return vacancy_id
 
-    try:
-        company_id = list_of_company_ids.index(vacancy_id)
-    except:
-        company_id = -1
+    return -1
+
+
+def get_company_by_id(company_id: int, db: Optional[Session] = None):
+
+    if check_company_id_exist(company_id=company_id, db=db) != -1:
 
-    return company_id
+        return memoize(
+            db,
+            ("company", company_id),
+            lambda: directory_cache.get(
+                ("company", company_id),
+                lambda: get_upstream_data(f"{COMPANIES_ENDPOINT}/{company_id}"),
+            ),
+        )
+    else:
+        return None
 
 
-def get_company_by_id(company_id: int):
+async def aget_company_by_id(company_id: int):
+    """Async version of get_company_by_id"""
 
-    if check_company_id_exist(company_id=company_id) != -1:
+    if company_id in await aget_companies_directory():
 
-        request = requests.get(f"{COMPANIES_ENDPOINT}/{company_id}")
-        return request.json()["data"]
+        return await directory_cache.aget(
+            ("company", company_id),
+            lambda: aget_upstream_data(f"{COMPANIES_ENDPOINT}/{company_id}"),
+        )
     else:
         return None
 
 
-def create_vacancy_applicant(vacancy_id: int, applicant_id):
+def create_vacancy_applicant(
+    vacancy_id: int, applicant_id, idempotency_key: Optional[str] = None
+):
 
     headers = {"Content-Type": "application/json; charset=utf-8"}
+    if idempotency_key is not None:
+        headers["Idempotency-Key"] = idempotency_key
     data = {
         "vacancy_id": vacancy_id,
         "applicant_id": applicant_id,
     }
 
-    response = requests.post(
-        f"{VACANCIES_ENDPOINT}/{vacancy_id}/applications", json=data, headers=headers
+    # The body is ignored, the vacancies service may answer with an empty one
+    upstream_client.request(
+        "POST",
+        f"{VACANCIES_ENDPOINT}/{vacancy_id}/applications",
+        json=data,
+        headers=headers,
     )
-    print("Status Code", response.status_code)
-    print("----------------")
-    print("JSON Response ", response.json())
 
 
-def get_vacancy_by_id(vacancy_id: int) -> dict:
+def get_vacancy_by_id(vacancy_id: int, db: Optional[Session] = None) -> dict:
+    """Return a vacancy of the vacancies service
+
+    Only the vacancy is requested, instead of the whole directory, and it is
+    cached in memory like the directories.
+
+    Args:
+        vacancy_id (int): ID of the vacancy.
+        db (Optional[Session]): Session of the request, to memoize the lookup.
 
-    r = requests.get(VACANCIES_ENDPOINT)
-    vacancies_response = r.json()["data"]
-    vacancy = [vacancy for vacancy in vacancies_response if vacancy["id"] == vacancy_id]
+    Returns:
+        dict: The vacancy, a 404 error when it does not exist
+    """
+    try:
+        return memoize(
+            db,
+            ("vacancy", vacancy_id),
+            lambda: directory_cache.get(
+                ("vacancy", vacancy_id),
+                lambda: get_upstream_data(f"{VACANCIES_ENDPOINT}/{vacancy_id}"),
+            ),
+        )
+    except httpx.HTTPStatusError as error:
+        if error.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Vacancy Not Found")
+        raise
 
-    if vacancy == []:
-        raise HTTPException(status_code=404, detail="Vacancy Not Found")
 
-    return vacancy[0]
+async def aget_vacancy_by_id(vacancy_id: int) -> dict:
+    """Async version of get_vacancy_by_id"""
+    try:
+        return await directory_cache.aget(
+            ("vacancy", vacancy_id),
+            lambda: aget_upstream_data(f"{VACANCIES_ENDPOINT}/{vacancy_id}"),
+        )
+    except httpx.HTTPStatusError as error:
+        if error.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Vacancy Not Found")
+        raise
 
 
 def get_company_evaluation_by_id(db: Session, id: int):
-    return (
-        db.query(models.CompanyEvaluation)
-        .filter(models.CompanyEvaluation.id == id)
-        .first()
-    )
+    return get_by_id(db, models.CompanyEvaluation, id)
+
+
+# Loader options of the applicants, shared so that their lookups are memoized
+APPLICANT_LOADER_OPTIONS = (joinedload(models.Applicant.postulation_status),)
 
 
 def get_applicant_by_id(db: Session, id: int):
     try:
-        applicant = db.query(models.Applicant).filter(models.Applicant.id == id).first()
+        applicant = get_by_id(
+            db, models.Applicant, id, options=APPLICANT_LOADER_OPTIONS
+        )
         if applicant != None:
             return applicant
         else:
@@ -152,241 +365,1403 @@ def get_amount_of_company_evaluation_by_id(db: Session, company_id: int):
         raise error
 
 
-def get_career_development_rating_values_by_company_id(
-    db: Session, company_id: int
-) -> List:
-    result_query = (
-        db.query(models.CompanyEvaluation.career_development_rating)
-        .filter(models.CompanyEvaluation.company_id == company_id)
-        .all()
-    )
+COMPANY_RATING_CRITERIA = models.COMPANY_RATING_CRITERIA
+
+# Sufficient statistics of the weights of every criteria kept by the summaries
+COMPANY_RATING_SUMS = tuple(
+    column
+    for criteria in COMPANY_RATING_CRITERIA
+    for column in (f"{criteria}_sum", f"{criteria}_sum_of_squares")
+)
+
+
+def company_rating_weight(column):
+    """Return the SQL equivalent of Util.assign_weight for a company rating column
+
+    Args:
+        column: Column of the company evaluation holding a CompanyRatingType value
+
+    Returns:
+        Case: CASE expression that maps Good/Regular/Bad to its weight
+    """
+    return case(
+        {
+            rating_type.value: Util.assign_weight(rating_type.value)
+            for rating_type in enums.CompanyRatingType
+        },
+        value=column,
+        else_=0,
+    )
+
+
+def company_rating_aggregates() -> List:
+    """Return the columns that aggregate the ratings of the company evaluations
+
+    Returns:
+        List: Amount of evaluations and the sum of the weights and of the
+            squared weights of every criteria
+    """
+    aggregates = [func.count(models.CompanyEvaluation.id).label("total_reviews")]
+    for criteria in COMPANY_RATING_CRITERIA:
+        weight = company_rating_weight(getattr(models.CompanyEvaluation, criteria))
+        aggregates += [
+            func.coalesce(func.sum(weight), 0).label(f"{criteria}_sum"),
+            func.coalesce(func.sum(weight * weight), 0).label(
+                f"{criteria}_sum_of_squares"
+            ),
+        ]
+    return aggregates
+
+
+def criteria_rating(
+    total: int, sum_of_squares: int, count: int, rating_mode: enums.RatingMode
+) -> float:
+    """Return the rating of a criteria from the statistics of its weights
+
+    Args:
+        total (int): Sum of the weights.
+        sum_of_squares (int): Sum of the squared weights.
+        count (int): Amount of evaluations.
+        rating_mode (enums.RatingMode): mean, bayesian or wilson.
+
+    Returns:
+        float: Plain mean, Bayesian average towards RATING_PRIOR_MEAN or lower
+            bound of the Wilson score interval of the weights
+    """
+    if rating_mode == enums.RatingMode.bayesian:
+        return Util.bayesian_average(
+            total, count, RATING_PRIOR_MEAN, RATING_PRIOR_WEIGHT
+        )
+
+    if rating_mode == enums.RatingMode.wilson:
+        weights = [
+            Util.assign_weight(rating_type.value)
+            for rating_type in enums.CompanyRatingType
+        ]
+        return Util.wilson_lower_bound(
+            total,
+            sum_of_squares,
+            count,
+            min_weight=min(weights),
+            max_weight=max(weights),
+            z=RATING_CONFIDENCE_Z,
+        )
+
+    return total / count
+
+
+def build_general_ratings(
+    summary, rating_mode: enums.RatingMode = enums.RatingMode.mean
+) -> Dict:
+    """Build the general ratings of a company from its aggregated weights
+
+    Every mode is computed from the same statistics, so none of them reads
+    the evaluations.
+
+    Args:
+        summary: Company rating summary or aggregation row with the amount of
+            evaluations and the sums of COMPANY_RATING_SUMS
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        Dict: Amount of evaluations, general rating and the rating of every criteria
+    """
+    gral_ratings = {}
+    for criteria in COMPANY_RATING_CRITERIA:
+        gral_rating = 0
+        if summary.total_reviews > 0:
+            result = criteria_rating(
+                getattr(summary, f"{criteria}_sum"),
+                getattr(summary, f"{criteria}_sum_of_squares"),
+                summary.total_reviews,
+                rating_mode,
+            )
+            gral_rating = Util.round_values(result, 1)
+        gral_ratings[f"gral_{criteria}"] = gral_rating
+
+    company_rating = Util.round_values(
+        sum(gral_ratings.values()) / len(COMPANY_RATING_CRITERIA), 1
+    )
+
+    return {
+        "company_rating": company_rating,
+        "total_reviews": summary.total_reviews,
+        **gral_ratings,
+    }
+
+
+def get_company_general_ratings(
+    db: Session,
+    company_id: int,
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> Dict:
+    """Get the general ratings of a company
+
+    The ratings are read from the company rating summary, which is a primary key
+    lookup. Companies without a summary yet are aggregated in a single query.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_id (int): ID of the company.
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        Dict: Amount of evaluations, general rating and the rating of every criteria
+    """
+    try:
+        summary = db.get(models.CompanyRatingSummary, company_id)
+
+        if summary is None:
+            summary = db.execute(
+                select(*company_rating_aggregates()).where(
+                    models.CompanyEvaluation.company_id == company_id
+                )
+            ).one()
+
+        return build_general_ratings(summary, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+def parse_company_ids(company_ids: List[int]) -> List[int]:
+    """Validate the IDs of a batch of companies
+
+    Args:
+        company_ids (List[int]): IDs of the companies as requested.
+
+    Raises:
+        HTTPException: More than GENERAL_RATINGS_MAX_COMPANIES companies or an
+            ID that is not positive.
+
+    Returns:
+        List[int]: IDs of the companies without duplicates, in the requested order
+    """
+    company_ids = list(dict.fromkeys(company_ids))
+
+    if len(company_ids) > GENERAL_RATINGS_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {GENERAL_RATINGS_MAX_COMPANIES} companies can be requested at once",
+        )
+    if any(company_id <= 0 for company_id in company_ids):
+        raise HTTPException(status_code=400, detail="Invalid company ID")
+
+    return company_ids
+
+
+def select_company_rating_summaries(company_ids: List[int]) -> Select:
+    """Return the query of the rating summaries of several companies"""
+    return select(models.CompanyRatingSummary).where(
+        models.CompanyRatingSummary.company_id.in_(company_ids)
+    )
+
+
+def select_company_rating_aggregates(company_ids: List[int]) -> Select:
+    """Return the query that aggregates the ratings of several companies
+
+    Returns one row per company with evaluations, grouped by company_id.
+    """
+    return (
+        select(models.CompanyEvaluation.company_id, *company_rating_aggregates())
+        .where(models.CompanyEvaluation.company_id.in_(company_ids))
+        .group_by(models.CompanyEvaluation.company_id)
+    )
+
+
+def build_companies_general_ratings(
+    company_ids: List[int],
+    summaries: Dict[int, object],
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> Dict[int, Dict]:
+    """Build the general ratings of several companies
+
+    Args:
+        company_ids (List[int]): IDs of the companies.
+        summaries (Dict[int, object]): Summary or aggregation row of the
+            companies with evaluations, keyed by company ID.
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        Dict[int, Dict]: General ratings of every company, keyed by company ID
+    """
+    no_reviews = SimpleNamespace(
+        total_reviews=0, **{column: 0 for column in COMPANY_RATING_SUMS}
+    )
+    return {
+        company_id: build_general_ratings(
+            summaries.get(company_id, no_reviews), rating_mode
+        )
+        for company_id in company_ids
+    }
+
+
+def get_companies_general_ratings(
+    db: Session,
+    company_ids: List[int],
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> Dict[int, Dict]:
+    """Get the general ratings of several companies
+
+    The ratings are read from the company rating summaries with a single query.
+    Companies without a summary yet are aggregated together in a second query
+    grouped by company.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_ids (List[int]): IDs of the companies.
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        Dict[int, Dict]: General ratings of every company, keyed by company ID
+    """
+    try:
+        summaries = {
+            summary.company_id: summary
+            for summary in db.execute(select_company_rating_summaries(company_ids))
+            .scalars()
+            .all()
+        }
+
+        missing_company_ids = [
+            company_id for company_id in company_ids if company_id not in summaries
+        ]
+        if missing_company_ids:
+            summaries.update(
+                (row.company_id, row)
+                for row in db.execute(
+                    select_company_rating_aggregates(missing_company_ids)
+                )
+            )
+
+        return build_companies_general_ratings(company_ids, summaries, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+LEADERBOARD_AVERAGES = {
+    enums.LeaderboardCriteria.overall: "company_rating_average",
+    enums.LeaderboardCriteria.career_development: "career_development_rating_average",
+    enums.LeaderboardCriteria.diversity_equal_opportunity: "diversity_equal_opportunity_rating_average",
+    enums.LeaderboardCriteria.working_environment: "working_environment_rating_average",
+    enums.LeaderboardCriteria.salary: "salary_rating_average",
+}
+
+
+def select_company_leaderboard(
+    criteria: enums.LeaderboardCriteria, min_reviews: int, size: int
+) -> Select:
+    """Return the query of the best rated companies
+
+    The companies are ordered by the average of the criteria, then by their
+    amount of evaluations, which matches one of the ix_leaderboard_* indexes,
+    so only the first rows of the index are read.
+
+    Args:
+        criteria (enums.LeaderboardCriteria): Rating the companies are ranked by.
+        min_reviews (int): Minimum amount of evaluations of a ranked company.
+        size (int): Amount of companies.
+    """
+    average = getattr(models.CompanyRatingSummary, LEADERBOARD_AVERAGES[criteria])
+    return (
+        select(models.CompanyRatingSummary)
+        .where(
+            models.CompanyRatingSummary.total_reviews > 0,
+            models.CompanyRatingSummary.total_reviews >= min_reviews,
+        )
+        .order_by(
+            average.desc(),
+            models.CompanyRatingSummary.total_reviews.desc(),
+            models.CompanyRatingSummary.company_id,
+        )
+        .limit(size)
+    )
+
+
+def get_company_leaderboard(
+    db: Session, criteria: enums.LeaderboardCriteria, min_reviews: int, size: int
+) -> List:
+    """Get the best rated companies
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        criteria (enums.LeaderboardCriteria): Rating the companies are ranked by.
+        min_reviews (int): Minimum amount of evaluations of a ranked company.
+        size (int): Amount of companies.
+
+    Returns:
+        List: Rating summaries of the companies, best rated first
+    """
+    try:
+        return (
+            db.execute(select_company_leaderboard(criteria, min_reviews, size))
+            .scalars()
+            .all()
+        )
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+def increment_company_rating_summary(
+    company_id: int, total_reviews: int, rating_sums: Dict[str, int]
+) -> Insert:
+    """Return the statement that adds new evaluations to the rating summary of a company
+
+    The statement has to be executed in the transaction that creates the
+    evaluations, so the summary is committed together with the evaluations it
+    counts.
+
+    Args:
+        company_id (int): ID of the company.
+        total_reviews (int): Amount of evaluations to add.
+        rating_sums (Dict[str, int]): Sums of the weights and of the squared
+            weights to add to every criteria, keyed by the summary column name.
+    """
+    table = models.CompanyRatingSummary.__table__
+    statement = insert(table).values(
+        company_id=company_id,
+        total_reviews=total_reviews,
+        updated_at=func.now(),
+        **rating_sums,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.company_id],
+        set_={
+            column: table.c[column] + statement.excluded[column]
+            for column in ["total_reviews", *rating_sums]
+        }
+        | {"updated_at": statement.excluded.updated_at},
+    )
+
+
+def rebuild_company_rating_summaries(db: Session) -> int:
+    """Recompute every company rating summary from the company evaluations
+
+    Company evaluations are locked against writes while the summaries are
+    rebuilt, so evaluations created meanwhile are not lost.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+
+    Returns:
+        int: Amount of summaries that were created, fixed or removed
+    """
+    table = models.CompanyRatingSummary.__table__
+    columns = [
+        "total_reviews",
+        *COMPANY_RATING_SUMS,
+    ]
+
+    try:
+        db.execute(text("LOCK TABLE company_evaluations IN SHARE MODE"))
+
+        aggregates = select(
+            models.CompanyEvaluation.company_id,
+            *company_rating_aggregates(),
+            func.now(),
+        ).group_by(models.CompanyEvaluation.company_id)
+
+        statement = insert(table).from_select(
+            ["company_id", *columns, "updated_at"], aggregates
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.company_id],
+            set_={
+                column: statement.excluded[column]
+                for column in [*columns, "updated_at"]
+            },
+            where=or_(
+                *[table.c[column] != statement.excluded[column] for column in columns]
+            ),
+        )
+        fixed_summaries = db.execute(statement).rowcount
+
+        removed_summaries = db.execute(
+            delete(table).where(
+                ~exists().where(
+                    models.CompanyEvaluation.company_id == table.c.company_id
+                )
+            )
+        ).rowcount
+
+        db.commit()
+
+    except SQLAlchemyError as error:
+        db.rollback()
+        raise error
+
+    return fixed_summaries + removed_summaries
+
+
+def rating_trend_period_start(period: enums.TrendPeriod, day: date) -> date:
+    """Return the first day of the week, starting on Monday, or month of a day
+
+    Matches date_trunc of PostgreSQL.
+    """
+    if period == enums.TrendPeriod.week:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def previous_rating_trend_period_start(
+    period: enums.TrendPeriod, period_start: date
+) -> date:
+    if period == enums.TrendPeriod.week:
+        return period_start - timedelta(weeks=1)
+    return (period_start - timedelta(days=1)).replace(day=1)
+
+
+def company_evaluation_rating_trends(values: Dict) -> List[Dict]:
+    """Return the amounts an evaluation adds to the buckets of its week and month
+
+    Args:
+        values (Dict): Values of the company_evaluations columns.
+
+    Returns:
+        List[Dict]: Key and amounts of every bucket
+    """
+    return [
+        {
+            "company_id": values["company_id"],
+            "period_type": period.value,
+            "period_start": rating_trend_period_start(
+                period, values["created_at"].date()
+            ),
+            "total_reviews": 1,
+            **company_evaluation_rating_sums(values),
+        }
+        for period in enums.TrendPeriod
+    ]
+
+
+def increment_company_rating_trends(trends: List[Dict]) -> Insert:
+    """Return the statement that adds new evaluations to the rating trend buckets
+
+    Like increment_company_rating_summary, it has to be executed in the
+    transaction that creates the evaluations.
+
+    Args:
+        trends (List[Dict]): Company ID, period type and period start of every
+            bucket, once, with the amount of evaluations and the sums to add.
+    """
+    table = models.CompanyRatingTrend.__table__
+    statement = insert(table).values(trends)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.company_id, table.c.period_type, table.c.period_start],
+        set_={
+            column: table.c[column] + statement.excluded[column]
+            for column in ["total_reviews", *COMPANY_RATING_SUMS]
+        }
+        | {"updated_at": func.now()},
+    )
+
+
+def backfill_company_rating_trends(db: Session, batch_size: int) -> int:
+    """Build the rating trend buckets from the existing company evaluations
+
+    The buckets are emptied and the highest evaluation ID is read while the
+    evaluations are locked against writes, which only waits for the
+    transactions in progress. Evaluations created afterwards update the buckets
+    themselves, and the older ones are streamed in ID order, batch_size at a
+    time, each batch aggregated by company and period and added to the buckets
+    in its own transaction.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        batch_size (int): Range of evaluation IDs aggregated per transaction.
+
+    Returns:
+        int: Amount of evaluations added to the buckets
+    """
+    table = models.CompanyRatingTrend.__table__
+    columns = ["total_reviews", *COMPANY_RATING_SUMS]
+
+    try:
+        db.execute(text("LOCK TABLE company_evaluations IN SHARE MODE"))
+        db.execute(delete(models.CompanyRatingTrend))
+        last_id = db.execute(select(func.max(models.CompanyEvaluation.id))).scalar()
+        db.commit()
+
+        evaluations = 0
+        batch_start = 0
+        while last_id is not None and batch_start < last_id:
+            batch_end = min(batch_start + batch_size, last_id)
+
+            for period in enums.TrendPeriod:
+                period_start = func.date_trunc(
+                    period.value, models.CompanyEvaluation.created_at
+                ).cast(Date)
+
+                aggregates = (
+                    select(
+                        models.CompanyEvaluation.company_id,
+                        literal(period.value),
+                        period_start,
+                        *company_rating_aggregates(),
+                        func.now(),
+                    )
+                    .where(
+                        models.CompanyEvaluation.id > batch_start,
+                        models.CompanyEvaluation.id <= batch_end,
+                        models.CompanyEvaluation.created_at.isnot(None),
+                    )
+                    .group_by(models.CompanyEvaluation.company_id, period_start)
+                )
+
+                statement = insert(table).from_select(
+                    [
+                        "company_id",
+                        "period_type",
+                        "period_start",
+                        *columns,
+                        "updated_at",
+                    ],
+                    aggregates,
+                )
+                db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[
+                            table.c.company_id,
+                            table.c.period_type,
+                            table.c.period_start,
+                        ],
+                        set_={
+                            column: table.c[column] + statement.excluded[column]
+                            for column in columns
+                        }
+                        | {"updated_at": statement.excluded.updated_at},
+                    )
+                )
+
+            evaluations += db.execute(
+                select(func.count(models.CompanyEvaluation.id)).where(
+                    models.CompanyEvaluation.id > batch_start,
+                    models.CompanyEvaluation.id <= batch_end,
+                    models.CompanyEvaluation.created_at.isnot(None),
+                )
+            ).scalar()
+            db.commit()
+            batch_start = batch_end
+
+    except SQLAlchemyError as error:
+        db.rollback()
+        raise error
+
+    return evaluations
+
+
+def select_company_rating_trends(
+    company_id: int, period: enums.TrendPeriod, since: date
+) -> Select:
+    """Return the query of the rating trend buckets of a company since a day"""
+    return (
+        select(models.CompanyRatingTrend)
+        .where(
+            models.CompanyRatingTrend.company_id == company_id,
+            models.CompanyRatingTrend.period_type == period.value,
+            models.CompanyRatingTrend.period_start >= since,
+        )
+        .order_by(models.CompanyRatingTrend.period_start)
+    )
+
+
+def rating_trend_period_starts(
+    period: enums.TrendPeriod, periods: int, today: date
+) -> List[date]:
+    """Return the first day of the last periods, the current one included, oldest first"""
+    period_starts = [rating_trend_period_start(period, today)]
+    while len(period_starts) < periods:
+        period_starts.append(
+            previous_rating_trend_period_start(period, period_starts[-1])
+        )
+    return period_starts[::-1]
+
+
+def build_company_rating_trends(
+    period_starts: List[date],
+    trends: List,
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> List[Dict]:
+    """Build the ratings of every period, periods without evaluations included
+
+    Args:
+        period_starts (List[date]): First day of every period.
+        trends (List): Rating trend buckets of the periods with evaluations.
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        List[Dict]: First day, amount of evaluations and ratings of every period
+    """
+    buckets = {trend.period_start: trend for trend in trends}
+    no_reviews = SimpleNamespace(
+        total_reviews=0, **{column: 0 for column in COMPANY_RATING_SUMS}
+    )
+    return [
+        {
+            "period_start": period_start.isoformat(),
+            **build_general_ratings(buckets.get(period_start, no_reviews), rating_mode),
+        }
+        for period_start in period_starts
+    ]
+
+
+def get_company_rating_trends(
+    db: Session,
+    company_id: int,
+    period: enums.TrendPeriod,
+    periods: int,
+    rating_mode: enums.RatingMode = enums.RatingMode.mean,
+) -> List[Dict]:
+    """Get the ratings of a company in each of the last weeks or months
+
+    The ratings are read from the rating trend buckets, one row per period.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_id (int): ID of the company.
+        period (enums.TrendPeriod): week or month.
+        periods (int): Amount of periods, the current one included.
+        rating_mode (enums.RatingMode): How the weights of every criteria are
+            averaged.
+
+    Returns:
+        List[Dict]: First day, amount of evaluations and ratings of every period,
+            oldest first
+    """
+    period_starts = rating_trend_period_starts(period, periods, date.today())
+
+    try:
+        trends = (
+            db.execute(
+                select_company_rating_trends(company_id, period, period_starts[0])
+            )
+            .scalars()
+            .all()
+        )
+
+        return build_company_rating_trends(period_starts, trends, rating_mode)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+# Amount of payments of every salary frequency in a year, for a full time job
+SALARY_PAYMENTS_PER_YEAR = {
+    enums.SalaryFrequency.hour: 2080,
+    enums.SalaryFrequency.day: 260,
+    enums.SalaryFrequency.week: 52,
+    enums.SalaryFrequency.month: 12,
+    enums.SalaryFrequency.year: 1,
+}
+
+
+def yearly_salary(currency: enums.CurrencyCodeISO4217):
+    """Return the SQL expression of the yearly salary of an evaluation in a currency
+
+    Salaries in currencies missing in SALARY_FX_RATES are NULL, so they are
+    left out of the aggregates.
+
+    Args:
+        currency (enums.CurrencyCodeISO4217): Currency of the result, which has
+            to be in SALARY_FX_RATES.
+    """
+    fx_rate = case(
+        {
+            currency_code: rate / SALARY_FX_RATES[currency.value]
+            for currency_code, rate in SALARY_FX_RATES.items()
+        },
+        value=models.CompanyEvaluation.currency_type,
+    )
+    payments_per_year = case(
+        {
+            frequency.value: payments
+            for frequency, payments in SALARY_PAYMENTS_PER_YEAR.items()
+        },
+        value=models.CompanyEvaluation.salary_frequency,
+    )
+    return models.CompanyEvaluation.salary * payments_per_year * fx_rate
+
+
+def select_company_salary_insights(
+    company_id: int,
+    job_title: Optional[str],
+    currency: enums.CurrencyCodeISO4217,
+) -> Select:
+    """Return the query of the salary percentiles of a company
+
+    The percentiles are computed by PostgreSQL with percentile_cont, for every
+    job title and, in the same scan, for all of them together.
+
+    Args:
+        company_id (int): ID of the company.
+        job_title (Optional[str]): Only aggregate the evaluations of this job title.
+        currency (enums.CurrencyCodeISO4217): Currency of the yearly salaries.
+    """
+    salary = yearly_salary(currency)
+    job_title_column = models.CompanyEvaluation.job_title
+
+    statement = select(
+        job_title_column,
+        func.grouping(job_title_column).label("all_job_titles"),
+        func.count(salary).label("total_salaries"),
+        *[
+            type_coerce(
+                func.percentile_cont(fraction).within_group(salary), Float
+            ).label(label)
+            for label, fraction in (("p25", 0.25), ("median", 0.5), ("p75", 0.75))
+        ],
+    ).where(models.CompanyEvaluation.company_id == company_id, salary.isnot(None))
+
+    if job_title:
+        statement = statement.where(job_title_column == job_title.title().strip())
+
+    return statement.group_by(
+        func.grouping_sets(tuple_(job_title_column), tuple_())
+    ).order_by(desc("all_job_titles"), desc("total_salaries"), job_title_column)
+
+
+def build_salary_insights(rows: List, currency: enums.CurrencyCodeISO4217) -> Dict:
+    """Build the salary insights of a company from its aggregated salaries
+
+    Args:
+        rows (List): Rows of select_company_salary_insights.
+        currency (enums.CurrencyCodeISO4217): Currency of the yearly salaries.
+
+    Returns:
+        Dict: Percentiles of all the salaries and of the salaries of every job title
+    """
+
+    def percentiles(row) -> Dict:
+        return {
+            "total_salaries": row.total_salaries,
+            **{
+                label: Util.round_values(getattr(row, label), 2)
+                if row.total_salaries
+                else None
+                for label in ("p25", "median", "p75")
+            },
+        }
+
+    # The grouping set of all the job titles is returned even without salaries
+    all_job_titles = next(row for row in rows if row.all_job_titles)
+
+    return {
+        "currency": currency.value,
+        "frequency": enums.SalaryFrequency.year.value,
+        **percentiles(all_job_titles),
+        "job_titles": [
+            {"job_title": row.job_title, **percentiles(row)}
+            for row in rows
+            if not row.all_job_titles
+        ],
+    }
+
+
+def get_company_salary_insights(
+    db: Session,
+    company_id: int,
+    job_title: Optional[str],
+    currency: enums.CurrencyCodeISO4217,
+) -> Dict:
+    """Get the percentiles of the yearly salaries of a company in a currency
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_id (int): ID of the company.
+        job_title (Optional[str]): Only aggregate the evaluations of this job title.
+        currency (enums.CurrencyCodeISO4217): Currency of the yearly salaries.
+
+    Returns:
+        Dict: Amount, p25, median and p75 of all the salaries and of the salaries
+            of every job title
+    """
+    if currency.value not in SALARY_FX_RATES:
+        raise HTTPException(status_code=400, detail="Currency Without Exchange Rate")
+
+    try:
+        rows = db.execute(
+            select_company_salary_insights(company_id, job_title, currency)
+        ).all()
+
+        return build_salary_insights(rows, currency)
+
+    except SQLAlchemyError as error:
+        raise error
+
+
+def filter_company_evaluations(
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+) -> Select:
+    """Return the statement that selects the company evaluations matching the filters
+
+    Args:
+        company_id (int): ID of the company.
+        job_title (Optional[str]): Text contained in the job title.
+        content_type (Optional[str]): Text contained in the evaluation content.
+        job_location (Optional[str]): Text contained in the job location.
+
+    Returns:
+        Select: Unordered statement of the company evaluations
+    """
+    query = select(models.CompanyEvaluation)
+
+    if company_id:
+        query = query.where(models.CompanyEvaluation.company_id == company_id)
+
+    if job_title:
+        query = query.where(
+            or_(models.CompanyEvaluation.job_title.ilike(f"%{job_title}%"))
+        )
+
+    if content_type:
+        query = query.where(
+            models.CompanyEvaluation.content_type.ilike(f"%{content_type}%")
+        )
+
+    if job_location:
+        query = query.where(
+            or_(models.CompanyEvaluation.job_location.ilike(f"%{job_location}%"))
+        )
+
+    return query
+
+
+def select_company_evaluations_by_company_id(
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+    helpfulness: Optional[str],
+    rating: Optional[str],
+    date: Optional[str],
+) -> Select:
+    """Return the ordered statement of the company evaluations matching the filters
+
+    The statement is not executed, so it can be paginated by the database.
+    """
+    query = filter_company_evaluations(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+    )
+
+    # The id tie-breaker follows the direction of the last sort, so a single
+    # sort is read in order from its (company_id, <sort column>, id) index
+    id_order = desc
+
+    if rating == "DESC":
+        query = query.order_by(models.CompanyEvaluation.rating.desc())
+        id_order = desc
+
+    if rating == "ASC":
+        query = query.order_by(models.CompanyEvaluation.rating.asc())
+        id_order = asc
+
+    if helpfulness == "DESC":
+        query = query.order_by(models.CompanyEvaluation.utility_counter.desc())
+        id_order = desc
+
+    if helpfulness == "ASC":
+        query = query.order_by(models.CompanyEvaluation.utility_counter.asc())
+        id_order = asc
+
+    if date == "DESC":
+        query = query.order_by(desc(models.CompanyEvaluation.created_at))
+        id_order = desc
+
+    if date == "ASC":
+        query = query.order_by(asc(models.CompanyEvaluation.created_at))
+        id_order = asc
+
+    return query.order_by(id_order(models.CompanyEvaluation.id))
+
+
+COMPANY_EVALUATION_FACETS = {
+    "job_location": models.CompanyEvaluation.job_location,
+    "job_title": models.CompanyEvaluation.job_title,
+    "allows_remote_work": models.CompanyEvaluation.allows_remote_work,
+    "currency_type": models.CompanyEvaluation.currency_type,
+}
+
+
+def select_company_evaluation_facets(
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+) -> Select:
+    """Return the query of the amount of evaluations of every value of every facet
+
+    Every facet, and the total, is counted by the same scan of the evaluations
+    matching the filters, with one grouping set per facet.
+
+    Args:
+        company_id (int): ID of the company.
+        job_title (Optional[str]): Text contained in the job title.
+        content_type (Optional[str]): Text contained in the evaluation content.
+        job_location (Optional[str]): Text contained in the job location.
+    """
+    facet_columns = list(COMPANY_EVALUATION_FACETS.values())
+    query = filter_company_evaluations(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+    )
+
+    return (
+        query.with_only_columns(
+            *facet_columns,
+            # 0 for the facets grouped by the row
+            *[
+                func.grouping(facet_column).label(f"{facet}_grouping")
+                for facet, facet_column in COMPANY_EVALUATION_FACETS.items()
+            ],
+            func.count().label("total"),
+        )
+        .group_by(
+            func.grouping_sets(
+                *[tuple_(facet_column) for facet_column in facet_columns], tuple_()
+            )
+        )
+        .order_by(desc("total"), *facet_columns)
+    )
+
+
+def build_company_evaluation_facets(rows: List) -> Dict:
+    """Build the facets of the evaluations from the rows of select_company_evaluation_facets
+
+    Every facet keeps its EVALUATION_FACETS_MAX_VALUES most frequent values.
+
+    Returns:
+        Dict: Total amount of evaluations and the values of every facet with
+            their amount of evaluations
+    """
+    facets = {facet: [] for facet in COMPANY_EVALUATION_FACETS}
+    total = 0
+
+    for row in rows:
+        facet = next(
+            (
+                facet
+                for facet in COMPANY_EVALUATION_FACETS
+                if getattr(row, f"{facet}_grouping") == 0
+            ),
+            None,
+        )
+        # The grouping set of all the evaluations is returned even without them
+        if facet is None:
+            total = row.total
+        elif len(facets[facet]) < EVALUATION_FACETS_MAX_VALUES:
+            facets[facet].append({"value": getattr(row, facet), "count": row.total})
+
+    return {"total": total, "facets": facets}
+
+
+def get_company_evaluation_facets(
+    db: Session,
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+) -> Dict:
+    """Return the facets of the evaluations of a company matching the filters
+
+    See select_company_evaluation_facets.
+
+    Returns:
+        Dict: Total amount of evaluations and the values of every facet with
+            their amount of evaluations
+    """
+    query = select_company_evaluation_facets(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+    )
+
+    try:
+        rows = db.execute(query).all()
+    except SQLAlchemyError as error:
+        raise error
+
+    return build_company_evaluation_facets(rows)
+
 
-    list_of_career_development_rating = []
+# Range of the INTEGER columns of PostgreSQL
+INTEGER_RANGE = range(-(2 ** 31), 2 ** 31)
 
-    if len(result_query) > 0:
-        list_of_career_development_rating = list(
-            map(Util.tranform_tuple_in_string, result_query)
-        )
 
-    return list_of_career_development_rating
+def parse_cursor_integer(value: Any) -> int:
+    """Return an integer value of a cursor, checking it fits an INTEGER column
 
+    Raises:
+        ValueError: When the value is not an integer of the INTEGER range
+    """
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("The cursor value is not an integer")
+    if value not in INTEGER_RANGE:
+        raise ValueError("The cursor value is out of range")
+    return value
 
-def get_diversity_equal_opportunity_rating_values_by_company_id(
-    db: Session, company_id: int
-) -> List:
-    result_query = (
-        db.query(models.CompanyEvaluation.diversity_equal_opportunity_rating)
-        .filter(models.CompanyEvaluation.company_id == company_id)
-        .all()
-    )
 
-    list_of_diversity_equal_opportunity_rating = []
+COMPANY_EVALUATION_SORT_COLUMNS = {
+    "rating": (models.CompanyEvaluation.rating, Decimal),
+    "helpfulness": (
+        models.CompanyEvaluation.utility_counter,
+        lambda value: parse_cursor_integer(int(value)),
+    ),
+    "date": (models.CompanyEvaluation.created_at, datetime.fromisoformat),
+}
 
-    if len(result_query) > 0:
-        list_of_diversity_equal_opportunity_rating = list(
-            map(Util.tranform_tuple_in_string, result_query)
-        )
 
-    return list_of_diversity_equal_opportunity_rating
+def select_company_evaluations_by_cursor(
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+    sort: Optional[str],
+    order: str,
+    cursor: Optional[str],
+    size: int,
+) -> Select:
+    """Return the statement of a page of company evaluations using keyset pagination
+
+    Instead of skipping the previous pages with an offset, the page starts right
+    after the last evaluation of the previous page, so every page costs the same
+    no matter how deep it is. Evaluations with the same sort value are ordered
+    by id in the same order, so the pages are read in order from the
+    (company_id, <sort column>, id) indexes. The statement selects one extra
+    evaluation, which tells whether there is a next page.
 
+    Args:
+        company_id (int): ID of the company.
+        job_title (Optional[str]): Text contained in the job title.
+        content_type (Optional[str]): Text contained in the evaluation content.
+        job_location (Optional[str]): Text contained in the job location.
+        sort (Optional[str]): rating, helpfulness or date, None to sort by id.
+        order (str): ASC or DESC.
+        cursor (Optional[str]): Cursor of the next page returned by the previous
+            page, None for the first page.
+        size (int): Amount of evaluations of the page.
 
-def get_working_environment_rating_values_by_company_id(
-    db: Session, company_id: int
-) -> List:
-    result_query = (
-        db.query(models.CompanyEvaluation.working_environment_rating)
-        .filter(models.CompanyEvaluation.company_id == company_id)
-        .all()
+    Returns:
+        Select: Statement of the evaluations of the page
+    """
+    query = filter_company_evaluations(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
     )
+    evaluation_id = models.CompanyEvaluation.id
 
-    list_of_working_environment_rating = []
+    sort_column = None
+    if sort is not None:
+        sort_column, parse_value = COMPANY_EVALUATION_SORT_COLUMNS[sort]
 
-    if len(result_query) > 0:
-        list_of_working_environment_rating = list(
-            map(Util.tranform_tuple_in_string, result_query)
+    if cursor is not None:
+        try:
+            values = Util.decode_cursor(cursor)
+            if not isinstance(values, list) or len(values) != 4:
+                raise ValueError("The cursor is not a list of 4 values")
+            cursor_sort, cursor_order, last_value, last_id = values
+            if cursor_sort != sort or cursor_order != order:
+                raise ValueError("The cursor belongs to another sort")
+            last_id = parse_cursor_integer(last_id)
+            if sort_column is not None:
+                last_value = parse_value(last_value)
+        except (ValueError, TypeError, ArithmeticError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Compared as a row, the position of the last evaluation is sought in
+        # the index instead of filtering every evaluation before it
+        position, last_position = evaluation_id, last_id
+        if sort_column is not None:
+            position = tuple_(sort_column, evaluation_id)
+            last_position = tuple_(last_value, last_id)
+
+        query = query.where(
+            position < last_position if order == "DESC" else position > last_position
         )
 
-    return list_of_working_environment_rating
+    order_by = desc if order == "DESC" else asc
+    if sort_column is not None:
+        query = query.order_by(order_by(sort_column))
 
+    return query.order_by(order_by(evaluation_id)).limit(size + 1)
 
-def get_salary_rating_values_by_company_id(db: Session, company_id: int) -> List:
-    result_query = (
-        db.query(models.CompanyEvaluation.salary_rating)
-        .filter(models.CompanyEvaluation.company_id == company_id)
-        .all()
-    )
 
-    list_of_salary_rating = []
+def build_company_evaluations_cursor_page(
+    company_evaluations: List, sort: Optional[str], order: str, size: int
+) -> Dict:
+    """Build a page of the keyset pagination from the selected evaluations
 
-    if len(result_query) > 0:
-        list_of_salary_rating = list(map(Util.tranform_tuple_in_string, result_query))
+    Args:
+        company_evaluations (List): Evaluations selected by
+            select_company_evaluations_by_cursor.
+        sort (Optional[str]): rating, helpfulness or date, None to sort by id.
+        order (str): ASC or DESC.
+        size (int): Amount of evaluations of the page.
 
-    return list_of_salary_rating
+    Returns:
+        Dict: The evaluations of the page and the cursor of the next page
+    """
+    next_cursor = None
+    if len(company_evaluations) > size:
+        company_evaluations = company_evaluations[:size]
+        last_evaluation = company_evaluations[-1]
+        last_value = None
+        if sort is not None:
+            sort_column, _ = COMPANY_EVALUATION_SORT_COLUMNS[sort]
+            last_value = getattr(last_evaluation, sort_column.key)
+            last_value = (
+                last_value.isoformat()
+                if isinstance(last_value, datetime)
+                else str(last_value)
+            )
+        next_cursor = Util.encode_cursor(sort, order, last_value, last_evaluation.id)
 
+    return {"items": company_evaluations, "size": size, "next_cursor": next_cursor}
 
-def calculate_gral_career_development_rating(db: Session, company_id: int):
 
-    amount_of_company_evaluation_by_company_id = get_amount_of_company_evaluation_by_id(
-        db=db, company_id=company_id
-    )
-    list_of_career_development_rating = (
-        get_career_development_rating_values_by_company_id(db=db, company_id=company_id)
+def get_company_evaluations_by_cursor(
+    db: Session,
+    company_id: int,
+    job_title: Optional[str],
+    content_type: Optional[str],
+    job_location: Optional[str],
+    sort: Optional[str],
+    order: str,
+    cursor: Optional[str],
+    size: int,
+) -> Dict:
+    """Return a page of company evaluations using keyset pagination
+
+    See select_company_evaluations_by_cursor.
+
+    Returns:
+        Dict: The evaluations of the page and the cursor of the next page
+    """
+    query = select_company_evaluations_by_cursor(
+        company_id=company_id,
+        job_title=job_title,
+        content_type=content_type,
+        job_location=job_location,
+        sort=sort,
+        order=order,
+        cursor=cursor,
+        size=size,
     )
-    gral_rating = 0
 
-    if amount_of_company_evaluation_by_company_id > 0:
-        list_of_weight = list(
-            map(Util.assign_weight, list_of_career_development_rating)
-        )
-        summatory_of_weigth = functools.reduce(operator.add, list_of_weight)
-        result = summatory_of_weigth / amount_of_company_evaluation_by_company_id
-        gral_rating = Util.round_values(result, 1)
+    try:
+        company_evaluations = db.execute(query).scalars().all()
+    except SQLAlchemyError as error:
+        raise error
 
-    return gral_rating
+    return build_company_evaluations_cursor_page(
+        company_evaluations, sort=sort, order=order, size=size
+    )
 
 
-def calculate_gral_diversity_equal_opportunity_rating(db: Session, company_id: int):
+# Marks around the matched words of the snippets, replaced by <mark> tags once
+# the snippet is HTML escaped
+SEARCH_START_SELECTION = "\x02"
+SEARCH_STOP_SELECTION = "\x03"
+SEARCH_HEADLINE_OPTIONS = (
+    f"StartSel={SEARCH_START_SELECTION}, StopSel={SEARCH_STOP_SELECTION}, "
+    "MinWords=15, MaxWords=35"
+)
 
-    amount_of_company_evaluation_by_company_id = get_amount_of_company_evaluation_by_id(
-        db=db, company_id=company_id
-    )
-    list_of_diversity_equal_opportunity_rating = (
-        get_diversity_equal_opportunity_rating_values_by_company_id(
-            db=db, company_id=company_id
-        )
-    )
-    gral_rating = 0
 
-    if amount_of_company_evaluation_by_company_id > 0:
-        list_of_weight = list(
-            map(Util.assign_weight, list_of_diversity_equal_opportunity_rating)
-        )
-        summatory_of_weight = functools.reduce(operator.add, list_of_weight)
-        result = summatory_of_weight / amount_of_company_evaluation_by_company_id
-        gral_rating = Util.round_values(result, 1)
+def search_tsquery(search: str) -> str:
+    """Return the tsquery matching the evaluations that contain every word of a search
 
-    return gral_rating
+    Every word also matches the words starting with it, so results show up
+    while the search is being typed. Anything but letters and digits is
+    ignored, so the tsquery is always valid.
 
+    Args:
+        search (str): Text typed by the user.
 
-def calculate_gral_working_environment_rating(db: Session, company_id: int):
+    Returns:
+        str: Text of the tsquery, empty when the search has no words
+    """
+    terms = re.findall(r"[^\W_]+", search.lower())[:SEARCH_MAX_TERMS]
+    return " & ".join(f"{term}:*" for term in terms)
 
-    amount_of_company_evaluation_by_company_id = get_amount_of_company_evaluation_by_id(
-        db=db, company_id=company_id
-    )
-    list_of_working_environment_rating = (
-        get_working_environment_rating_values_by_company_id(
-            db=db, company_id=company_id
-        )
-    )
-    gral_rating = 0
 
-    if amount_of_company_evaluation_by_company_id > 0:
-        list_of_weight = list(
-            map(Util.assign_weight, list_of_working_environment_rating)
-        )
-        summatory_of_weight = functools.reduce(operator.add, list_of_weight)
-        result = summatory_of_weight / amount_of_company_evaluation_by_company_id
-        gral_rating = Util.round_values(result, 1)
+def search_conditions(search: str, company_id: Optional[int]) -> List:
+    """Return the conditions of the evaluations matching a search
 
-    return gral_rating
+    Args:
+        search (str): Text typed by the user, with at least one word.
+        company_id (Optional[int]): ID of the company, None to search the
+            evaluations of every company.
+    """
+    search_config = literal_column(f"'{models.SEARCH_CONFIG}'::regconfig")
+    search_query = func.to_tsquery(search_config, search_tsquery(search))
+    conditions = [models.CompanyEvaluation.search_vector.op("@@")(search_query)]
+    if company_id is not None:
+        conditions.append(models.CompanyEvaluation.company_id == company_id)
+    return conditions
 
 
-def calculate_gral_salary_rating(db: Session, company_id: int):
+def select_company_evaluations_search_total(
+    search: str, company_id: Optional[int]
+) -> Select:
+    """Return the statement of the total amount of evaluations matching a search
 
-    amount_of_company_evaluation_by_company_id = get_amount_of_company_evaluation_by_id(
-        db=db, company_id=company_id
-    )
-    list_of_salary_rating = get_salary_rating_values_by_company_id(
-        db=db, company_id=company_id
+    The page statement already counts the matches along its rows, so this is
+    only needed when the page is past the last match.
+    """
+    return select(func.count(models.CompanyEvaluation.id)).where(
+        *search_conditions(search, company_id)
     )
-    gral_rating = 0
 
-    if amount_of_company_evaluation_by_company_id > 0:
-        list_of_weight = list(map(Util.assign_weight, list_of_salary_rating))
-        summatory_of_weight = functools.reduce(operator.add, list_of_weight)
-        result = summatory_of_weight / amount_of_company_evaluation_by_company_id
-        gral_rating = Util.round_values(result, 1)
 
-    return gral_rating
+def select_company_evaluations_search(
+    search: str, company_id: Optional[int], page: int, size: int
+) -> Select:
+    """Return the statement of a page of the evaluations matching a search
 
+    Matches are found with the GIN index of search_vector and sorted by
+    relevance, matches in the job title weighting more than in the content,
+    and in the content more than in the job location. The snippets are only
+    computed for the evaluations of the page.
 
-def calculate_gral_company_rating(db: Session, company_id: int):
-    gral_career_development_rating = calculate_gral_career_development_rating(
-        db=db, company_id=company_id
-    )
-    gral_diversity_equal_opportunity_rating = (
-        calculate_gral_diversity_equal_opportunity_rating(db=db, company_id=company_id)
-    )
-    gral_working_environment_rating = calculate_gral_working_environment_rating(
-        db=db, company_id=company_id
-    )
-    gral_salary_rating = calculate_gral_salary_rating(db=db, company_id=company_id)
+    Args:
+        search (str): Text typed by the user, with at least one word.
+        company_id (Optional[int]): ID of the company, None to search the
+            evaluations of every company.
+        page (int): Number of the page, starting at 1.
+        size (int): Amount of evaluations per page.
 
-    sum_of_gral_ratings = (
-        gral_career_development_rating
-        + gral_diversity_equal_opportunity_rating
-        + gral_working_environment_rating
-        + gral_salary_rating
+    Returns:
+        Select: Statement of the evaluations of the page, with their rank, their
+            snippet and the total amount of matches
+    """
+    search_config = literal_column(f"'{models.SEARCH_CONFIG}'::regconfig")
+    search_query = func.to_tsquery(search_config, search_tsquery(search))
+    search_vector = models.CompanyEvaluation.search_vector
+    rank = func.ts_rank(search_vector, search_query)
+
+    matches = (
+        select(
+            models.CompanyEvaluation.id,
+            rank.label("rank"),
+            func.count().over().label("total"),
+        )
+        .where(*search_conditions(search, company_id))
+        .order_by(rank.desc(), models.CompanyEvaluation.id.desc())
+        .limit(size)
+        .offset((page - 1) * size)
+        .subquery()
     )
-    result = sum_of_gral_ratings / AMOUNT_OF_COMPANY_CRITERIA
-    gral_company_rating = Util.round_values(result, 1)
-    return gral_company_rating
-
 
-def get_company_evaluations_by_company_id(
-    db: Session,
-    company_id: int,
-    job_title: Optional[str],
-    content_type: Optional[str],
-    job_location: Optional[str],
-    helpfulness: Optional[str],
-    rating: Optional[str],
-    date: Optional[str],
-):
-    try:
-        query = db.query(models.CompanyEvaluation)
+    return (
+        select(
+            models.CompanyEvaluation,
+            matches.c.rank,
+            matches.c.total,
+            func.ts_headline(
+                search_config,
+                models.CompanyEvaluation.content_type,
+                search_query,
+                SEARCH_HEADLINE_OPTIONS,
+            ).label("snippet"),
+        )
+        .join(matches, matches.c.id == models.CompanyEvaluation.id)
+        .order_by(matches.c.rank.desc(), matches.c.id.desc())
+    )
 
-        if company_id:
-            query = query.filter(models.CompanyEvaluation.company_id == company_id)
 
-        if job_title:
-            query = query.filter(
-                or_(models.CompanyEvaluation.job_title.ilike(f"%{job_title}%"))
-            )
+def build_company_evaluations_search_page(
+    rows: List, page: int, size: int, total: int = 0
+) -> Dict:
+    """Build a page of search results from the rows of select_company_evaluations_search
 
-        if content_type:
-            query = query.filter(
-                models.CompanyEvaluation.content_type.ilike(f"%{content_type}%")
-            )
+    The snippets are HTML escaped, with the matched words inside <mark> tags.
 
-        if job_location:
-            query = query.filter(
-                or_(models.CompanyEvaluation.job_location.ilike(f"%{job_location}%"))
-            )
+    Args:
+        rows (List): Rows of the page.
+        page (int): Number of the page, starting at 1.
+        size (int): Amount of evaluations per page.
+        total (int): Total amount of matches, only used when the page is empty.
+    """
+    items = []
+    for company_evaluation, rank, _, snippet in rows:
+        snippet = (
+            html.escape(snippet)
+            .replace(SEARCH_START_SELECTION, "<mark>")
+            .replace(SEARCH_STOP_SELECTION, "</mark>")
+        )
+        items.append(
+            {
+                **schemas.CompanyEvaluationOut.from_orm(company_evaluation).dict(),
+                "rank": round(rank, 6),
+                "snippet": snippet,
+            }
+        )
 
-        if rating == "DESC":
-            query = query.order_by(models.CompanyEvaluation.rating.desc())
+    return {
+        "items": items,
+        "total": rows[0].total if rows else total,
+        "page": page,
+        "size": size,
+    }
 
-        if rating == "ASC":
-            query = query.order_by(models.CompanyEvaluation.rating.asc())
 
-        if helpfulness == "DESC":
-            query = query.order_by(models.CompanyEvaluation.utility_counter.desc())
+def check_search(search: str):
+    if not search_tsquery(search):
+        raise HTTPException(
+            status_code=400, detail="The search must contain letters or digits"
+        )
 
-        if helpfulness == "ASC":
-            query = query.order_by(models.CompanyEvaluation.utility_counter.asc())
 
-        if date == "DESC":
-            query = query.order_by(desc(models.CompanyEvaluation.created_at))
+def search_company_evaluations(
+    db: Session, search: str, company_id: Optional[int], page: int, size: int
+) -> Dict:
+    """Search the evaluations of a company, or of every company, by relevance
 
-        if date == "ASC":
-            query = query.order_by(asc(models.CompanyEvaluation.created_at))
+    See select_company_evaluations_search.
 
-        return query.order_by(models.CompanyEvaluation.id.desc()).all()
+    Returns:
+        Dict: The evaluations of the page, with their rank and their snippet,
+            and the total amount of matches
+    """
+    check_search(search)
+    query = select_company_evaluations_search(
+        search=search, company_id=company_id, page=page, size=size
+    )
 
+    total = 0
+    try:
+        rows = db.execute(query).all()
+        if not rows and page > 1:
+            total = db.execute(
+                select_company_evaluations_search_total(
+                    search=search, company_id=company_id
+                )
+            ).scalar_one()
     except SQLAlchemyError as error:
         raise error
 
+    return build_company_evaluations_search_page(
+        rows, page=page, size=size, total=total
+    )
+
 
 def calculate_company_evaluation_average(*args) -> float:
 
@@ -394,12 +1769,70 @@ def calculate_company_evaluation_average(*args) -> float:
 
     if len(args) > 0:
         weights = list(map(Util.assign_weight, list(args)))
-        total = sum(weights) / AMOUNT_OF_COMPANY_CRITERIA
+        total = sum(weights) / len(COMPANY_RATING_CRITERIA)
         average = Util.round_values(total, 1)
 
     return average
 
 
+def company_evaluation_values(
+    company_evaluation: schemas.CompanyEvaluationCreate, company_id: int
+) -> Dict:
+    """Return the column values of a new company evaluation, including its rating average
+
+    Args:
+        company_evaluation (schemas.CompanyEvaluationCreate): New company evaluation.
+        company_id (int): ID of the evaluated company.
+
+    Returns:
+        Dict: Values of the company_evaluations columns
+    """
+    now = datetime.now().replace(microsecond=0)
+    values = dict(
+        company_id=company_id,
+        job_title=company_evaluation.job_title.title().strip(),
+        content_type=company_evaluation.content_type.capitalize().strip(),
+        start_date=company_evaluation.start_date,
+        end_date=company_evaluation.end_date,
+        is_still_working_here=company_evaluation.is_still_working_here,
+        applicant_email=company_evaluation.applicant_email.lower().strip(),
+        career_development_rating=company_evaluation.career_development_rating.value,
+        diversity_equal_opportunity_rating=company_evaluation.diversity_equal_opportunity_rating.value,
+        working_environment_rating=company_evaluation.working_environment_rating.value,
+        salary_rating=company_evaluation.salary_rating.value,
+        job_location=company_evaluation.job_location.capitalize().strip(),
+        salary=company_evaluation.salary,
+        currency_type=company_evaluation.currency_type.value,
+        salary_frequency=company_evaluation.salary_frequency.value,
+        recommended_a_friend=company_evaluation.recommended_a_friend,
+        allows_remote_work=company_evaluation.allows_remote_work,
+        is_legally_company=company_evaluation.is_legally_company,
+        created_at=now,
+        updated_at=now,
+    )
+
+    # Calculate rating average
+    values["rating"] = calculate_company_evaluation_average(
+        *[values[criteria] for criteria in COMPANY_RATING_CRITERIA]
+    )
+
+    return values
+
+
+def company_evaluation_rating_sums(values: Dict) -> Dict[str, int]:
+    """Return the weight and the squared weight of every criteria of an evaluation
+
+    Returns:
+        Dict[str, int]: Amounts to add to the summary, keyed by the summary column
+    """
+    rating_sums = {}
+    for criteria in COMPANY_RATING_CRITERIA:
+        weight = Util.assign_weight(values[criteria])
+        rating_sums[f"{criteria}_sum"] = weight
+        rating_sums[f"{criteria}_sum_of_squares"] = weight ** 2
+    return rating_sums
+
+
 def create_company_evaluation(
     db: Session, company_evaluation: schemas.CompanyEvaluationCreate, company_id: int
 ):
@@ -412,47 +1845,30 @@ def create_company_evaluation(
     Returns:
         [company_evaluation]: Company evaluation created
     """
-    if check_company_id_exist(company_id) != -1:
+    if check_company_id_exist(company_id, db=db) != -1:
 
         try:
-            company_evaluation = models.CompanyEvaluation(
-                company_id=company_id,
-                job_title=company_evaluation.job_title.title().strip(),
-                content_type=company_evaluation.content_type.capitalize().strip(),
-                start_date=company_evaluation.start_date,
-                end_date=company_evaluation.end_date,
-                is_still_working_here=company_evaluation.is_still_working_here,
-                applicant_email=company_evaluation.applicant_email.lower().strip(),
-                career_development_rating=company_evaluation.career_development_rating.value,
-                diversity_equal_opportunity_rating=company_evaluation.diversity_equal_opportunity_rating.value,
-                working_environment_rating=company_evaluation.working_environment_rating.value,
-                salary_rating=company_evaluation.salary_rating.value,
-                job_location=company_evaluation.job_location.capitalize().strip(),
-                salary=company_evaluation.salary,
-                currency_type=company_evaluation.currency_type.value,
-                salary_frequency=company_evaluation.salary_frequency.value,
-                recommended_a_friend=company_evaluation.recommended_a_friend,
-                allows_remote_work=company_evaluation.allows_remote_work,
-                is_legally_company=company_evaluation.is_legally_company,
-                created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            )
-
-            # Calculate rating average
-            rating = (
-                calculate_company_evaluation_average(
-                    company_evaluation.career_development_rating,
-                    company_evaluation.diversity_equal_opportunity_rating,
-                    company_evaluation.working_environment_rating,
-                    company_evaluation.salary_rating,
-                ),
+            values = company_evaluation_values(
+                company_evaluation=company_evaluation, company_id=company_id
             )
-            # Integration of the rating value
-            company_evaluation.rating = rating
+            company_evaluation = models.CompanyEvaluation(**values)
 
             db.add(company_evaluation)
+            db.execute(
+                increment_company_rating_summary(
+                    company_id=company_id,
+                    total_reviews=1,
+                    rating_sums=company_evaluation_rating_sums(values),
+                )
+            )
+            db.execute(
+                increment_company_rating_trends(
+                    company_evaluation_rating_trends(values)
+                )
+            )
             db.commit()
             db.refresh(company_evaluation)
+            response_cache.invalidate([company_tag(company_id), COMPANY_RATINGS_TAG])
 
             return company_evaluation
 
@@ -462,47 +1878,247 @@ def create_company_evaluation(
         raise HTTPException(status_code=404, detail="Company Not Found")
 
 
-def increse_evaluation_utility_rating(db: Session, company_evaluation_id: int) -> Dict:
-    try:
-        company_evaluation = get_company_evaluation_by_id(
-            db=db, id=company_evaluation_id
+def bulk_create_company_evaluations(
+    db: Session, rows: Iterable[Tuple[int, Union[Dict, str]]], chunk_size: int
+) -> Dict:
+    """Create many company evaluations, reporting the rows that can not be created
+
+    Rows are validated with schemas.CompanyEvaluationBulkRow and inserted with a
+    single executemany per chunk, which psycopg2 sends as multi-row INSERTs of up
+    to 1000 rows, committed together with the increments of the
+    rating summaries of the chunk. Every distinct company ID is checked only
+    once.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        rows (Iterable[Tuple[int, Union[Dict, str]]]): Line and fields of every
+            row, or line and error when the row could not be parsed.
+        chunk_size (int): Amount of rows per INSERT and commit.
+
+    Returns:
+        Dict: Amount of rows received, imported and rejected, the errors of the
+            rejected rows and the throughput in rows per second
+    """
+    started_at = time.perf_counter()
+    report = {"received": 0, "imported": 0, "rejected": 0, "errors": []}
+    companies_directory = None
+    known_company_ids = {}
+    chunk = []
+
+    def reject(line: int, errors: List[str]):
+        report["rejected"] += 1
+        if len(report["errors"]) < BULK_IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line, "errors": errors})
+
+    def insert_chunk():
+        lines = [line for line, _ in chunk]
+        company_evaluations = [evaluation for _, evaluation in chunk]
+        chunk.clear()
+
+        summaries = defaultdict(lambda: defaultdict(int))
+        trends = {}
+        for evaluation in company_evaluations:
+            summary = summaries[evaluation["company_id"]]
+            summary["total_reviews"] += 1
+            for summary_column, weight in company_evaluation_rating_sums(
+                evaluation
+            ).items():
+                summary[summary_column] += weight
+
+            for trend in company_evaluation_rating_trends(evaluation):
+                key = (trend["company_id"], trend["period_type"], trend["period_start"])
+                if key not in trends:
+                    trends[key] = trend
+                    continue
+                for trend_column in ["total_reviews", *COMPANY_RATING_SUMS]:
+                    trends[key][trend_column] += trend[trend_column]
+
+        try:
+            db.execute(insert(models.CompanyEvaluation.__table__), company_evaluations)
+            for company_id, summary in summaries.items():
+                total_reviews = summary.pop("total_reviews")
+                db.execute(
+                    increment_company_rating_summary(
+                        company_id=company_id,
+                        total_reviews=total_reviews,
+                        rating_sums=summary,
+                    )
+                )
+            db.execute(increment_company_rating_trends(list(trends.values())))
+            db.commit()
+        except SQLAlchemyError as error:
+            db.rollback()
+            for line in lines:
+                reject(
+                    line, [f"Database error: {getattr(error, 'orig', None) or error}"]
+                )
+            return
+
+        response_cache.invalidate([*map(company_tag, summaries), COMPANY_RATINGS_TAG])
+        report["imported"] += len(company_evaluations)
+
+    for line, row in rows:
+        report["received"] += 1
+
+        if isinstance(row, str):
+            reject(line, [row])
+            continue
+
+        try:
+            company_evaluation = schemas.CompanyEvaluationBulkRow.parse_obj(row)
+        except ValidationError as error:
+            reject(
+                line,
+                [
+                    f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+                    for detail in error.errors()
+                ],
+            )
+            continue
+
+        company_id = company_evaluation.company_id
+        if company_id not in known_company_ids:
+            if companies_directory is None:
+                companies_directory = get_companies_directory(db)
+            known_company_ids[company_id] = company_id in companies_directory
+        if not known_company_ids[company_id]:
+            reject(line, ["company_id: Company Not Found"])
+            continue
+
+        chunk.append((line, company_evaluation_values(company_evaluation, company_id)))
+        if len(chunk) >= chunk_size:
+            insert_chunk()
+
+    if chunk:
+        insert_chunk()
+
+    seconds = time.perf_counter() - started_at
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(report["imported"] / seconds, 1) if seconds else 0
+    return report
+
+
+def increment_evaluation_counter_statement(company_evaluation_id: int, counter: str):
+    """Return the statement that increases a counter of a company evaluation
+
+    The counter is increased by the database, so concurrent votes are never lost,
+    and the updated evaluation is returned by the same statement.
+
+    Args:
+        company_evaluation_id (int): ID of the company evaluation.
+        counter (str): utility_counter or non_utility_counter.
+    """
+    counter_column = getattr(models.CompanyEvaluation, counter)
+    return (
+        update(models.CompanyEvaluation)
+        .where(models.CompanyEvaluation.id == company_evaluation_id)
+        .values(
+            {
+                counter: func.coalesce(counter_column, 0) + 1,
+                "updated_at": datetime.now().replace(microsecond=0),
+            }
         )
-        company_evaluation.utility_counter += 1
-        company_evaluation.updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        db.add(company_evaluation)
+        .returning(*models.CompanyEvaluation.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def increment_evaluation_counter(db: Session, company_evaluation_id: int, counter: str):
+    """Increase a counter of a company evaluation in a single statement
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_evaluation_id (int): ID of the company evaluation.
+        counter (str): utility_counter or non_utility_counter.
+
+    Returns:
+        The updated company evaluation, None when it does not exist
+    """
+    try:
+        company_evaluation = db.execute(
+            increment_evaluation_counter_statement(company_evaluation_id, counter)
+        ).first()
         db.commit()
-        return company_evaluation
     except SQLAlchemyError as error:
         raise error
 
+    if company_evaluation is not None:
+        response_cache.invalidate([company_tag(company_evaluation.company_id)])
+    return company_evaluation
+
+
+def increse_evaluation_utility_rating(db: Session, company_evaluation_id: int) -> Dict:
+    return increment_evaluation_counter(
+        db=db, company_evaluation_id=company_evaluation_id, counter="utility_counter"
+    )
+
 
 def increase_evaluation_non_utility_rating(
     db: Session, company_evaluation_id: int
 ) -> Dict:
+    return increment_evaluation_counter(
+        db=db,
+        company_evaluation_id=company_evaluation_id,
+        counter="non_utility_counter",
+    )
 
-    try:
-        company_evaluation = get_company_evaluation_by_id(
-            db=db, id=company_evaluation_id
+
+def add_evaluation_votes(db: Session, votes: Dict[int, Dict[str, int]]):
+    """Add the votes of many company evaluations in a single statement
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        votes (Dict[int, Dict[str, int]]): Amount of votes to add to every
+            counter, keyed by company evaluation ID.
+    """
+    votes_values = values(
+        column("id", Integer),
+        column("utility_counter", Integer),
+        column("non_utility_counter", Integer),
+        name="votes",
+    ).data(
+        [
+            (
+                company_evaluation_id,
+                counters.get("utility_counter", 0),
+                counters.get("non_utility_counter", 0),
+            )
+            for company_evaluation_id, counters in votes.items()
+        ]
+    )
+
+    statement = (
+        update(models.CompanyEvaluation)
+        .where(models.CompanyEvaluation.id == votes_values.c.id)
+        .values(
+            utility_counter=func.coalesce(models.CompanyEvaluation.utility_counter, 0)
+            + votes_values.c.utility_counter,
+            non_utility_counter=func.coalesce(
+                models.CompanyEvaluation.non_utility_counter, 0
+            )
+            + votes_values.c.non_utility_counter,
+            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         )
-        company_evaluation.non_utility_counter += 1
-        company_evaluation.updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        db.add(company_evaluation)
+        .returning(models.CompanyEvaluation.company_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    try:
+        company_ids = set(db.execute(statement).scalars())
         db.commit()
-        return company_evaluation
     except SQLAlchemyError as error:
+        db.rollback()
         raise error
 
+    response_cache.invalidate(map(company_tag, company_ids))
+
 
 def get_all_reporting_reason_types(db: Session) -> List[Dict]:
     return db.query(models.ReportingReasonType).all()
 
 
 def get_reporting_reason_by_id(db: Session, reporting_reason_type_id: int) -> Dict:
-    return (
-        db.query(models.ReportingReasonType)
-        .filter(models.ReportingReasonType.id == reporting_reason_type_id)
-        .first()
-    )
+    return get_by_id(db, models.ReportingReasonType, reporting_reason_type_id)
 
 
 def get_all_postulations_status(db: Session):
@@ -537,6 +2153,7 @@ def create_complaint(
             email=complaint_body.email.lower(),
         )
 
+        company_id = company_evaluation.company_id
         company_evaluation.complaints.append(complaint)
         db.add(complaint)
         db.commit()
@@ -545,11 +2162,76 @@ def create_complaint(
     except SQLAlchemyError as error:
         raise error
 
+    response_cache.invalidate([company_tag(company_id)])
     return complaint
 
 
+VACANCY_APPLICATION_CREATED = "vacancy_application.created"
+
+
+def add_outbox_event(db: Session, event_type: str, payload: Dict) -> models.OutboxEvent:
+    """Add an event to the outbox, to be committed with the current transaction
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        event_type (str): Type of the event, which selects how it is delivered.
+        payload (Dict): JSON payload of the event.
+
+    Returns:
+        models.OutboxEvent: The event added to the session
+    """
+    outbox_event = models.OutboxEvent(
+        event_type=event_type,
+        payload=payload,
+        idempotency_key=uuid.uuid4().hex,
+        attempts=0,
+    )
+    db.add(outbox_event)
+    return outbox_event
+
+
+def select_applicants() -> Select:
+    """Return the statement that selects the applicants with their postulation status
+
+    The postulation status is serialized by schemas.ApplicantOut, so it is
+    joined instead of lazy loaded once per applicant.
+    """
+    return select(models.Applicant).options(
+        joinedload(models.Applicant.postulation_status)
+    )
+
+
 def get_applicants(db: Session):
-    return db.query(models.Applicant).all()
+    return db.execute(select_applicants()).scalars().all()
+
+
+def is_tracking_code_collision(error: IntegrityError) -> bool:
+    """Return whether an insert failed because its tracking code is taken"""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == "tracking_code_unique"
+
+
+def add_applicant(db: Session, applicant: models.Applicant):
+    """Insert an applicant with a tracking code that no other applicant has
+
+    The applicant is inserted inside a savepoint, so when its tracking code
+    collides with an existing one only the savepoint is rolled back, and the
+    insert is retried with a new code up to TRACKING_CODE_MAX_ATTEMPTS times.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        applicant (models.Applicant): Applicant to insert.
+    """
+    for attempt in range(1, TRACKING_CODE_MAX_ATTEMPTS + 1):
+        applicant.tracking_code = Util.create_tracking_code()
+        try:
+            with db.begin_nested():
+                db.add(applicant)
+            return
+        except IntegrityError as error:
+            collision = is_tracking_code_collision(error)
+            if not collision or attempt == TRACKING_CODE_MAX_ATTEMPTS:
+                raise error
 
 
 def create_applicant(
@@ -567,7 +2249,14 @@ def create_applicant(
     city: str,
     job_title: str,
     company: str,
+    commit: bool = True,
 ):
+    """Create an applicant, notifying the vacancies service once committed
+
+    Args:
+        commit (bool): Whether to commit the applicant, False to only insert it
+            and commit it later with commit_applicant.
+    """
     try:
         applicant = models.Applicant(
             vacancy_id=vacancy_id,
@@ -575,7 +2264,6 @@ def create_applicant(
             name=name.capitalize().strip(),
             paternal_last_name=paternal_last_name.capitalize().strip(),
             maternal_last_name=maternal_last_name.capitalize().strip(),
-            tracking_code=Util.create_tracking_code(),
             email=email.lower().strip(),
             cellphone=cellphone,
             linkedin_url=linkedin_url,
@@ -588,13 +2276,30 @@ def create_applicant(
             created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         )
-        db.add(applicant)
-        db.commit()
-        db.refresh(applicant)
+        add_applicant(db, applicant)
+
+        # The vacancies service is notified by the outbox worker once committed
+        add_outbox_event(
+            db,
+            event_type=VACANCY_APPLICATION_CREATED,
+            payload={"vacancy_id": vacancy_id, "applicant_id": applicant.id},
+        )
 
     except SQLAlchemyError as Error:
         raise Error
 
+    if commit:
+        commit_applicant(db, applicant)
+    return applicant
+
+
+def commit_applicant(db: Session, applicant: models.Applicant):
+    try:
+        db.commit()
+        db.refresh(applicant)
+    except SQLAlchemyError as error:
+        raise error
+
     return applicant
 
 
@@ -604,7 +2309,10 @@ def create_applicant_evaluation(
     applicant_id: int,
 ):
 
-    if check_company_id_exist(company_id=applicant_evaluation_body.company_id) != -1:
+    if (
+        check_company_id_exist(company_id=applicant_evaluation_body.company_id, db=db)
+        != -1
+    ):
         try:
             applicant_evaluation = models.ApplicantEvaluation(
                 company_id=applicant_evaluation_body.company_id,
@@ -662,19 +2370,34 @@ def create_a_recruitment_process_evaluation(
         raise HTTPException(status_code=404, detail="Applicant Not found")
 
 
-def get_application_process(db: Session, tracking_code: str, paternal_last_name: str):
-    applicantion_process = (
-        db.query(models.Applicant)
-        .filter(
+def select_application_process(tracking_code: str, paternal_last_name: str) -> Select:
+    """Return the statement that selects the applicant of an application process
+
+    The relationships read by build_application_process are joined, so the
+    application process is loaded by a single query. Its result has to be made
+    unique, because the applicant is repeated for every evaluation.
+    """
+    return (
+        select(models.Applicant)
+        .options(
+            joinedload(models.Applicant.postulation_status),
+            joinedload(models.Applicant.applicant_evaluations),
+        )
+        .where(
             and_(
                 models.Applicant.tracking_code == tracking_code.upper().strip(),
                 models.Applicant.paternal_last_name
                 == paternal_last_name.capitalize().strip(),
             )
         )
-        .first()
     )
 
+
+def build_application_process(applicantion_process: models.Applicant) -> dict:
+    """Build the application process of an applicant
+
+    Raises a 404 error when the applicant does not exist.
+    """
     if applicantion_process != None:
         applicant = {
             "applicant_id": applicantion_process.id,
@@ -697,11 +2420,7 @@ def get_application_process(db: Session, tracking_code: str, paternal_last_name:
             "applicant_evaluations": applicantion_process.applicant_evaluations,
         }
 
-        vacancy_id = applicantion_process.vacancy_id
-        vacancy = get_vacancy_by_id(vacancy_id)
-        result = vacancy | applicant
-
-        return result
+        return applicant
 
     else:
         raise HTTPException(
@@ -710,11 +2429,28 @@ def get_application_process(db: Session, tracking_code: str, paternal_last_name:
         )
 
 
+def get_application_process(db: Session, tracking_code: str, paternal_last_name: str):
+    applicantion_process = (
+        db.execute(
+            select_application_process(
+                tracking_code=tracking_code, paternal_last_name=paternal_last_name
+            )
+        )
+        .unique()
+        .scalars()
+        .first()
+    )
+
+    return build_application_process(applicantion_process)
+
+
 def get_applicants_by_vacancy_id(db: Session, vacancy_id: int):
     try:
         applicants = (
-            db.query(models.Applicant)
-            .filter(models.Applicant.vacancy_id == vacancy_id)
+            db.execute(
+                select_applicants().where(models.Applicant.vacancy_id == vacancy_id)
+            )
+            .scalars()
             .all()
         )
         return applicants
@@ -724,10 +2460,8 @@ def get_applicants_by_vacancy_id(db: Session, vacancy_id: int):
 
 def get_postulation_status_by_id(db: Session, postulations_status_id: int):
     try:
-        postulations_status = (
-            db.query(models.PostulationStatus)
-            .filter(models.PostulationStatus.id == postulations_status_id)
-            .first()
+        postulations_status = get_by_id(
+            db, models.PostulationStatus, postulations_status_id
         )
         if postulations_status != None:
             return postulations_status
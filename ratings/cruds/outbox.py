@@ -0,0 +1,136 @@
+# Python
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+# Typing
+from typing import Callable, Dict, Tuple
+
+# Third-party libraries
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+
+
+load_dotenv()
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 50))
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", 8))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+OUTBOX_BACKOFF = float(os.getenv("OUTBOX_BACKOFF", 2))
+OUTBOX_MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", 600))
+
+logger = logging.getLogger(__name__)
+
+
+def deliver_vacancy_application(payload: Dict, idempotency_key: str):
+    crud.create_vacancy_applicant(
+        vacancy_id=payload["vacancy_id"],
+        applicant_id=payload["applicant_id"],
+        idempotency_key=idempotency_key,
+    )
+
+
+EVENT_HANDLERS: Dict[str, Callable[[Dict, str], None]] = {
+    crud.VACANCY_APPLICATION_CREATED: deliver_vacancy_application,
+}
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Return whether retrying the delivery can not succeed
+
+    Client errors, except 408 and 429, are the same on every retry.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return 400 <= status_code < 500 and status_code not in (408, 429)
+    return isinstance(error, KeyError)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(
+        seconds=min(OUTBOX_BACKOFF * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF)
+    )
+
+
+def deliver(outbox_event: models.OutboxEvent):
+    """Deliver an event, returning the error that made it fail, if any"""
+    try:
+        EVENT_HANDLERS[outbox_event.event_type](
+            outbox_event.payload, outbox_event.idempotency_key
+        )
+    except Exception as error:
+        return error
+    return None
+
+
+def deliver_outbox_events(
+    db: Session, executor: ThreadPoolExecutor, batch_size: int = OUTBOX_BATCH_SIZE
+) -> Tuple[int, int]:
+    """Deliver a batch of pending outbox events
+
+    The batch is locked with FOR UPDATE SKIP LOCKED, so several workers can run
+    at the same time without delivering the same event twice, and its events
+    are delivered concurrently. Every event is sent with its idempotency key,
+    so an event delivered again after a crash is applied only once upstream.
+    Failed events are retried with an exponential backoff, up to
+    OUTBOX_MAX_ATTEMPTS times.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        executor (ThreadPoolExecutor): Executor the events are delivered with.
+        batch_size (int): Maximum amount of events of the batch.
+
+    Returns:
+        Tuple[int, int]: Amount of events of the batch and amount delivered
+    """
+    outbox_events = (
+        db.execute(
+            select(models.OutboxEvent)
+            .where(
+                models.OutboxEvent.delivered_at.is_(None),
+                models.OutboxEvent.failed_at.is_(None),
+                models.OutboxEvent.available_at <= func.now(),
+            )
+            .order_by(models.OutboxEvent.available_at, models.OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+
+    delivered = 0
+    errors = executor.map(deliver, outbox_events)
+
+    for outbox_event, error in zip(outbox_events, errors):
+        outbox_event.attempts += 1
+        now = func.now()
+
+        if error is None:
+            outbox_event.delivered_at = now
+            outbox_event.last_error = None
+            delivered += 1
+            continue
+
+        outbox_event.last_error = repr(error)
+        if is_permanent_error(error) or outbox_event.attempts >= OUTBOX_MAX_ATTEMPTS:
+            outbox_event.failed_at = now
+            logger.error(
+                "Outbox event %s failed after %s attempts: %r",
+                outbox_event.id,
+                outbox_event.attempts,
+                error,
+            )
+        else:
+            outbox_event.available_at = now + retry_delay(outbox_event.attempts)
+
+    db.commit()
+    return len(outbox_events), delivered
@@ -0,0 +1,147 @@
+# Python
+import logging
+import os
+import threading
+from collections import defaultdict
+
+# Typing
+from typing import Dict, Optional
+
+# SQLAlchemy
+from sqlalchemy.orm import Session
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.cruds import crud
+from ratings.schemas import schemas
+from ratings.config.database import SessionLocal
+
+
+load_dotenv()
+VOTE_BUFFER_ENABLED = os.getenv("VOTE_BUFFER_ENABLED", "false").lower() == "true"
+VOTE_BUFFER_FLUSH_INTERVAL = float(os.getenv("VOTE_BUFFER_FLUSH_INTERVAL", 1))
+VOTE_BUFFER_MAX_PENDING = int(os.getenv("VOTE_BUFFER_MAX_PENDING", 1000))
+
+logger = logging.getLogger(__name__)
+
+
+class VoteBuffer:
+    """Coalesce the helpfulness votes in memory and write them in batches
+
+    Votes are added to the counters of the evaluations by a background thread,
+    once per flush interval or as soon as max_pending votes are waiting, with a
+    single UPDATE for every evaluation voted in the batch. Votes of a failed
+    flush are kept and written by the next one.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._votes: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._pending_votes = 0
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add(self, company_evaluation_id: int, counter: str):
+        with self._lock:
+            self._votes[company_evaluation_id][counter] += 1
+            self._pending_votes += 1
+            if self._pending_votes >= self.max_pending:
+                self._flush_requested.set()
+
+    def pending(self, company_evaluation_id: int) -> Dict[str, int]:
+        """Return the votes of an evaluation that are not written yet"""
+        with self._lock:
+            return dict(self._votes.get(company_evaluation_id, {}))
+
+    def flush(self):
+        with self._lock:
+            votes = self._votes
+            self._votes = defaultdict(lambda: defaultdict(int))
+            self._pending_votes = 0
+
+        if not votes:
+            return
+
+        session_local_db = SessionLocal()
+        try:
+            crud.add_evaluation_votes(db=session_local_db, votes=votes)
+        except Exception:
+            logger.exception("Could not write the buffered votes")
+            self._restore(votes)
+        finally:
+            session_local_db.close()
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="vote-buffer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._flush_requested.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+    def _restore(self, votes: Dict[int, Dict[str, int]]):
+        with self._lock:
+            for company_evaluation_id, counters in votes.items():
+                for counter, amount in counters.items():
+                    self._votes[company_evaluation_id][counter] += amount
+                    self._pending_votes += amount
+
+
+vote_buffer = VoteBuffer(
+    flush_interval=VOTE_BUFFER_FLUSH_INTERVAL, max_pending=VOTE_BUFFER_MAX_PENDING
+)
+
+
+def buffer_evaluation_vote(
+    db: Session, company_evaluation_id: int, counter: str
+) -> Optional[schemas.CompanyEvaluationOut]:
+    """Add a vote to the buffer and return the evaluation with its pending votes
+
+    The evaluation is still read on every vote, to answer 404 for unknown IDs
+    and to return its counters. It is a plain read by primary key, memoized for
+    the request, which takes no row lock and never waits for the flushes, so
+    votes are never serialized on the row. Only the flushes write the counters.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        company_evaluation_id (int): ID of the company evaluation.
+        counter (str): utility_counter or non_utility_counter.
+
+    Returns:
+        The company evaluation including the votes not written yet, None when
+        it does not exist
+    """
+    company_evaluation = crud.get_company_evaluation_by_id(
+        db=db, id=company_evaluation_id
+    )
+    if company_evaluation is None:
+        return None
+
+    vote_buffer.add(company_evaluation_id, counter)
+    pending_votes = vote_buffer.pending(company_evaluation_id)
+
+    company_evaluation = schemas.CompanyEvaluationOut.from_orm(company_evaluation)
+    return company_evaluation.copy(
+        update={
+            pending_counter: (getattr(company_evaluation, pending_counter) or 0)
+            + amount
+            for pending_counter, amount in pending_votes.items()
+        }
+    )
@@ -2,20 +2,75 @@
 
 # SQLAlchemy
 from sqlalchemy import Column, Integer, String, DECIMAL, Date, ForeignKey, DateTime
+from sqlalchemy import Computed, Float, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy import DDL, Index, event
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.orm import backref
 
 # Project
 from ratings.config.database import Base
 
+# Text search configuration of the evaluations, which are written in several
+# languages, so words are not stemmed
+SEARCH_CONFIG = "simple"
+
 
 class CompanyEvaluation(Base):
 
     __tablename__ = "company_evaluations"
+    __table_args__ = (
+        # Listing of the evaluations of a company for every supported sort,
+        # with the id as tie-breaker
+        Index("ix_company_evaluations_company_id_id", "company_id", "id"),
+        Index(
+            "ix_company_evaluations_company_id_rating",
+            "company_id",
+            "rating",
+            "id",
+        ),
+        Index(
+            "ix_company_evaluations_company_id_utility_counter",
+            "company_id",
+            "utility_counter",
+            "id",
+        ),
+        Index(
+            "ix_company_evaluations_company_id_created_at",
+            "company_id",
+            "created_at",
+            "id",
+        ),
+        # Substring filters, which use leading wildcards
+        Index(
+            "ix_company_evaluations_job_title_trgm",
+            "job_title",
+            postgresql_using="gin",
+            postgresql_ops={"job_title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_company_evaluations_content_type_trgm",
+            "content_type",
+            postgresql_using="gin",
+            postgresql_ops={"content_type": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_company_evaluations_job_location_trgm",
+            "job_location",
+            postgresql_using="gin",
+            postgresql_ops={"job_location": "gin_trgm_ops"},
+        ),
+        # Full text search
+        Index(
+            "ix_company_evaluations_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    company_id = Column(Integer, index=True)
+    company_id = Column(Integer)
     job_title = Column(String(70), nullable=False)
     content_type = Column(String(250), nullable=False)
     rating = Column(DECIMAL(2, 1), nullable=False)
@@ -38,6 +93,18 @@ class CompanyEvaluation(Base):
     non_utility_counter = Column(Integer, default=0)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now())
+    # Maintained by PostgreSQL, and only needed by the search queries
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', job_title), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', content_type), 'B') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', job_location), 'C')",
+                persisted=True,
+            ),
+        )
+    )
 
     # Relationships
     complaints = relationship(
@@ -46,6 +113,125 @@ class CompanyEvaluation(Base):
     )
 
 
+event.listen(
+    CompanyEvaluation.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
+
+
+# Criteria rated by every company evaluation, the overall rating is their mean
+COMPANY_RATING_CRITERIA = (
+    "career_development_rating",
+    "diversity_equal_opportunity_rating",
+    "working_environment_rating",
+    "salary_rating",
+)
+
+
+class CompanyRatingSummary(Base):
+
+    __tablename__ = "company_rating_summaries"
+
+    company_id = Column(Integer, primary_key=True, autoincrement=False)
+    total_reviews = Column(Integer, nullable=False, default=0)
+    career_development_rating_sum = Column(Integer, nullable=False, default=0)
+    diversity_equal_opportunity_rating_sum = Column(Integer, nullable=False, default=0)
+    working_environment_rating_sum = Column(Integer, nullable=False, default=0)
+    salary_rating_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now())
+
+    # Sums of the squared weights, for the confidence of the averages
+    career_development_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    diversity_equal_opportunity_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    working_environment_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    salary_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    # Averages of the weights, maintained by PostgreSQL whenever the sums
+    # change, so the leaderboard is read from their indexes
+    company_rating_average = Column(
+        Float,
+        Computed(
+            "("
+            + " + ".join(f"{criteria}_sum" for criteria in COMPANY_RATING_CRITERIA)
+            + f")::float / NULLIF(total_reviews * {len(COMPANY_RATING_CRITERIA)}, 0)"
+        ),
+    )
+    career_development_rating_average = Column(
+        Float,
+        Computed("career_development_rating_sum::float / NULLIF(total_reviews, 0)"),
+    )
+    diversity_equal_opportunity_rating_average = Column(
+        Float,
+        Computed(
+            "diversity_equal_opportunity_rating_sum::float / NULLIF(total_reviews, 0)"
+        ),
+    )
+    working_environment_rating_average = Column(
+        Float,
+        Computed("working_environment_rating_sum::float / NULLIF(total_reviews, 0)"),
+    )
+    salary_rating_average = Column(
+        Float,
+        Computed("salary_rating_sum::float / NULLIF(total_reviews, 0)"),
+    )
+
+
+# Leaderboard of every rating, ties broken by the amount of evaluations
+for average in (
+    CompanyRatingSummary.company_rating_average,
+    CompanyRatingSummary.career_development_rating_average,
+    CompanyRatingSummary.diversity_equal_opportunity_rating_average,
+    CompanyRatingSummary.working_environment_rating_average,
+    CompanyRatingSummary.salary_rating_average,
+):
+    Index(
+        f"ix_leaderboard_{average.key}",
+        average.desc(),
+        CompanyRatingSummary.total_reviews.desc(),
+        CompanyRatingSummary.company_id,
+        postgresql_where=CompanyRatingSummary.total_reviews > 0,
+    )
+
+
+class CompanyRatingTrend(Base):
+    """Statistics of the evaluations of a company created in a week or a month
+
+    Updated in the same transaction that creates the evaluations, like the
+    company rating summaries.
+    """
+
+    __tablename__ = "company_rating_trends"
+
+    company_id = Column(Integer, primary_key=True, autoincrement=False)
+    period_type = Column(String(10), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    total_reviews = Column(Integer, nullable=False, default=0)
+    career_development_rating_sum = Column(Integer, nullable=False, default=0)
+    diversity_equal_opportunity_rating_sum = Column(Integer, nullable=False, default=0)
+    working_environment_rating_sum = Column(Integer, nullable=False, default=0)
+    salary_rating_sum = Column(Integer, nullable=False, default=0)
+    career_development_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0
+    )
+    diversity_equal_opportunity_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0
+    )
+    working_environment_rating_sum_of_squares = Column(
+        Integer, nullable=False, default=0
+    )
+    salary_rating_sum_of_squares = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now())
+
+
 class ReportingReasonType(Base):
 
     __tablename__ = "reporting_reason_types"
@@ -94,6 +280,17 @@ class PostulationStatus(Base):
 class Applicant(Base):
 
     __tablename__ = "applicants"
+    __table_args__ = (
+        # Named as the unique constraint of the SQL bootstrap, which is backed
+        # by an index of the same name
+        Index("tracking_code_unique", "tracking_code", unique=True),
+        # Lookup of an application process by its tracking code
+        Index(
+            "ix_applicants_tracking_code_paternal_last_name",
+            "tracking_code",
+            "paternal_last_name",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vacancy_id = Column(Integer, index=True)
@@ -168,3 +365,33 @@ class RecruitmentProcessEvaluation(Base):
     applicant = relationship(
         "Applicant", back_populates="recruitment_process_evaluations"
     )
+
+
+class OutboxEvent(Base):
+    """Side effect on an upstream service, written in the transaction that causes it
+
+    Events are delivered by the outbox worker, see ratings/cruds/outbox.py.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(70), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, server_default=func.now())
+    delivered_at = Column(DateTime, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        # Only the pending events are scanned by the worker
+        Index(
+            "ix_outbox_events_pending",
+            available_at,
+            id,
+            postgresql_where=(delivered_at.is_(None) & failed_at.is_(None)),
+        ),
+    )
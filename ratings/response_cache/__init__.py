@@ -0,0 +1,45 @@
+# Python
+import os
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.response_cache.base import ResponseCacheBackend
+from ratings.response_cache.cache import ResponseCache
+from ratings.response_cache.middleware import CacheRule, ResponseCacheMiddleware
+
+load_dotenv()
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+RESPONSE_CACHE_CONTROL = os.getenv("RESPONSE_CACHE_CONTROL", "no-cache")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_PREFIX = os.getenv("REDIS_PREFIX", "ratings:")
+
+# Tag of every response that depends on the ratings of several companies
+COMPANY_RATINGS_TAG = "company-ratings"
+
+
+def company_tag(company_id: int) -> str:
+    """Tag of the responses that depend on the evaluations of a company"""
+    return f"company:{company_id}"
+
+
+def create_response_cache_backend() -> ResponseCacheBackend:
+    """Create the backend selected by RESPONSE_CACHE_BACKEND, memory or redis"""
+    if RESPONSE_CACHE_BACKEND == "redis":
+        # redis is only needed by the Redis backend
+        from ratings.response_cache.redis import RedisBackend
+
+        return RedisBackend(url=REDIS_URL, prefix=REDIS_PREFIX)
+
+    from ratings.response_cache.memory import MemoryBackend
+
+    return MemoryBackend(max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(
+    backend=create_response_cache_backend(), ttl=RESPONSE_CACHE_TTL
+)
@@ -0,0 +1,30 @@
+# Typing
+from typing import List, Optional
+
+
+class ResponseCacheBackend:
+    """Storage of the cached responses and of the versions of their tags
+
+    Increasing the version of a tag changes the key of every response tagged
+    with it, so they are all invalidated at once, in every process sharing the
+    backend.
+    """
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def aset(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    async def aget_versions(self, tags: List[str]) -> List[int]:
+        """Return the current version of every tag, 0 for tags never increased"""
+        raise NotImplementedError
+
+    def increment_versions(self, tags: List[str]):
+        raise NotImplementedError
+
+    async def aincrement_versions(self, tags: List[str]):
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,88 @@
+# Python
+import hashlib
+import json
+import logging
+
+# Typing
+from typing import Iterable, List, NamedTuple, Optional
+
+# Project
+from ratings.response_cache.base import ResponseCacheBackend
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    media_type: str
+    body: bytes
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+class ResponseCache:
+    """Responses of the read endpoints, invalidated by tags
+
+    Every response is stored under a key derived from the request and from the
+    versions of its tags at the time the request started, so a response
+    computed while a write invalidates one of its tags is never served.
+    Failures of the backend are logged, and never fail the request.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, ttl: float):
+        """
+        Args:
+            backend (ResponseCacheBackend): Storage of the responses.
+            ttl (float): Seconds a response is served from the cache.
+        """
+        self.backend = backend
+        self.ttl = ttl
+
+    async def entry_key(self, key: str, tags: List[str]) -> str:
+        """Return the key of the response of a request with its current tags
+
+        Args:
+            key (str): Key of the request, its path and query parameters.
+            tags (List[str]): Tags of the response.
+        """
+        versions = await self.backend.aget_versions(tags)
+        material = "\n".join(
+            [key, *(f"{tag}={version}" for tag, version in zip(tags, versions))]
+        )
+        return f"response:{hashlib.sha256(material.encode()).hexdigest()}"
+
+    async def get(self, entry_key: str) -> Optional[CachedResponse]:
+        value = await self.backend.aget(entry_key)
+        if value is None:
+            return None
+
+        header, body = value.split(b"\n", 1)
+        header = json.loads(header)
+        return CachedResponse(
+            etag=header["etag"], media_type=header["media_type"], body=body
+        )
+
+    async def set(self, entry_key: str, response: CachedResponse):
+        header = json.dumps({"etag": response.etag, "media_type": response.media_type})
+        await self.backend.aset(
+            entry_key, header.encode() + b"\n" + response.body, self.ttl
+        )
+
+    def invalidate(self, tags: Iterable[str]):
+        """Invalidate every cached response with any of the tags"""
+        try:
+            self.backend.increment_versions(list(tags))
+        except Exception:
+            logger.exception("Could not invalidate the cached responses %s", tags)
+
+    async def ainvalidate(self, tags: Iterable[str]):
+        """Async version of invalidate"""
+        try:
+            await self.backend.aincrement_versions(list(tags))
+        except Exception:
+            logger.exception("Could not invalidate the cached responses %s", tags)
+
+    async def aclose(self):
+        await self.backend.aclose()
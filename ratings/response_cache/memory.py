@@ -0,0 +1,60 @@
+# Python
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+# Typing
+from typing import Dict, List, Optional, Tuple
+
+# Project
+from ratings.response_cache.base import ResponseCacheBackend
+
+
+class MemoryBackend(ResponseCacheBackend):
+    """Thread safe LRU of the responses cached by the current process
+
+    Invalidations made by other processes are not seen, so with several workers
+    a response can be served stale for up to its time to live.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries (int): Maximum amount of responses, the least recently
+                used responses are evicted first.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def aset(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aget_versions(self, tags: List[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def increment_versions(self, tags: List[str]):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] += 1
+
+    async def aincrement_versions(self, tags: List[str]):
+        self.increment_versions(tags)
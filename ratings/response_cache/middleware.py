@@ -0,0 +1,153 @@
+# Python
+import logging
+import re
+from urllib.parse import urlencode
+
+# Typing
+from typing import Callable, List, NamedTuple, Optional, Pattern
+
+# Starlette
+from starlette.datastructures import Headers, QueryParams
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Project
+from ratings.response_cache.cache import CachedResponse, ResponseCache, strong_etag
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRule(NamedTuple):
+    """Path whose GET responses are cached, and how to get their tags"""
+
+    pattern: Pattern
+    tags: Callable[[re.Match, QueryParams], List[str]]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag, with a weak comparison"""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+class ResponseCacheMiddleware:
+    """Cache the 200 responses of the GET requests matching the rules
+
+    Responses are sent with a strong ETag, the SHA-256 of the body, and
+    requests whose If-None-Match matches it get a 304 without a body, whether
+    the response was cached or just computed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        rules: List[CacheRule],
+        cache_control: str,
+    ):
+        self.app = app
+        self.cache = cache
+        self.rules = rules
+        self.cache_control = cache_control
+
+    def match(self, path: str):
+        for rule in self.rules:
+            match = rule.pattern.fullmatch(path)
+            if match is not None:
+                return rule, match
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        rule, match = self.match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        # Repeated parameters keep their order, which can change the response
+        query = urlencode(
+            sorted(request.query_params.multi_items(), key=lambda item: item[0])
+        )
+        tags = sorted(set(rule.tags(match, request.query_params)))
+        if_none_match = request.headers.get("if-none-match")
+
+        try:
+            entry_key = await self.cache.entry_key(f"{scope['path']}?{query}", tags)
+            cached_response = await self.cache.get(entry_key)
+        except Exception:
+            logger.exception("Could not read the response cache")
+            await self.app(scope, receive, send)
+            return
+
+        if cached_response is not None:
+            await self.send_response(send, cached_response, if_none_match, "HIT")
+            return
+
+        start_message: Optional[Message] = None
+        body = bytearray()
+
+        async def buffer_response(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                if message["status"] != 200:
+                    await send(message)
+                return
+
+            if start_message["status"] != 200:
+                await send(message)
+                return
+
+            body.extend(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            response = CachedResponse(
+                etag=strong_etag(bytes(body)),
+                media_type=Headers(raw=start_message["headers"]).get(
+                    "content-type", "application/json"
+                ),
+                body=bytes(body),
+            )
+            await self.send_response(send, response, if_none_match, "MISS")
+
+            try:
+                await self.cache.set(entry_key, response)
+            except Exception:
+                logger.exception("Could not write the response cache")
+
+        await self.app(scope, receive, buffer_response)
+
+    async def send_response(
+        self,
+        send: Send,
+        response: CachedResponse,
+        if_none_match: Optional[str],
+        cache_status: str,
+    ):
+        headers = [
+            (b"etag", response.etag.encode()),
+            (b"cache-control", self.cache_control.encode()),
+            (b"x-cache", cache_status.encode()),
+        ]
+
+        if if_none_match is not None and etag_matches(if_none_match, response.etag):
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers += [
+            (b"content-type", response.media_type.encode()),
+            (b"content-length", str(len(response.body)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": response.body})
@@ -0,0 +1,59 @@
+# Typing
+from typing import List, Optional
+
+# Redis
+import redis
+import redis.asyncio
+
+# Project
+from ratings.response_cache.base import ResponseCacheBackend
+
+
+class RedisBackend(ResponseCacheBackend):
+    """Responses and tag versions shared by every worker through Redis
+
+    Responses expire with the Redis TTL, and tag versions are kept without
+    expiration, so a response never becomes valid again after an invalidation.
+    Works with any server speaking the Redis protocol.
+    """
+
+    def __init__(self, url: str, prefix: str):
+        """
+        Args:
+            url (str): Redis URL, such as redis://localhost:6379/0.
+            prefix (str): Prefix of every key written by the backend.
+        """
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url)
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        return await self.async_client.get(f"{self.prefix}{key}")
+
+    async def aset(self, key: str, value: bytes, ttl: float):
+        await self.async_client.set(f"{self.prefix}{key}", value, px=int(ttl * 1000))
+
+    async def aget_versions(self, tags: List[str]) -> List[int]:
+        if not tags:
+            return []
+        versions = await self.async_client.mget([self.tag_key(tag) for tag in tags])
+        return [int(version or 0) for version in versions]
+
+    def increment_versions(self, tags: List[str]):
+        pipeline = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(self.tag_key(tag))
+        pipeline.execute()
+
+    async def aincrement_versions(self, tags: List[str]):
+        pipeline = self.async_client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(self.tag_key(tag))
+        await pipeline.execute()
+
+    async def aclose(self):
+        await self.async_client.close()
+        await self.async_client.connection_pool.disconnect()
@@ -78,6 +78,53 @@ class CompanyEvaluationOut(CompanyEvaluationBase):
         orm_mode = True
 
 
+class CompanyEvaluationCursorPage(BaseModel):
+    items: List[CompanyEvaluationOut]
+    size: int = Field(..., ge=1, example=50)
+    next_cursor: Optional[str] = Field(
+        None,
+        title="Cursor of the next page",
+        description="Cursor to request the next page, null on the last page",
+    )
+
+
+class CompanyEvaluationSearchResult(CompanyEvaluationOut):
+    rank: float = Field(..., ge=0, title="Relevance of the evaluation to the search")
+    snippet: str = Field(
+        ...,
+        title="Content of the evaluation with the matched words highlighted",
+        description="HTML escaped, with the matched words inside <mark> tags",
+        example="A <mark>great</mark> place to work",
+    )
+
+
+class CompanyEvaluationSearchPage(BaseModel):
+    items: List[CompanyEvaluationSearchResult]
+    total: int = Field(..., ge=0, title="Evaluations matching the search")
+    page: int = Field(..., ge=1, example=1)
+    size: int = Field(..., ge=1, example=20)
+
+
+class CompanyEvaluationBulkRow(CompanyEvaluationCreate):
+    company_id: int = Field(..., gt=0, example=1)
+
+
+class CompanyEvaluationBulkError(BaseModel):
+    line: int = Field(..., ge=1, title="Line of the row in the imported file")
+    errors: List[str]
+
+
+class CompanyEvaluationBulkReport(BaseModel):
+    received: int = Field(..., ge=0, title="Rows read from the file")
+    imported: int = Field(..., ge=0, title="Rows imported")
+    rejected: int = Field(..., ge=0, title="Rows rejected")
+    errors: List[CompanyEvaluationBulkError] = Field(
+        ..., description="Errors of the rejected rows, up to BULK_IMPORT_MAX_ERRORS"
+    )
+    seconds: float = Field(..., ge=0)
+    rows_per_second: float = Field(..., ge=0)
+
+
 class ReportingReasonTypeBase(BaseModel):
     name: str = Field(
         ...,
@@ -0,0 +1,48 @@
+# Python
+import os
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.storage.base import Storage, StorageWriter
+
+load_dotenv()
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "filesystem")
+STORAGE_DIRECTORY = os.getenv("STORAGE_DIRECTORY", os.path.join(os.getcwd(), "static"))
+STORAGE_PUBLIC_URL = os.getenv("STORAGE_PUBLIC_URL", "/static")
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_PREFIX = os.getenv("S3_PREFIX", "documents/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+S3_PART_SIZE = int(os.getenv("S3_PART_SIZE", 8 * 1024 * 1024))
+S3_URL_EXPIRATION = int(os.getenv("S3_URL_EXPIRATION", 300))
+
+
+def create_storage() -> Storage:
+    """Create the storage selected by STORAGE_BACKEND, filesystem or s3"""
+    if STORAGE_BACKEND == "s3":
+        # boto3 is only needed by the S3 backend
+        from ratings.storage.s3 import S3Storage
+
+        return S3Storage(
+            bucket=S3_BUCKET,
+            prefix=S3_PREFIX,
+            endpoint_url=S3_ENDPOINT_URL,
+            public_endpoint_url=S3_PUBLIC_ENDPOINT_URL,
+            region=S3_REGION,
+            access_key_id=S3_ACCESS_KEY_ID,
+            secret_access_key=S3_SECRET_ACCESS_KEY,
+            part_size=S3_PART_SIZE,
+            url_expiration=S3_URL_EXPIRATION,
+        )
+
+    from ratings.storage.filesystem import FilesystemStorage
+
+    return FilesystemStorage(directory=STORAGE_DIRECTORY, public_url=STORAGE_PUBLIC_URL)
+
+
+storage = create_storage()
@@ -0,0 +1,32 @@
+class StorageWriter:
+    """File being written to a storage, one chunk at a time
+
+    Nothing is visible under the final name until commit is called, and abort
+    discards everything written so far.
+    """
+
+    async def write(self, chunk: bytes):
+        raise NotImplementedError
+
+    async def commit(self, name: str):
+        """Publish the written file under its final name"""
+        raise NotImplementedError
+
+    async def abort(self):
+        raise NotImplementedError
+
+
+class Storage:
+    """Storage of the applicant documents"""
+
+    async def create_writer(self, prefix: str) -> StorageWriter:
+        """Start writing a new file
+
+        Args:
+            prefix (str): Prefix of the temporary name of the file.
+        """
+        raise NotImplementedError
+
+    async def url(self, name: str) -> str:
+        """Return the URL where the file can be downloaded without going through the app"""
+        raise NotImplementedError
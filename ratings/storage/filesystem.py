@@ -0,0 +1,62 @@
+# Python
+import os
+import tempfile
+
+# FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+# Project
+from ratings.storage.base import Storage, StorageWriter
+
+
+class FilesystemWriter(StorageWriter):
+    def __init__(self, directory: str, temporary_file, temporary_path: str):
+        self.directory = directory
+        self.temporary_file = temporary_file
+        self.temporary_path = temporary_path
+
+    async def write(self, chunk: bytes):
+        await run_in_threadpool(self.temporary_file.write, chunk)
+
+    async def commit(self, name: str):
+        await run_in_threadpool(self.temporary_file.flush)
+        await run_in_threadpool(os.fsync, self.temporary_file.fileno())
+        self.temporary_file.close()
+
+        # The temporary file is in the same directory, so the rename is atomic
+        await run_in_threadpool(
+            os.replace, self.temporary_path, os.path.join(self.directory, name)
+        )
+
+    async def abort(self):
+        self.temporary_file.close()
+        try:
+            os.remove(self.temporary_path)
+        except FileNotFoundError:
+            pass
+
+
+class FilesystemStorage(Storage):
+    """Store the files in a local directory served by nginx"""
+
+    def __init__(self, directory: str, public_url: str):
+        """
+        Args:
+            directory (str): Directory where the files are stored.
+            public_url (str): URL where nginx serves the directory.
+        """
+        self.directory = directory
+        self.public_url = public_url.rstrip("/")
+
+    async def create_writer(self, prefix: str) -> FilesystemWriter:
+        file_descriptor, temporary_path = await run_in_threadpool(
+            tempfile.mkstemp, dir=self.directory, prefix=f".{prefix}_", suffix=".part"
+        )
+        return FilesystemWriter(
+            directory=self.directory,
+            temporary_file=os.fdopen(file_descriptor, "wb"),
+            temporary_path=temporary_path,
+        )
+
+    async def url(self, name: str) -> str:
+        return f"{self.public_url}/{name}"
@@ -0,0 +1,160 @@
+# Python
+import uuid
+
+# FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+# AWS
+import boto3
+from botocore.config import Config
+
+# Project
+from ratings.storage.base import Storage, StorageWriter
+
+
+class S3Writer(StorageWriter):
+    """Multipart upload to a staging key, copied to its final key on commit
+
+    Chunks are buffered until a part is complete, so the memory used by an
+    upload never exceeds one part.
+    """
+
+    def __init__(self, storage: "S3Storage", staging_key: str, upload_id: str):
+        self.storage = storage
+        self.staging_key = staging_key
+        self.upload_id = upload_id
+        self.buffer = bytearray()
+        self.parts = []
+        # Once completed, the upload is a staging object instead of parts
+        self.completed = False
+
+    async def write(self, chunk: bytes):
+        self.buffer += chunk
+        if len(self.buffer) >= self.storage.part_size:
+            await self._upload_part()
+
+    async def commit(self, name: str):
+        client = self.storage.client
+        bucket = self.storage.bucket
+
+        # The last part can be smaller than the minimum part size
+        if self.buffer or not self.parts:
+            await self._upload_part()
+
+        await run_in_threadpool(
+            client.complete_multipart_upload,
+            Bucket=bucket,
+            Key=self.staging_key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+        self.completed = True
+        await run_in_threadpool(
+            client.copy_object,
+            Bucket=bucket,
+            Key=self.storage.key(name),
+            CopySource={"Bucket": bucket, "Key": self.staging_key},
+            ContentType="application/pdf",
+            MetadataDirective="REPLACE",
+        )
+        await run_in_threadpool(
+            client.delete_object, Bucket=bucket, Key=self.staging_key
+        )
+
+    async def abort(self):
+        if self.completed:
+            await run_in_threadpool(
+                self.storage.client.delete_object,
+                Bucket=self.storage.bucket,
+                Key=self.staging_key,
+            )
+            return
+
+        await run_in_threadpool(
+            self.storage.client.abort_multipart_upload,
+            Bucket=self.storage.bucket,
+            Key=self.staging_key,
+            UploadId=self.upload_id,
+        )
+
+    async def _upload_part(self):
+        part_number = len(self.parts) + 1
+        response = await run_in_threadpool(
+            self.storage.client.upload_part,
+            Bucket=self.storage.bucket,
+            Key=self.staging_key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.buffer),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.buffer = bytearray()
+
+
+class S3Storage(Storage):
+    """Store the files in an S3 compatible bucket, downloaded with presigned URLs"""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        endpoint_url: str,
+        public_endpoint_url: str,
+        region: str,
+        access_key_id: str,
+        secret_access_key: str,
+        part_size: int,
+        url_expiration: int,
+    ):
+        """
+        Args:
+            bucket (str): Name of the bucket.
+            prefix (str): Prefix of the keys of the files.
+            endpoint_url (str): Endpoint used by the app, None for AWS S3.
+            public_endpoint_url (str): Endpoint used in the presigned URLs, when
+                the clients reach the storage through another address.
+            region (str): Region of the bucket.
+            access_key_id (str): Access key ID.
+            secret_access_key (str): Secret access key.
+            part_size (int): Size of the parts of the multipart uploads, at
+                least 5 MiB.
+            url_expiration (int): Seconds the presigned URLs are valid.
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        self.part_size = part_size
+        self.url_expiration = url_expiration
+
+        session = boto3.session.Session(
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            region_name=region,
+        )
+        config = Config(signature_version="s3v4", s3={"addressing_style": "path"})
+        self.client = session.client("s3", endpoint_url=endpoint_url, config=config)
+        self.public_client = session.client(
+            "s3", endpoint_url=public_endpoint_url or endpoint_url, config=config
+        )
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    async def create_writer(self, prefix: str) -> S3Writer:
+        staging_key = self.key(f".staging/{prefix}_{uuid.uuid4().hex}")
+        response = await run_in_threadpool(
+            self.client.create_multipart_upload,
+            Bucket=self.bucket,
+            Key=staging_key,
+            ContentType="application/pdf",
+        )
+        return S3Writer(
+            storage=self, staging_key=staging_key, upload_id=response["UploadId"]
+        )
+
+    async def url(self, name: str) -> str:
+        # Presigning is done locally, without any request to the storage
+        return self.public_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.key(name)},
+            ExpiresIn=self.url_expiration,
+        )
@@ -0,0 +1,126 @@
+# Python
+import codecs
+import csv
+import json
+import os
+from collections import deque
+
+# Typing
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, Tuple, Union
+
+# SQLAlchemy
+from sqlalchemy.orm import Session
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.cruds import crud
+from ratings.utils import enums
+
+load_dotenv()
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+# Largest request body of the bulk import endpoint
+BULK_IMPORT_MAX_SIZE = int(os.getenv("BULK_IMPORT_MAX_SIZE", 100 * 1024 * 1024))
+
+INVALID_UTF8 = "Invalid UTF-8: the line is not UTF-8 encoded"
+
+
+def decode_lines(file: BinaryIO, invalid_lines: Deque[int]) -> Iterator[str]:
+    """Decode the lines of a UTF-8 file one at a time, skipping its byte order mark
+
+    Lines that are not valid UTF-8 are replaced by empty lines, and their
+    numbers appended to invalid_lines.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if line_number == 1 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8) :]
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError:
+            invalid_lines.append(line_number)
+            text = "\n" if line.endswith(b"\n") else ""
+        yield text
+
+
+def reject_invalid_lines(
+    rows: Iterable[Tuple[int, Union[Dict, str]]], invalid_lines: Deque[int]
+) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Add the lines that are not valid UTF-8 to the rows, in the order of the file"""
+    for line_number, row in rows:
+        while invalid_lines and invalid_lines[0] <= line_number:
+            yield invalid_lines.popleft(), INVALID_UTF8
+        yield line_number, row
+
+    while invalid_lines:
+        yield invalid_lines.popleft(), INVALID_UTF8
+
+
+def read_ndjson_rows(file: Iterable[str]) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, f"Invalid JSON: {error}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Invalid JSON: the row is not an object"
+            continue
+        yield line_number, row
+
+
+def read_csv_rows(file: Iterable[str]) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    reader = csv.DictReader(file)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, "Invalid CSV: the row has more fields than the header"
+            continue
+        # Empty fields are missing values
+        yield reader.line_num, {
+            field: value for field, value in row.items() if value not in ("", None)
+        }
+
+
+def read_rows(
+    file: BinaryIO, format: enums.BulkImportFormat
+) -> Iterator[Tuple[int, Union[Dict, str]]]:
+    """Read the rows of an NDJSON or CSV file one at a time
+
+    Lines that are not valid UTF-8 are rejected like the rows that can not be
+    parsed, so they don't stop the import of the other rows.
+
+    Args:
+        file (BinaryIO): UTF-8 encoded file.
+        format (enums.BulkImportFormat): Format of the file.
+
+    Returns:
+        Iterator[Tuple[int, Union[Dict, str]]]: Line and fields of every row, or
+            line and error when the row can not be parsed
+    """
+    invalid_lines: Deque[int] = deque()
+    lines = decode_lines(file, invalid_lines)
+    if format == enums.BulkImportFormat.csv:
+        rows = read_csv_rows(lines)
+    else:
+        rows = read_ndjson_rows(lines)
+    return reject_invalid_lines(rows, invalid_lines)
+
+
+def import_company_evaluations(
+    db: Session,
+    file: BinaryIO,
+    format: enums.BulkImportFormat,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+) -> Dict:
+    """Import the company evaluations of an NDJSON or CSV file
+
+    See crud.bulk_create_company_evaluations.
+
+    Returns:
+        Dict: Report of the import
+    """
+    return crud.bulk_create_company_evaluations(
+        db, rows=read_rows(file, format), chunk_size=chunk_size
+    )
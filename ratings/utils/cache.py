@@ -0,0 +1,167 @@
+# Python
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Thread safe LRU cache whose entries expire after a time to live
+
+    Concurrent misses of the same key are loaded only once, and expired entries
+    are served while another thread refreshes them or when the refresh fails.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, retry_after: float = 10):
+        """
+        Args:
+            ttl (float): Seconds an entry is considered fresh.
+            max_entries (int): Maximum amount of entries, the least recently used
+                entries are evicted first.
+            retry_after (float): Seconds a stale entry is served before trying to
+                refresh it again after a failed refresh.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retry_after = retry_after
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Lock of every key being loaded and amount of threads using it
+        self._key_locks: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+        self._refresh_tasks: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value of a key, loading it when it is missing or expired
+
+        Args:
+            key (Hashable): Key of the entry.
+            loader (Callable[[], Any]): Function that loads the value of the key.
+
+        Returns:
+            Any: The value of the key
+        """
+        entry = self._get_entry(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        key_lock = self._get_key_lock(key)
+        try:
+            # Someone else is already refreshing an expired entry, serve it stale
+            if entry is not None and not key_lock.acquire(blocking=False):
+                return entry[1]
+            if entry is None:
+                key_lock.acquire()
+
+            try:
+                entry = self._get_entry(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    return entry[1]
+
+                try:
+                    value = loader()
+                except Exception:
+                    if entry is None:
+                        raise
+                    self._set_entry(key, entry[1], self.retry_after)
+                    return entry[1]
+
+                self._set_entry(key, value, self.ttl)
+                return value
+            finally:
+                key_lock.release()
+        finally:
+            self._release_key_lock(key)
+
+    async def aget(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of get
+
+        Expired entries are returned right away while they are refreshed in the
+        background.
+
+        Args:
+            key (Hashable): Key of the entry.
+            loader (Callable[[], Awaitable[Any]]): Coroutine function that loads
+                the value of the key.
+
+        Returns:
+            Any: The value of the key
+        """
+        entry = self._get_entry(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._refresh_tasks.get(key)
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.ensure_future(self._arefresh(key, loader, entry))
+            self._refresh_tasks[key] = task
+
+        if entry is not None:
+            return entry[1]
+
+        return await asyncio.shield(task)
+
+    async def _arefresh(self, key: Hashable, loader, entry) -> Any:
+        try:
+            value = await loader()
+        except Exception:
+            if entry is None:
+                raise
+            self._set_entry(key, entry[1], self.retry_after)
+            return entry[1]
+        finally:
+            self._refresh_tasks.pop(key, None)
+
+        self._set_entry(key, value, self.ttl)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._set_entry(key, value, self.ttl)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get_entry(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set_entry(self, key: Hashable, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_key_lock(self, key: Hashable) -> threading.Lock:
+        """Return the lock of a key, counting the caller as one of its users
+
+        Every call must be followed by a call to _release_key_lock.
+        """
+        with self._lock:
+            key_lock, users = self._key_locks.get(key, (None, 0))
+            if key_lock is None:
+                key_lock = threading.Lock()
+            self._key_locks[key] = (key_lock, users + 1)
+            return key_lock
+
+    def _release_key_lock(self, key: Hashable):
+        """Remove the lock of a key once none of its users is waiting for it"""
+        with self._lock:
+            key_lock, users = self._key_locks[key]
+            if users == 1:
+                del self._key_locks[key]
+            else:
+                self._key_locks[key] = (key_lock, users - 1)
@@ -27,3 +27,43 @@ class SalaryFrequency(Enum):
     week = "Week"
     month = "Month"
     year = "Year"
+
+
+class CompanyEvaluationSort(Enum):
+    rating = "rating"
+    helpfulness = "helpfulness"
+    date = "date"
+
+
+class SortOrder(Enum):
+    asc = "ASC"
+    desc = "DESC"
+
+
+class ApplicantDocument(Enum):
+    cv = "cv"
+    motivation_letter = "motivation-letter"
+
+
+class RatingMode(Enum):
+    mean = "mean"
+    bayesian = "bayesian"
+    wilson = "wilson"
+
+
+class TrendPeriod(Enum):
+    week = "week"
+    month = "month"
+
+
+class LeaderboardCriteria(Enum):
+    overall = "overall"
+    career_development = "career-development"
+    diversity_equal_opportunity = "diversity-equal-opportunity"
+    working_environment = "working-environment"
+    salary = "salary"
+
+
+class BulkImportFormat(Enum):
+    ndjson = "ndjson"
+    csv = "csv"
@@ -0,0 +1,205 @@
+# Python
+import hashlib
+import os
+
+# Typing
+from typing import Dict, List, NamedTuple
+
+# FastAPI
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.requests import ClientDisconnect
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Dotenv
+from dotenv import load_dotenv
+
+# Project
+from ratings.storage import storage
+from ratings.storage.base import StorageWriter
+
+load_dotenv()
+UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 5 * 1024 * 1024))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+# Whole body of a request with uploads: a CV, a motivation letter and the form
+UPLOAD_REQUEST_MAX_SIZE = int(
+    os.getenv("UPLOAD_REQUEST_MAX_SIZE", 2 * UPLOAD_MAX_SIZE + 64 * 1024)
+)
+
+PDF_CONTENT_TYPES = ["application/pdf"]
+PDF_MAGIC_BYTES = b"%PDF-"
+
+
+class StagedUpload(NamedTuple):
+    """Uploaded file written to the storage, but not published yet"""
+
+    name: str
+    writer: StorageWriter
+
+
+async def stage_pdf_upload(upload: UploadFile, prefix: str) -> StagedUpload:
+    """Write an uploaded PDF to the storage, to be published as <prefix>_<sha256>.pdf
+
+    The upload is streamed in chunks to the document storage, checking its size
+    and its PDF signature on the way. Nothing is published until the
+    writer commits, so a file is either missing or complete,
+    and two different files never get the same name. The storage runs its
+    blocking operations in the threadpool one chunk at a time, so no thread is
+    held while waiting for the upload.
+
+    Args:
+        upload (UploadFile): Uploaded file.
+        prefix (str): Prefix of the stored file name.
+
+    Returns:
+        StagedUpload: Name and writer of the file, to publish or abort it
+    """
+    if upload.content_type not in PDF_CONTENT_TYPES:
+        raise HTTPException(400, detail="Invalid document type")
+
+    writer = await storage.create_writer(prefix)
+
+    try:
+        digest = hashlib.sha256()
+        header = b""
+        size = 0
+
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > UPLOAD_MAX_SIZE:
+                raise HTTPException(
+                    413, detail=f"The file exceeds {UPLOAD_MAX_SIZE} bytes"
+                )
+
+            if len(header) < len(PDF_MAGIC_BYTES):
+                header += chunk[: len(PDF_MAGIC_BYTES) - len(header)]
+                if not PDF_MAGIC_BYTES.startswith(header):
+                    raise HTTPException(400, detail="Invalid document type")
+
+            digest.update(chunk)
+            await writer.write(chunk)
+
+        if header != PDF_MAGIC_BYTES:
+            raise HTTPException(400, detail="Invalid document type")
+
+        return StagedUpload(name=f"{prefix}_{digest.hexdigest()}.pdf", writer=writer)
+
+    except BaseException:
+        await writer.abort()
+        raise
+
+    finally:
+        await upload.close()
+
+
+class StagedUploads:
+    """Uploads published together when their block exits without errors
+
+    When the block fails, or a publication fails, the uploads not published yet
+    are aborted. Published files are never deleted, because their names depend
+    on their content only, so they can be shared with other records.
+
+    Usage:
+        async with StagedUploads() as uploads:
+            name = await uploads.stage(upload, prefix="cv")
+            ... insert the record referencing name, without committing it
+        ... commit the record
+    """
+
+    def __init__(self):
+        self.pending: List[StagedUpload] = []
+
+    async def stage(self, upload: UploadFile, prefix: str) -> str:
+        """Stage an uploaded PDF, see stage_pdf_upload
+
+        Returns:
+            str: Name the file will be published with
+        """
+        staged_upload = await stage_pdf_upload(upload, prefix)
+        self.pending.append(staged_upload)
+        return staged_upload.name
+
+    async def __aenter__(self) -> "StagedUploads":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                while self.pending:
+                    await self.pending[0].writer.commit(self.pending[0].name)
+                    self.pending.pop(0)
+        finally:
+            for staged_upload in self.pending:
+                await staged_upload.writer.abort()
+            self.pending.clear()
+
+
+class RequestSizeLimitMiddleware:
+    """Reject the request bodies larger than the limit of their path
+
+    Starlette receives and spools a whole multipart body before the path
+    operation runs, so the size of the uploads is checked here too. Requests
+    declaring a larger Content-Length are answered with a 413 without receiving
+    their body, and bodies without one are counted as they are received and cut
+    with a 413 as soon as they go over the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_sizes: Dict[str, int]):
+        """
+        Args:
+            app (ASGIApp): Application to protect.
+            max_sizes (Dict[str, int]): Maximum size in bytes of the body of the
+                requests to every path.
+        """
+        self.app = app
+        self.max_sizes = max_sizes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        max_size = (
+            self.max_sizes.get(scope["path"]) if scope["type"] == "http" else None
+        )
+        if max_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse(
+            {"detail": f"The request exceeds {max_size} bytes"}, status_code=413
+        )
+
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > max_size:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_size:
+                    # The app sees a disconnected client and its response is dropped
+                    rejected = True
+                    await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except ClientDisconnect:
+            if not rejected:
+                raise
@@ -1,53 +1,31 @@
-import random
+import base64
+import json
+import math
+import secrets
+import string
 import functools
 import operator
 
 from typing import List
 
 
+TRACKING_CODE_ALPHABET = string.ascii_uppercase + string.digits
+TRACKING_CODE_LENGTH = 8
+
+
 class Util:
     def create_tracking_code() -> str:
-        MAYUS = [
-            "A",
-            "B",
-            "C",
-            "D",
-            "E",
-            "F",
-            "G",
-            "H",
-            "I",
-            "J",
-            "K",
-            "L",
-            "M",
-            "N",
-            "O",
-            "P",
-            "Q",
-            "R",
-            "S",
-            "T",
-            "U",
-            "V",
-            "X",
-            "Y",
-            "Z",
-        ]
-
-        NUMS = ["1", "2", "3", "4", "5", "6", "7", "8", "9", "0"]
-
-        characters = MAYUS + NUMS
-
-        tracking_code: List = []
-
-        for i in range(8):
-            random_character = random.choice(characters)
-            tracking_code.append(random_character)
-
-        tracking_code = "".join(tracking_code)
-
-        return tracking_code
+        """Return a random tracking code of TRACKING_CODE_LENGTH characters
+
+        Codes are drawn from a cryptographically secure source, since knowing
+        one and a last name is enough to see an application process.
+
+        Returns:
+            str: Tracking code
+        """
+        return "".join(
+            secrets.choice(TRACKING_CODE_ALPHABET) for _ in range(TRACKING_CODE_LENGTH)
+        )
 
     def assign_weight(companion_evaluation_criteria: str) -> int:
         """Return the convertion of a string company evaluation in it's equivalent to a weight
@@ -69,6 +47,69 @@ class Util:
 
         return weight_assigned
 
+    def bayesian_average(
+        total: float, count: int, prior_mean: float, prior_weight: float
+    ) -> float:
+        """Return the mean of some weights shrunk towards a prior mean
+
+        The prior counts as prior_weight weights equal to prior_mean, so the
+        mean of a few weights stays close to the prior and the mean of many
+        weights close to their plain mean.
+
+        Args:
+            total (float): Sum of the weights.
+            count (int): Amount of weights.
+            prior_mean (float): Mean assumed before seeing any weight.
+            prior_weight (float): Amount of weights the prior is worth.
+
+        Returns:
+            float: Bayesian average
+        """
+        return (prior_mean * prior_weight + total) / (prior_weight + count)
+
+    def wilson_lower_bound(
+        total: float,
+        sum_of_squares: float,
+        count: int,
+        min_weight: float,
+        max_weight: float,
+        z: float,
+    ) -> float:
+        """Return the lower bound of the Wilson score interval of the mean of some weights
+
+        The weights are scaled to [0, 1] and the interval uses their observed
+        variance, so it is the classic Wilson bound when every weight is either
+        min_weight or max_weight.
+
+        Args:
+            total (float): Sum of the weights.
+            sum_of_squares (float): Sum of the squares of the weights.
+            count (int): Amount of weights.
+            min_weight (float): Lowest possible weight.
+            max_weight (float): Highest possible weight.
+            z (float): Quantile of the confidence level, 1.96 for 95%.
+
+        Returns:
+            float: Lower bound of the mean, min_weight when there are no weights
+        """
+        if count == 0:
+            return min_weight
+
+        scale = max_weight - min_weight
+        mean = (total / count - min_weight) / scale
+        mean_of_squares = (
+            sum_of_squares / count - 2 * min_weight * total / count + min_weight ** 2
+        ) / scale ** 2
+        variance = max(mean_of_squares - mean ** 2, 0)
+
+        lower_bound = (
+            mean
+            + z ** 2 / (2 * count)
+            - z * math.sqrt(variance / count + z ** 2 / (4 * count ** 2))
+        ) / (1 + z ** 2 / count)
+
+        return min_weight + lower_bound * scale
+
     def round_values(amount, number_of_decimals=1):
         result = round(amount, number_of_decimals)
         return result
@@ -83,3 +124,28 @@ class Util:
             str: the tuple converted into string
         """
         return functools.reduce(operator.add, (tuple))
+
+    def encode_cursor(*values) -> str:
+        """Encode the values of a pagination cursor in an opaque string
+
+        Args:
+            values: JSON serializable values of the cursor
+
+        Returns:
+            str: URL safe cursor
+        """
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(cursor: str) -> List:
+        """Decode the values of a pagination cursor
+
+        Args:
+            cursor (str): Cursor created by encode_cursor
+
+        Raises:
+            ValueError: When the cursor is malformed
+
+        Returns:
+            List: The values of the cursor
+        """
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
@@ -0,0 +1,12 @@
+# Python
+import os
+
+# The settings read when the project modules are imported. The engines do not
+# connect until they are used, so no database is needed.
+os.environ.setdefault("DB_CONNECTION", "postgresql")
+os.environ.setdefault("DB_USERNAME", "postgres")
+os.environ.setdefault("DB_PASSWORD", "postgres")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_DATABASE", "jobplacement-ratings")
+os.environ.setdefault("COMPANIES_ENDPOINT", "http://companies.test/companies")
+os.environ.setdefault("VACANCIES_ENDPOINT", "http://vacancies.test/vacancies")
@@ -0,0 +1,306 @@
+# Python
+import io
+import json
+
+# Third-party libraries
+import pytest
+from sqlalchemy.exc import OperationalError
+
+# Project
+from ratings.cruds import crud
+from ratings.utils import enums
+from ratings.utils.bulk_import import (
+    INVALID_UTF8,
+    import_company_evaluations,
+    read_rows,
+)
+
+
+CSV_HEADER = (
+    "company_id,job_title,content_type,start_date,applicant_email,"
+    "career_development_rating,diversity_equal_opportunity_rating,"
+    "working_environment_rating,salary_rating,job_location,salary,currency_type,"
+    "salary_frequency,recommended_a_friend,allows_remote_work,is_legally_company"
+)
+
+
+def evaluation_row(company_id=1, rating="Good", **fields):
+    row = {
+        "company_id": company_id,
+        "job_title": "backend engineer",
+        "content_type": "great place to work",
+        "start_date": "2021-01-01",
+        "applicant_email": "ana@example.com",
+        "career_development_rating": rating,
+        "diversity_equal_opportunity_rating": rating,
+        "working_environment_rating": rating,
+        "salary_rating": rating,
+        "job_location": "mexico",
+        "salary": "2500.00",
+        "currency_type": "USD",
+        "salary_frequency": "Month",
+        "recommended_a_friend": 1,
+        "allows_remote_work": 1,
+        "is_legally_company": 1,
+    }
+    row.update(fields)
+    return row
+
+
+def csv_line(row):
+    return ",".join(str(row[field]) for field in CSV_HEADER.split(","))
+
+
+def read(content: bytes, format: enums.BulkImportFormat):
+    return list(read_rows(io.BytesIO(content), format))
+
+
+class RecordingSession:
+    """Session that records the statements and fails the inserts of some chunks"""
+
+    def __init__(self, failing_chunks=()):
+        self.failing_chunks = set(failing_chunks)
+        self.inserted_chunks = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        if isinstance(params, list):
+            chunk_number = len(self.inserted_chunks) + 1
+            self.inserted_chunks.append(params)
+            if chunk_number in self.failing_chunks:
+                raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    """Record the summary and trend increments and the invalidated tags"""
+    recorded = {"summaries": [], "trends": [], "invalidated": []}
+
+    monkeypatch.setattr(crud, "get_companies_directory", lambda db=None: {1: {}, 2: {}})
+    monkeypatch.setattr(
+        crud,
+        "increment_company_rating_summary",
+        lambda **increment: recorded["summaries"].append(increment),
+    )
+    monkeypatch.setattr(
+        crud,
+        "increment_company_rating_trends",
+        lambda trends: recorded["trends"].append(trends),
+    )
+    monkeypatch.setattr(
+        crud.response_cache,
+        "invalidate",
+        lambda tags: recorded["invalidated"].append(sorted(map(str, tags))),
+    )
+    return recorded
+
+
+# Parsing
+
+
+def test_ndjson_rows_keep_their_line_numbers():
+    content = b"\n".join(
+        [
+            json.dumps(evaluation_row()).encode(),
+            b"",
+            b"   ",
+            b"[1, 2]",
+            b"{not json",
+            b'"text"',
+            json.dumps(evaluation_row(company_id=2)).encode(),
+        ]
+    )
+
+    rows = read(content, enums.BulkImportFormat.ndjson)
+
+    assert [line for line, _ in rows] == [1, 4, 5, 6, 7]
+    assert rows[0][1]["company_id"] == 1
+    assert rows[1][1] == "Invalid JSON: the row is not an object"
+    assert rows[2][1].startswith("Invalid JSON: ")
+    assert rows[3][1] == "Invalid JSON: the row is not an object"
+    assert rows[4][1]["company_id"] == 2
+
+
+@pytest.mark.parametrize(
+    "format, content",
+    [
+        (enums.BulkImportFormat.ndjson, json.dumps(evaluation_row()) + "\n"),
+        (enums.BulkImportFormat.csv, f"{CSV_HEADER}\r\n{csv_line(evaluation_row())}"),
+    ],
+)
+def test_byte_order_mark_is_skipped(format, content):
+    rows = read(b"\xef\xbb\xbf" + content.encode(), format)
+
+    assert len(rows) == 1
+    assert rows[0][1]["company_id"] in (1, "1")
+
+
+def test_csv_rows_drop_empty_fields_and_skip_blank_lines():
+    content = "\r\n".join(
+        [
+            CSV_HEADER,
+            csv_line(evaluation_row()),
+            "",
+            csv_line(evaluation_row(company_id=2, job_location="")),
+        ]
+    )
+
+    rows = read(content.encode(), enums.BulkImportFormat.csv)
+
+    assert [line for line, _ in rows] == [2, 4]
+    assert rows[0][1]["job_location"] == "mexico"
+    assert "job_location" not in rows[1][1]
+
+
+def test_csv_rows_with_more_fields_than_the_header_are_rejected():
+    content = "\n".join(
+        [CSV_HEADER, csv_line(evaluation_row()) + ",extra", csv_line(evaluation_row())]
+    )
+
+    rows = read(content.encode(), enums.BulkImportFormat.csv)
+
+    assert rows[0] == (2, "Invalid CSV: the row has more fields than the header")
+    assert rows[1][0] == 3 and isinstance(rows[1][1], dict)
+
+
+@pytest.mark.parametrize("format", list(enums.BulkImportFormat))
+def test_lines_that_are_not_utf8_are_rejected(format):
+    header = [CSV_HEADER.encode()] if format == enums.BulkImportFormat.csv else []
+    row = (
+        csv_line(evaluation_row())
+        if format == enums.BulkImportFormat.csv
+        else json.dumps(evaluation_row())
+    ).encode()
+    content = b"\n".join([*header, row, b"\xff\xfe", row, b"caf\xe9"])
+    first = len(header) + 1
+
+    rows = read(content, format)
+
+    assert [line for line, _ in rows] == [first, first + 1, first + 2, first + 3]
+    assert isinstance(rows[0][1], dict) and isinstance(rows[2][1], dict)
+    assert rows[1][1] == rows[3][1] == INVALID_UTF8
+
+
+# Report
+
+
+def test_report_counts_the_imported_and_rejected_rows(recorded):
+    rows = [
+        (1, evaluation_row(company_id=1, rating="Good")),
+        (2, "Invalid JSON: the row is not an object"),
+        (3, evaluation_row(company_id=1, rating="Bad")),
+        (4, evaluation_row(company_id=9)),
+        (5, evaluation_row(company_id=2, salary_rating="Excellent")),
+        (6, evaluation_row(company_id=2, rating="Regular")),
+    ]
+    session = RecordingSession()
+
+    report = crud.bulk_create_company_evaluations(session, rows=rows, chunk_size=2)
+
+    assert report["received"] == 6
+    assert report["imported"] == 3
+    assert report["rejected"] == 3
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5]
+    assert report["errors"][0]["errors"] == ["Invalid JSON: the row is not an object"]
+    assert report["errors"][1]["errors"] == ["company_id: Company Not Found"]
+    assert report["errors"][2]["errors"][0].startswith("salary_rating: ")
+    assert [len(chunk) for chunk in session.inserted_chunks] == [2, 1]
+    assert session.commits == 2
+
+
+def test_summary_and_trend_increments_are_merged_per_company(recorded):
+    rows = [
+        (1, evaluation_row(company_id=1, rating="Good")),
+        (2, evaluation_row(company_id=1, rating="Bad")),
+        (3, evaluation_row(company_id=2, rating="Regular")),
+    ]
+
+    crud.bulk_create_company_evaluations(RecordingSession(), rows=rows, chunk_size=10)
+
+    summaries = {summary["company_id"]: summary for summary in recorded["summaries"]}
+    assert summaries[1]["total_reviews"] == 2
+    assert summaries[1]["rating_sums"]["salary_rating_sum"] == 5 + 1
+    assert summaries[1]["rating_sums"]["salary_rating_sum_of_squares"] == 25 + 1
+    assert summaries[2]["total_reviews"] == 1
+    assert summaries[2]["rating_sums"]["salary_rating_sum"] == 3
+
+    # One bucket per company and period
+    (trends,) = recorded["trends"]
+    assert len(trends) == 2 * len(enums.TrendPeriod)
+    for trend in trends:
+        if trend["company_id"] == 1:
+            assert trend["total_reviews"] == 2
+            assert trend["career_development_rating_sum"] == 6
+        else:
+            assert trend["total_reviews"] == 1
+
+
+def test_failed_chunk_rejects_only_its_rows(recorded):
+    rows = [(line, evaluation_row(company_id=1 + line % 2)) for line in range(1, 6)]
+    session = RecordingSession(failing_chunks={2})
+
+    report = crud.bulk_create_company_evaluations(session, rows=rows, chunk_size=2)
+
+    assert report["imported"] == 3
+    assert report["rejected"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert report["errors"][0]["errors"] == ["Database error: connection lost"]
+    assert session.rollbacks == 1
+    assert session.commits == 2
+    # Only the committed chunks invalidate the cached ratings
+    assert len(recorded["invalidated"]) == 2
+
+
+def test_reported_errors_are_capped(recorded, monkeypatch):
+    monkeypatch.setattr(crud, "BULK_IMPORT_MAX_ERRORS", 2)
+    rows = [(line, "Invalid JSON: the row is not an object") for line in range(1, 6)]
+
+    report = crud.bulk_create_company_evaluations(
+        RecordingSession(), rows=rows, chunk_size=2
+    )
+
+    assert report["rejected"] == 5
+    assert [error["line"] for error in report["errors"]] == [1, 2]
+
+
+def test_import_of_a_csv_file(recorded):
+    content = "\n".join(
+        [
+            CSV_HEADER,
+            csv_line(evaluation_row(company_id=1)),
+            csv_line(evaluation_row(company_id=2)) + ",extra",
+            csv_line(evaluation_row(company_id=2, rating="Bad")),
+        ]
+    )
+
+    report = import_company_evaluations(
+        RecordingSession(),
+        file=io.BytesIO(content.encode()),
+        format=enums.BulkImportFormat.csv,
+        chunk_size=10,
+    )
+
+    assert report["received"] == 3
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"line": 3, "errors": ["Invalid CSV: the row has more fields than the header"]}
+    ]
+
+
+def test_import_of_a_file_with_invalid_utf8_reports_the_line(recorded):
+    report = import_company_evaluations(
+        RecordingSession(),
+        file=io.BytesIO(json.dumps(evaluation_row()).encode() + b"\n\xff\xfe\n"),
+        format=enums.BulkImportFormat.ndjson,
+        chunk_size=10,
+    )
+
+    assert report["imported"] == 1
+    assert report["errors"] == [{"line": 2, "errors": [INVALID_UTF8]}]
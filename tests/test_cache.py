@@ -0,0 +1,122 @@
+# Python
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party libraries
+import pytest
+
+# Project
+from ratings.utils.cache import TTLCache
+
+
+class BlockingLoader:
+    """Loader that blocks until released, counting its calls"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return self.value
+
+
+def failing_loader():
+    raise RuntimeError("upstream down")
+
+
+def test_get_loads_a_missing_key_once_for_concurrent_misses():
+    cache = TTLCache(ttl=60, max_entries=10)
+    loader = BlockingLoader("fresh")
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [executor.submit(cache.get, "key", loader) for _ in range(8)]
+        assert loader.started.wait(5)
+        loader.release.set()
+        values = [future.result(5) for future in futures]
+
+    assert values == ["fresh"] * 8
+    assert loader.calls == 1
+    assert cache._key_locks == {}
+
+
+def test_get_serves_a_stale_entry_while_it_is_refreshed():
+    cache = TTLCache(ttl=0, max_entries=10)
+    cache.set("key", "stale")
+    loader = BlockingLoader("fresh")
+
+    with ThreadPoolExecutor(1) as executor:
+        refresh = executor.submit(cache.get, "key", loader)
+        assert loader.started.wait(5)
+
+        assert cache.get("key", failing_loader) == "stale"
+
+        loader.release.set()
+        assert refresh.result(5) == "fresh"
+
+    assert loader.calls == 1
+    assert cache._key_locks == {}
+
+
+def test_get_serves_a_stale_entry_when_the_refresh_fails():
+    cache = TTLCache(ttl=0, max_entries=10, retry_after=60)
+    cache.set("key", "stale")
+
+    assert cache.get("key", failing_loader) == "stale"
+
+    # The entry is not refreshed again until retry_after has passed
+    loader = BlockingLoader("fresh")
+    loader.release.set()
+    assert cache.get("key", loader) == "stale"
+    assert loader.calls == 0
+
+
+def test_get_raises_when_the_first_load_fails_and_forgets_its_lock():
+    cache = TTLCache(ttl=60, max_entries=10)
+
+    with pytest.raises(RuntimeError):
+        cache.get("key", failing_loader)
+
+    assert cache._key_locks == {}
+    assert cache.get("key", lambda: "fresh") == "fresh"
+
+
+def test_evicting_a_key_being_refreshed_keeps_a_single_load():
+    cache = TTLCache(ttl=0, max_entries=1)
+    cache.set("key", "stale")
+    loader = BlockingLoader("fresh")
+
+    with ThreadPoolExecutor(2) as executor:
+        refresh = executor.submit(cache.get, "key", loader)
+        assert loader.started.wait(5)
+
+        # Evict the stale entry, so the next miss has to wait for the refresh
+        cache.ttl = 60
+        cache.set("other", "value")
+        waiter = executor.submit(cache.get, "key", loader)
+        time.sleep(0.1)
+
+        loader.release.set()
+        assert refresh.result(5) == "fresh"
+        assert waiter.result(5) == "fresh"
+
+    assert loader.calls == 1
+    assert cache._key_locks == {}
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a", failing_loader)
+    cache.set("c", 3)
+
+    assert cache.get("a", failing_loader) == 1
+    assert cache.get("c", failing_loader) == 3
+    with pytest.raises(RuntimeError):
+        cache.get("b", failing_loader)
@@ -0,0 +1,171 @@
+# Python
+import base64
+import string
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from fastapi import HTTPException
+
+# Project
+from ratings.cruds import crud
+from ratings.utils.utils import Util
+
+
+def evaluation(id, rating=Decimal("3.0"), utility_counter=0, created_at=None):
+    return SimpleNamespace(
+        id=id,
+        rating=rating,
+        utility_counter=utility_counter,
+        created_at=created_at or datetime(2022, 1, 1),
+    )
+
+
+def select_page(sort, order, cursor, size=2):
+    return crud.select_company_evaluations_by_cursor(
+        company_id=1,
+        job_title=None,
+        content_type=None,
+        job_location=None,
+        sort=sort,
+        order=order,
+        cursor=cursor,
+        size=size,
+    )
+
+
+def compiled_params(query):
+    return list(query.compile().params.values())
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ("rating", "DESC", "4.5", 10),
+        ("date", "ASC", "2022-01-01T10:30:00", 3),
+        (None, "DESC", None, 7),
+    ],
+)
+def test_cursor_round_trip(values):
+    cursor = Util.encode_cursor(*values)
+
+    assert Util.decode_cursor(cursor) == list(values)
+    assert not set(cursor) - set(string.ascii_letters + string.digits + "-_=")
+
+
+@pytest.mark.parametrize(
+    "sort, order, evaluations, cursor_values",
+    [
+        (
+            "rating",
+            "DESC",
+            [evaluation(3, Decimal("5.0")), evaluation(2, Decimal("4.5"))],
+            ["rating", "DESC", "4.5", 2],
+        ),
+        (
+            "helpfulness",
+            "ASC",
+            [evaluation(3, utility_counter=1), evaluation(2, utility_counter=7)],
+            ["helpfulness", "ASC", "7", 2],
+        ),
+        (
+            "date",
+            "DESC",
+            [evaluation(3), evaluation(2, created_at=datetime(2021, 5, 4, 3, 2))],
+            ["date", "DESC", "2021-05-04T03:02:00", 2],
+        ),
+        (None, "DESC", [evaluation(3), evaluation(2)], [None, "DESC", None, 2]),
+    ],
+)
+def test_next_cursor_points_after_the_last_evaluation_of_the_page(
+    sort, order, evaluations, cursor_values
+):
+    selected = evaluations + [evaluation(1)]
+
+    page = crud.build_company_evaluations_cursor_page(
+        selected, sort=sort, order=order, size=2
+    )
+
+    assert page["items"] == evaluations
+    assert Util.decode_cursor(page["next_cursor"]) == cursor_values
+
+    # The cursor is accepted by the next page, with its values parsed
+    params = compiled_params(select_page(sort, order, page["next_cursor"]))
+    assert 2 in params
+    if sort == "rating":
+        assert Decimal("4.5") in params
+    if sort == "date":
+        assert datetime(2021, 5, 4, 3, 2) in params
+
+
+@pytest.mark.parametrize("amount", [0, 1, 2])
+def test_last_page_has_no_next_cursor(amount):
+    evaluations = [evaluation(id) for id in range(amount, 0, -1)]
+
+    page = crud.build_company_evaluations_cursor_page(
+        evaluations, sort="rating", order="DESC", size=2
+    )
+
+    assert page["items"] == evaluations
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        base64.urlsafe_b64encode(b"{not json").decode(),
+        Util.encode_cursor("rating", "DESC", "4.5"),
+        Util.encode_cursor("rating", "DESC", "high", 2),
+        base64.urlsafe_b64encode(b"42").decode(),
+        base64.urlsafe_b64encode(b'{"a": 1, "b": 2, "c": 3, "d": 4}').decode(),
+        base64.urlsafe_b64encode(b'"abcd"').decode(),
+        Util.encode_cursor("rating", "DESC", "4.5", 2, 3),
+        Util.encode_cursor("rating", "DESC", "4.5", "x"),
+        Util.encode_cursor("rating", "DESC", "4.5", None),
+        Util.encode_cursor("rating", "DESC", "4.5", True),
+        Util.encode_cursor("rating", "DESC", "4.5", 2.5),
+        Util.encode_cursor("rating", "DESC", "4.5", 2 ** 31),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        select_page("rating", "DESC", cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "sort, order",
+    [("helpfulness", "DESC"), ("rating", "ASC"), (None, "DESC")],
+)
+def test_cursor_of_another_sort_is_rejected(sort, order):
+    cursor = Util.encode_cursor("rating", "DESC", "4.5", 2)
+
+    with pytest.raises(HTTPException) as error:
+        select_page(sort, order, cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("last_value", ["x", None, "1e30", 2 ** 31, 1e30])
+def test_tampered_helpfulness_of_a_cursor_is_rejected(last_value):
+    cursor = Util.encode_cursor("helpfulness", "DESC", last_value, 2)
+
+    with pytest.raises(HTTPException) as error:
+        select_page("helpfulness", "DESC", cursor)
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("sort, last_value", [(None, ""), (None, None)])
+def test_tampered_id_of_a_cursor_without_sort_is_rejected(sort, last_value):
+    cursor = Util.encode_cursor(sort, "DESC", last_value, "x")
+
+    with pytest.raises(HTTPException) as error:
+        select_page(sort, "DESC", cursor)
+
+    assert error.value.status_code == 400
@@ -0,0 +1,129 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+from sqlalchemy.dialects import postgresql
+
+# Project
+from ratings.cruds import crud
+
+
+def facet_row(total, **values):
+    """Row of the grouping set of one facet, or of every evaluation without values"""
+    facet, value = next(iter(values.items()), (None, None))
+    return SimpleNamespace(
+        total=total,
+        **{
+            name: value if name == facet else None
+            for name in crud.COMPANY_EVALUATION_FACETS
+        },
+        **{
+            f"{name}_grouping": 0 if name == facet else 1
+            for name in crud.COMPANY_EVALUATION_FACETS
+        },
+    )
+
+
+def test_facets_are_built_from_their_grouping_sets():
+    rows = [
+        facet_row(5),
+        facet_row(4, job_location="Cdmx"),
+        facet_row(3, allows_remote_work=True),
+        facet_row(3, currency_type="MXN"),
+        facet_row(2, allows_remote_work=False),
+        facet_row(2, currency_type="USD"),
+        facet_row(1, job_location="Bogota"),
+        facet_row(1, job_title="Designer"),
+    ]
+
+    assert crud.build_company_evaluation_facets(rows) == {
+        "total": 5,
+        "facets": {
+            "job_location": [
+                {"value": "Cdmx", "count": 4},
+                {"value": "Bogota", "count": 1},
+            ],
+            "job_title": [{"value": "Designer", "count": 1}],
+            "allows_remote_work": [
+                {"value": True, "count": 3},
+                {"value": False, "count": 2},
+            ],
+            "currency_type": [
+                {"value": "MXN", "count": 3},
+                {"value": "USD", "count": 2},
+            ],
+        },
+    }
+
+
+def test_null_values_are_counted_in_their_facet():
+    rows = [facet_row(2), facet_row(2, job_location=None)]
+
+    facets = crud.build_company_evaluation_facets(rows)["facets"]
+
+    assert facets["job_location"] == [{"value": None, "count": 2}]
+    assert facets["job_title"] == []
+
+
+def test_facets_without_evaluations_are_empty():
+    facets = crud.build_company_evaluation_facets([facet_row(0)])
+
+    assert facets["total"] == 0
+    assert all(values == [] for values in facets["facets"].values())
+
+
+def test_facets_keep_their_most_frequent_values(monkeypatch):
+    monkeypatch.setattr(crud, "EVALUATION_FACETS_MAX_VALUES", 2)
+    rows = [
+        facet_row(6),
+        facet_row(3, job_title="Developer"),
+        facet_row(2, job_title="Designer"),
+        facet_row(1, job_title="Manager"),
+    ]
+
+    facets = crud.build_company_evaluation_facets(rows)["facets"]
+
+    assert [value["value"] for value in facets["job_title"]] == [
+        "Developer",
+        "Designer",
+    ]
+
+
+def test_every_facet_is_counted_by_the_same_query():
+    statement = crud.select_company_evaluation_facets(
+        company_id=1, job_title="dev", content_type=None, job_location=None
+    )
+
+    sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+    assert sql.count("SELECT") == 1
+    assert (
+        "GROUP BY GROUPING SETS((company_evaluations.job_location), "
+        "(company_evaluations.job_title), "
+        "(company_evaluations.allows_remote_work), "
+        "(company_evaluations.currency_type), ())" in sql
+    )
+    assert "company_evaluations.company_id = %(company_id_1)s" in sql
+    assert "company_evaluations.job_title ILIKE %(job_title_1)s" in sql
+    assert "ORDER BY total DESC" in sql
+
+
+def test_facets_are_read_from_the_rows_of_the_query():
+    class FacetSession:
+        """Session returning the rows of the facets"""
+
+        def execute(self, statement):
+            return SimpleNamespace(
+                all=lambda: [facet_row(1), facet_row(1, job_title="Dev")]
+            )
+
+    facets = crud.get_company_evaluation_facets(
+        FacetSession(),
+        company_id=1,
+        job_title=None,
+        content_type=None,
+        job_location=None,
+    )
+
+    assert facets["total"] == 1
+    assert facets["facets"]["job_title"] == [{"value": "Dev", "count": 1}]
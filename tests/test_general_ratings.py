@@ -0,0 +1,247 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import column, create_engine, literal, select, table
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.utils import enums
+from ratings.utils.utils import Util
+
+
+# Only the columns the aggregation reads, without the model defaults
+EVALUATIONS = table(
+    "company_evaluations",
+    column("company_id"),
+    *(column(criteria) for criteria in crud.COMPANY_RATING_CRITERIA),
+)
+
+
+@pytest.fixture
+def connection():
+    """SQLite connection with the columns of company_evaluations that are aggregated
+
+    The aggregation only uses portable SQL, so it runs the same as in PostgreSQL.
+    """
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        columns = ", ".join(
+            f"{criteria} TEXT" for criteria in crud.COMPANY_RATING_CRITERIA
+        )
+        connection.exec_driver_sql(
+            f"CREATE TABLE company_evaluations (id INTEGER PRIMARY KEY, company_id INTEGER, {columns})"
+        )
+        yield connection
+
+
+def insert_evaluations(connection, company_id, *evaluations):
+    for ratings in evaluations:
+        connection.execute(
+            EVALUATIONS.insert().values(
+                company_id=company_id,
+                **dict(zip(crud.COMPANY_RATING_CRITERIA, ratings)),
+            )
+        )
+
+
+@pytest.mark.parametrize(
+    "value, weight",
+    [
+        *[
+            (rating_type.value, Util.assign_weight(rating_type.value))
+            for rating_type in enums.CompanyRatingType
+        ],
+        ("Unknown", 0),
+    ],
+)
+def test_rating_weight_in_sql_matches_assign_weight(connection, value, weight):
+    query = select(crud.company_rating_weight(literal(value)))
+
+    assert connection.execute(query).scalar_one() == weight
+
+
+def test_aggregates_of_a_company_are_computed_in_one_row(connection):
+    insert_evaluations(
+        connection,
+        1,
+        ("Good", "Regular", "Bad", "Good"),
+        ("Good", "Bad", "Bad", "Regular"),
+        ("Regular", "Regular", "Good", "Good"),
+    )
+    insert_evaluations(connection, 2, ("Bad", "Bad", "Bad", "Bad"))
+
+    summary = connection.execute(
+        select(*crud.company_rating_aggregates()).where(
+            models.CompanyEvaluation.company_id == 1
+        )
+    ).one()
+
+    assert summary.total_reviews == 3
+    assert summary.career_development_rating_sum == 5 + 5 + 3
+    assert summary.career_development_rating_sum_of_squares == 25 + 25 + 9
+    assert summary.salary_rating_sum == 5 + 3 + 5
+    assert crud.build_general_ratings(summary) == {
+        "company_rating": 3.3,
+        "total_reviews": 3,
+        "gral_career_development_rating": 4.3,
+        "gral_diversity_equal_opportunity_rating": 2.3,
+        "gral_working_environment_rating": 2.3,
+        "gral_salary_rating": 4.3,
+    }
+
+
+def test_aggregates_of_a_company_without_evaluations_are_zero(connection):
+    summary = connection.execute(
+        select(*crud.company_rating_aggregates()).where(
+            models.CompanyEvaluation.company_id == 1
+        )
+    ).one()
+
+    assert summary.total_reviews == 0
+    assert all(getattr(summary, column) == 0 for column in crud.COMPANY_RATING_SUMS)
+    assert crud.build_general_ratings(summary)["company_rating"] == 0
+
+
+def test_aggregates_of_several_companies_are_grouped_by_company(connection):
+    insert_evaluations(connection, 1, ("Good",) * 4, ("Bad",) * 4)
+    insert_evaluations(connection, 2, ("Regular",) * 4)
+    insert_evaluations(connection, 3, ("Good",) * 4)
+
+    rows = connection.execute(crud.select_company_rating_aggregates([1, 2, 4])).all()
+
+    assert {row.company_id: row.total_reviews for row in rows} == {1: 2, 2: 1}
+    assert {row.company_id: row.salary_rating_sum for row in rows} == {1: 6, 2: 3}
+
+
+class Result(list):
+    """Rows of a query, read the ways the crud functions read them"""
+
+    def one(self):
+        (row,) = self
+        return row
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class SummarySession:
+    """Session with the rating summaries of some companies and the aggregation rows"""
+
+    def __init__(self, summaries, aggregates):
+        self.summaries = summaries
+        self.aggregates = aggregates
+        self.statements = []
+
+    def get(self, model, company_id):
+        return self.summaries.get(company_id)
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        if "company_rating_summaries" in str(statement):
+            rows = list(self.summaries.values())
+        else:
+            rows = self.aggregates
+        return Result(rows)
+
+
+def summary_row(company_id, total_reviews, weight):
+    return SimpleNamespace(
+        company_id=company_id,
+        total_reviews=total_reviews,
+        **{
+            f"{criteria}_sum": weight * total_reviews
+            for criteria in crud.COMPANY_RATING_CRITERIA
+        },
+        **{
+            f"{criteria}_sum_of_squares": weight ** 2 * total_reviews
+            for criteria in crud.COMPANY_RATING_CRITERIA
+        },
+    )
+
+
+def test_general_ratings_are_read_from_the_summary():
+    db = SummarySession({1: summary_row(1, 2, 5)}, aggregates=[])
+
+    ratings = crud.get_company_general_ratings(db, company_id=1)
+
+    assert ratings["company_rating"] == 5
+    assert ratings["total_reviews"] == 2
+    assert db.statements == []
+
+
+def test_general_ratings_without_a_summary_are_aggregated_once():
+    db = SummarySession({}, aggregates=[summary_row(1, 3, 3)])
+
+    ratings = crud.get_company_general_ratings(db, company_id=1)
+
+    assert ratings["company_rating"] == 3
+    assert len(db.statements) == 1
+
+
+def test_batch_general_ratings_only_aggregate_companies_without_a_summary():
+    db = SummarySession({1: summary_row(1, 2, 5)}, aggregates=[summary_row(3, 1, 1)])
+
+    ratings = crud.get_companies_general_ratings(db, company_ids=[3, 1, 2])
+
+    assert list(ratings) == [3, 1, 2]
+    assert ratings[1]["company_rating"] == 5
+    assert ratings[3]["company_rating"] == 1
+    assert ratings[2]["company_rating"] == 0
+    assert ratings[2]["total_reviews"] == 0
+    summaries, aggregates = db.statements
+    assert "company_rating_summaries.company_id IN" in str(summaries)
+    assert "GROUP BY company_evaluations.company_id" in str(aggregates)
+    assert aggregates.compile().params["company_id_1"] == [3, 2]
+
+
+def test_batch_general_ratings_with_every_summary_skip_the_aggregation():
+    db = SummarySession(
+        {1: summary_row(1, 2, 5), 2: summary_row(2, 1, 3)}, aggregates=[]
+    )
+
+    ratings = crud.get_companies_general_ratings(db, company_ids=[1, 2])
+
+    assert [rating["company_rating"] for rating in ratings.values()] == [5, 3]
+    assert len(db.statements) == 1
+
+
+@pytest.mark.parametrize(
+    "company_ids, expected",
+    [
+        ([2, 1], [2, 1]),
+        # Duplicates are returned once and do not count towards the maximum
+        ([3, 1, 3, 1], [3, 1]),
+        ([1, 1, 1], [1]),
+    ],
+)
+def test_batch_company_ids_are_deduplicated_in_order(
+    company_ids, expected, monkeypatch
+):
+    monkeypatch.setattr(crud, "GENERAL_RATINGS_MAX_COMPANIES", 2)
+
+    assert crud.parse_company_ids(company_ids) == expected
+
+
+@pytest.mark.parametrize(
+    "company_ids, detail",
+    [
+        ([1, 2, 3], "At most 2 companies can be requested at once"),
+        ([1, 0], "Invalid company ID"),
+        ([-1], "Invalid company ID"),
+    ],
+)
+def test_invalid_batch_company_ids_are_rejected(company_ids, detail, monkeypatch):
+    monkeypatch.setattr(crud, "GENERAL_RATINGS_MAX_COMPANIES", 2)
+
+    with pytest.raises(HTTPException) as error:
+        crud.parse_company_ids(company_ids)
+
+    assert error.value.status_code == 400
+    assert error.value.detail == detail
@@ -0,0 +1,106 @@
+# Third-party libraries
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.utils import enums
+
+
+SUMMARIES = models.CompanyRatingSummary.__table__
+
+
+@pytest.fixture
+def connection():
+    """SQLite connection with the company rating summaries
+
+    The averages are plain columns, set by the tests, instead of the columns
+    computed by PostgreSQL.
+    """
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        columns = ", ".join(f"{column.name} NUMERIC" for column in SUMMARIES.columns)
+        connection.exec_driver_sql(f"CREATE TABLE company_rating_summaries ({columns})")
+        yield connection
+
+
+def insert_summaries(connection, *summaries):
+    for company_id, total_reviews, average in summaries:
+        connection.execute(
+            SUMMARIES.insert().values(
+                company_id=company_id,
+                total_reviews=total_reviews,
+                **{column: 0 for column in crud.COMPANY_RATING_SUMS},
+            )
+        )
+        connection.exec_driver_sql(
+            "UPDATE company_rating_summaries SET "
+            + ", ".join(
+                f"{column} = ?" for column in crud.LEADERBOARD_AVERAGES.values()
+            )
+            + " WHERE company_id = ?",
+            (*[average] * len(crud.LEADERBOARD_AVERAGES), company_id),
+        )
+
+
+def leaderboard(connection, min_reviews=1, size=10, criteria=None):
+    statement = crud.select_company_leaderboard(
+        criteria or enums.LeaderboardCriteria.overall, min_reviews, size
+    )
+    return [row.company_id for row in connection.execute(statement)]
+
+
+def test_companies_are_ranked_by_average_then_amount_of_evaluations(connection):
+    insert_summaries(
+        connection,
+        (1, 3, 3.5),
+        (2, 10, 4.5),
+        (3, 5, 3.5),
+        (4, 5, 3.5),
+        (5, 1, 5.0),
+    )
+
+    assert leaderboard(connection) == [5, 2, 3, 4, 1]
+
+
+def test_companies_without_enough_evaluations_are_not_ranked(connection):
+    insert_summaries(connection, (1, 0, None), (2, 1, 5.0), (3, 3, 4.0), (4, 5, 2.0))
+
+    assert leaderboard(connection) == [2, 3, 4]
+    assert leaderboard(connection, min_reviews=3) == [3, 4]
+    assert leaderboard(connection, min_reviews=6) == []
+
+
+def test_leaderboard_has_at_most_size_companies(connection):
+    insert_summaries(connection, *[(company_id, 1, 3.0) for company_id in range(1, 6)])
+
+    assert leaderboard(connection, size=2) == [1, 2]
+
+
+@pytest.mark.parametrize("criteria", list(enums.LeaderboardCriteria))
+def test_leaderboard_query_matches_the_index_of_its_criteria(criteria):
+    average = crud.LEADERBOARD_AVERAGES[criteria]
+    (index,) = [
+        index
+        for index in SUMMARIES.indexes
+        if index.name == f"ix_leaderboard_{average}"
+    ]
+    statement = crud.select_company_leaderboard(criteria, min_reviews=3, size=10)
+
+    sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+    order_by = sql.split("ORDER BY ")[1].split(" LIMIT")[0]
+
+    assert order_by == (
+        f"company_rating_summaries.{average} DESC, "
+        "company_rating_summaries.total_reviews DESC, "
+        "company_rating_summaries.company_id"
+    )
+    assert [str(expression) for expression in index.expressions] == [
+        f"company_rating_summaries.{average} DESC",
+        "company_rating_summaries.total_reviews DESC",
+        "company_rating_summaries.company_id",
+    ]
+    # The partial index can only be used if its condition is part of the query
+    assert "WHERE company_rating_summaries.total_reviews > %(total_reviews_1)s" in sql
@@ -0,0 +1,62 @@
+# Python
+from types import SimpleNamespace
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+
+
+class GetSession:
+    """Session that records its lookups by primary key"""
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.info = {}
+        self.lookups = []
+
+    def get(self, model, id, options=()):
+        self.lookups.append((model, id, options))
+        return self.entities.get(id)
+
+
+def test_lookup_is_made_once_per_session():
+    db = GetSession({1: SimpleNamespace(id=1)})
+
+    first = crud.get_by_id(db, models.CompanyEvaluation, 1)
+    second = crud.get_by_id(db, models.CompanyEvaluation, 1)
+
+    assert first is second
+    assert len(db.lookups) == 1
+    assert crud.get_by_id(GetSession({}), models.CompanyEvaluation, 1) is None
+
+
+def test_missed_lookup_is_made_again():
+    db = GetSession({})
+
+    assert crud.get_by_id(db, models.CompanyEvaluation, 1) is None
+    db.entities[1] = SimpleNamespace(id=1)
+
+    assert crud.get_by_id(db, models.CompanyEvaluation, 1) is db.entities[1]
+    assert len(db.lookups) == 2
+
+
+def test_lookups_with_other_options_are_made_again():
+    db = GetSession({1: SimpleNamespace(id=1)})
+
+    crud.get_by_id(db, models.Applicant, 1)
+    crud.get_by_id(db, models.Applicant, 1, options=crud.APPLICANT_LOADER_OPTIONS)
+    crud.get_by_id(db, models.Applicant, 1, options=crud.APPLICANT_LOADER_OPTIONS)
+
+    assert [options for _, _, options in db.lookups] == [
+        (),
+        crud.APPLICANT_LOADER_OPTIONS,
+    ]
+
+
+def test_lookups_without_a_session_are_always_made():
+    calls = []
+
+    for _ in range(2):
+        crud.memoize(None, "key", lambda: calls.append(1))
+
+    assert len(calls) == 2
@@ -0,0 +1,72 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import httpx
+import pytest
+
+# Project
+from ratings.clients.upstream import UpstreamClient
+from ratings.cruds import crud, outbox
+
+
+@pytest.fixture
+def vacancies_service(monkeypatch):
+    """Answer the vacancy applications with the response set by the test"""
+    service = SimpleNamespace(response=httpx.Response(201), requests=[])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        service.requests.append(request)
+        return service.response
+
+    client = UpstreamClient(
+        timeout=1, retries=0, backoff=0, max_connections=1, max_keepalive_connections=1
+    )
+    client._client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(crud, "upstream_client", client)
+    return service
+
+
+def vacancy_application_event():
+    return SimpleNamespace(
+        id=1,
+        event_type=crud.VACANCY_APPLICATION_CREATED,
+        payload={"vacancy_id": 3, "applicant_id": 7},
+        idempotency_key="key",
+    )
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(201),
+        httpx.Response(204),
+        httpx.Response(201, text="Created"),
+        httpx.Response(200, json={"id": 1}),
+    ],
+)
+def test_delivery_succeeds_whatever_the_body_of_the_response(
+    vacancies_service, response
+):
+    vacancies_service.response = response
+
+    assert outbox.deliver(vacancy_application_event()) is None
+
+    request = vacancies_service.requests[0]
+    assert request.url.path.endswith("/3/applications")
+    assert request.headers["Idempotency-Key"] == "key"
+
+
+@pytest.mark.parametrize(
+    "status_code, permanent",
+    [(400, True), (404, True), (408, False), (429, False), (500, False)],
+)
+def test_failed_delivery_is_retried_unless_it_can_not_succeed(
+    vacancies_service, status_code, permanent
+):
+    vacancies_service.response = httpx.Response(status_code)
+
+    error = outbox.deliver(vacancy_application_event())
+
+    assert isinstance(error, httpx.HTTPStatusError)
+    assert outbox.is_permanent_error(error) is permanent
@@ -0,0 +1,136 @@
+# Third-party libraries
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Project
+from ratings.config import database
+from ratings.config.pool_stats import PoolStats, instrumented_pool_class
+
+
+@pytest.fixture
+def stats():
+    return PoolStats(recent_waits=100)
+
+
+@pytest.fixture
+def engine(stats):
+    engine = create_engine(
+        "sqlite://",
+        poolclass=instrumented_pool_class(QueuePool, stats),
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.01,
+    )
+    stats.listen(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_instrumented_pool_is_a_subclass_of_the_pool(engine):
+    assert isinstance(engine.pool, QueuePool)
+    assert type(engine.pool).__name__ == "InstrumentedQueuePool"
+
+
+def test_checkouts_and_connections_are_counted(engine, stats):
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        in_use = stats.snapshot(engine.pool)
+    with engine.connect():
+        pass
+
+    snapshot = stats.snapshot(engine.pool)
+
+    assert in_use["in_use"] == 2
+    assert snapshot["in_use"] == 0
+    assert snapshot["idle"] == 2
+    assert snapshot["checkouts"] == snapshot["checkins"] == 3
+    assert snapshot["connects"] == 2
+    assert snapshot["max_in_use"] == 2
+    assert snapshot["timeouts"] == 0
+
+
+def test_snapshot_has_the_pool_configuration(engine, stats):
+    snapshot = stats.snapshot(engine.pool)
+
+    assert snapshot["pool_size"] == 2
+    assert snapshot["max_overflow"] == 1
+    assert snapshot["timeout"] == 0.01
+    assert snapshot["overflow"] == 0
+
+
+def test_exhausted_pool_counts_the_timeout(engine, stats):
+    connections = [engine.connect() for _ in range(3)]
+
+    with pytest.raises(TimeoutError):
+        engine.connect()
+
+    snapshot = stats.snapshot(engine.pool)
+    for connection in connections:
+        connection.close()
+    assert snapshot["timeouts"] == 1
+    assert snapshot["in_use"] == 3
+    assert snapshot["overflow"] == 1
+    assert snapshot["checkouts"] == 3
+
+
+def test_invalidated_connections_are_counted(engine, stats):
+    with engine.connect() as connection:
+        connection.invalidate()
+
+    assert stats.snapshot(engine.pool)["invalidations"] == 1
+
+
+def test_wait_times_are_reported_in_milliseconds(engine):
+    stats = PoolStats(recent_waits=100)
+    stats.checkouts = 4
+    for wait in [0.001, 0.002, 0.003, 0.010]:
+        stats.record_wait(wait)
+    stats.record_wait(5, timed_out=True)
+
+    snapshot = stats.snapshot(engine.pool)
+
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_ms"] == {
+        "average": 4.0,
+        "p50": 3.0,
+        "p99": 10.0,
+        "max": 10.0,
+    }
+
+
+def test_percentiles_only_use_the_recent_waits(engine):
+    stats = PoolStats(recent_waits=2)
+    stats.checkouts = 3
+    for wait in [1, 0.001, 0.002]:
+        stats.record_wait(wait)
+
+    wait_ms = stats.snapshot(engine.pool)["wait_ms"]
+
+    assert wait_ms["p99"] == 2.0
+    assert wait_ms["max"] == 1000.0
+
+
+def test_snapshot_without_checkouts_has_no_wait(engine, stats):
+    assert stats.snapshot(engine.pool)["wait_ms"] == {
+        "average": 0.0,
+        "p50": 0.0,
+        "p99": 0.0,
+        "max": 0.0,
+    }
+
+
+def test_engines_use_instrumented_pools_of_the_configured_size():
+    assert type(database.engine.pool).__name__ == "InstrumentedQueuePool"
+    assert database.engine.pool.size() == database.DB_POOL_SIZE
+    async_pool = database.async_engine.sync_engine.pool
+    assert type(async_pool).__name__ == "InstrumentedAsyncAdaptedQueuePool"
+    assert async_pool.size() == database.DB_ASYNC_POOL_SIZE
+    assert database.DB_MAX_CONNECTIONS_PER_PROCESS == (
+        database.DB_POOL_SIZE
+        + database.DB_MAX_OVERFLOW
+        + database.DB_ASYNC_POOL_SIZE
+        + database.DB_ASYNC_MAX_OVERFLOW
+    )
@@ -0,0 +1,187 @@
+# Python
+import math
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+
+# Project
+from ratings.cruds import crud
+from ratings.utils import enums
+from ratings.utils.utils import Util
+
+
+# Weights of Bad, Regular and Good
+MIN_WEIGHT, MAX_WEIGHT = 1, 5
+
+
+def statistics(weights):
+    return sum(weights), sum(weight ** 2 for weight in weights), len(weights)
+
+
+@pytest.mark.parametrize(
+    "weights, prior_mean, prior_weight, expected",
+    [
+        # Zero reviews: the prior
+        ([], 3, 10, 3),
+        # One review barely moves away from the prior
+        ([5], 3, 10, 35 / 11),
+        ([1], 3, 10, 31 / 11),
+        # The prior dominates a small sample
+        ([5, 5, 5], 3, 10, 45 / 13),
+        # and fades with a large one
+        ([5] * 1000, 3, 10, 5030 / 1010),
+        # No prior: the plain mean
+        ([5, 3, 1], 3, 0, 3),
+    ],
+)
+def test_bayesian_average(weights, prior_mean, prior_weight, expected):
+    total, _, count = statistics(weights)
+
+    assert Util.bayesian_average(total, count, prior_mean, prior_weight) == (
+        pytest.approx(expected)
+    )
+
+
+def test_bayesian_average_of_a_small_sample_stays_closer_to_the_prior():
+    small = Util.bayesian_average(5 * 3, 3, prior_mean=3, prior_weight=10)
+    large = Util.bayesian_average(5 * 300, 300, prior_mean=3, prior_weight=10)
+
+    assert 3 < small < large < 5
+    assert small - 3 > 0 and 5 - small > small - 3
+
+
+def wilson(weights, z=1.96):
+    total, sum_of_squares, count = statistics(weights)
+    return Util.wilson_lower_bound(
+        total, sum_of_squares, count, MIN_WEIGHT, MAX_WEIGHT, z
+    )
+
+
+def test_wilson_lower_bound_of_zero_reviews_is_the_lowest_weight():
+    assert wilson([]) == MIN_WEIGHT
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        [5],
+        [1],
+        [3],
+        [5, 5, 5],
+        [5, 3, 1],
+        [1, 1, 5],
+        [5] * 8 + [1] * 2,
+        [3] * 50,
+        [5, 3] * 500,
+    ],
+)
+def test_wilson_lower_bound_is_between_the_lowest_weight_and_the_mean(weights):
+    mean = sum(weights) / len(weights)
+
+    assert MIN_WEIGHT <= wilson(weights) <= mean
+
+
+def test_wilson_lower_bound_of_one_review_is_far_below_its_weight():
+    assert wilson([5]) < 3
+    assert wilson([5]) < wilson([5] * 10) < wilson([5] * 100) < 5
+
+
+def test_wilson_lower_bound_of_binary_weights_is_the_classic_wilson_bound():
+    # 8 positive out of 10 at 95%: 0.4902
+    weights = [MAX_WEIGHT] * 8 + [MIN_WEIGHT] * 2
+    p, n, z = 0.8, 10, 1.96
+    classic = (
+        p + z ** 2 / (2 * n) - z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2))
+    ) / (1 + z ** 2 / n)
+
+    assert classic == pytest.approx(0.4902, abs=1e-4)
+    assert wilson(weights) == pytest.approx(MIN_WEIGHT + classic * 4)
+
+
+@pytest.mark.parametrize(
+    "rating_mode, weights, expected",
+    [
+        (enums.RatingMode.mean, [5, 3, 1], 3),
+        (enums.RatingMode.mean, [5], 5),
+        (
+            enums.RatingMode.bayesian,
+            [5],
+            (crud.RATING_PRIOR_MEAN * crud.RATING_PRIOR_WEIGHT + 5)
+            / (crud.RATING_PRIOR_WEIGHT + 1),
+        ),
+        (
+            enums.RatingMode.wilson,
+            [5, 5],
+            Util.wilson_lower_bound(10, 50, 2, 1, 5, crud.RATING_CONFIDENCE_Z),
+        ),
+    ],
+)
+def test_criteria_rating(rating_mode, weights, expected):
+    assert crud.criteria_rating(*statistics(weights), rating_mode) == (
+        pytest.approx(expected)
+    )
+
+
+@pytest.mark.parametrize("rating_mode", list(enums.RatingMode))
+def test_general_ratings_of_zero_reviews_are_zero(rating_mode):
+    summary = SimpleNamespace(
+        total_reviews=0, **{column: 0 for column in crud.COMPANY_RATING_SUMS}
+    )
+
+    ratings = crud.build_general_ratings(summary, rating_mode)
+
+    assert ratings["total_reviews"] == 0
+    assert ratings["company_rating"] == 0
+    assert all(
+        ratings[f"gral_{criteria}"] == 0 for criteria in crud.COMPANY_RATING_CRITERIA
+    )
+
+
+@pytest.mark.parametrize(
+    "rating_mode, company_rating",
+    [
+        (enums.RatingMode.mean, 3.0),
+        (enums.RatingMode.bayesian, 3.0),
+        (enums.RatingMode.wilson, None),
+    ],
+)
+def test_general_ratings_of_one_review(rating_mode, company_rating, monkeypatch):
+    monkeypatch.setattr(crud, "RATING_PRIOR_MEAN", 3)
+    # Good, Regular, Bad and Regular
+    weights = dict(zip(crud.COMPANY_RATING_CRITERIA, [5, 3, 1, 3]))
+    summary = SimpleNamespace(
+        total_reviews=1,
+        **{f"{criteria}_sum": weight for criteria, weight in weights.items()},
+        **{
+            f"{criteria}_sum_of_squares": weight ** 2
+            for criteria, weight in weights.items()
+        },
+    )
+
+    ratings = crud.build_general_ratings(summary, rating_mode)
+
+    if company_rating is not None:
+        assert ratings["company_rating"] == company_rating
+    for criteria, weight in weights.items():
+        assert MIN_WEIGHT <= ratings[f"gral_{criteria}"] <= max(weight, 3)
+    if rating_mode == enums.RatingMode.wilson:
+        assert ratings["company_rating"] < 3.0
+
+
+def test_evaluation_average_matches_the_company_rating_of_its_summary():
+    ratings = ["Good", "Regular", "Bad", "Good"]
+    weights = dict(zip(crud.COMPANY_RATING_CRITERIA, [5, 3, 1, 5]))
+    summary = SimpleNamespace(
+        total_reviews=1,
+        **{f"{criteria}_sum": weight for criteria, weight in weights.items()},
+        **{
+            f"{criteria}_sum_of_squares": weight ** 2
+            for criteria, weight in weights.items()
+        },
+    )
+
+    average = crud.calculate_company_evaluation_average(*ratings)
+
+    assert average == 3.5
+    assert crud.build_general_ratings(summary)["company_rating"] == average
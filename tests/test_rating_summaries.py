@@ -0,0 +1,154 @@
+# Python
+from datetime import datetime
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+# Project
+from ratings.cruds import crud
+
+
+EVALUATION = {
+    "company_id": 1,
+    "career_development_rating": "Good",
+    "diversity_equal_opportunity_rating": "Regular",
+    "working_environment_rating": "Bad",
+    "salary_rating": "Good",
+    "created_at": datetime(2024, 5, 15, 10, 30),
+}
+
+
+def compile_statement(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_rating_sums_of_an_evaluation_are_its_weights_and_squared_weights():
+    assert crud.company_evaluation_rating_sums(EVALUATION) == {
+        "career_development_rating_sum": 5,
+        "career_development_rating_sum_of_squares": 25,
+        "diversity_equal_opportunity_rating_sum": 3,
+        "diversity_equal_opportunity_rating_sum_of_squares": 9,
+        "working_environment_rating_sum": 1,
+        "working_environment_rating_sum_of_squares": 1,
+        "salary_rating_sum": 5,
+        "salary_rating_sum_of_squares": 25,
+    }
+
+
+def test_summary_increment_is_an_upsert_adding_to_the_summary():
+    rating_sums = crud.company_evaluation_rating_sums(EVALUATION)
+
+    compiled = compile_statement(
+        crud.increment_company_rating_summary(
+            company_id=7, total_reviews=2, rating_sums=rating_sums
+        )
+    )
+    sql = " ".join(str(compiled).split())
+
+    assert sql.startswith("INSERT INTO company_rating_summaries")
+    assert "ON CONFLICT (company_id) DO UPDATE SET" in sql
+    for column in ["total_reviews", *crud.COMPANY_RATING_SUMS]:
+        assert (
+            f"{column} = (company_rating_summaries.{column} + excluded.{column})" in sql
+        )
+    assert "updated_at = excluded.updated_at" in sql
+    assert compiled.params["company_id"] == 7
+    assert compiled.params["total_reviews"] == 2
+    assert compiled.params["salary_rating_sum_of_squares"] == 25
+
+
+class RecordingSession:
+    """Session that records the statements executed before every commit"""
+
+    def __init__(self, failing_statement=None):
+        self.failing_statement = failing_statement
+        self.events = []
+
+    def add(self, instance):
+        self.events.append(("add", type(instance).__name__))
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if self.failing_statement and self.failing_statement in sql:
+            raise OperationalError(sql, {}, Exception("connection lost"))
+        self.events.append(("execute", sql.split("(")[0].strip()))
+        return SimpleNamespace(rowcount=1)
+
+    def commit(self):
+        self.events.append(("commit",))
+
+    def rollback(self):
+        self.events.append(("rollback",))
+
+    def refresh(self, instance):
+        pass
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(crud, "check_company_id_exist", lambda company_id, db: 1)
+    monkeypatch.setattr(
+        crud,
+        "company_evaluation_values",
+        lambda company_evaluation, company_id: dict(EVALUATION, rating=3.5),
+    )
+    monkeypatch.setattr(crud.response_cache, "invalidate", invalidated.extend)
+    return invalidated
+
+
+def test_summary_is_incremented_in_the_transaction_of_the_evaluation(invalidated):
+    db = RecordingSession()
+
+    crud.create_company_evaluation(db, company_evaluation=None, company_id=1)
+
+    assert db.events == [
+        ("add", "CompanyEvaluation"),
+        ("execute", "INSERT INTO company_rating_summaries"),
+        ("execute", "INSERT INTO company_rating_trends"),
+        ("commit",),
+    ]
+    assert crud.company_tag(1) in invalidated
+
+
+def test_failed_summary_increment_does_not_commit_the_evaluation(invalidated):
+    db = RecordingSession(failing_statement="company_rating_summaries")
+
+    with pytest.raises(OperationalError):
+        crud.create_company_evaluation(db, company_evaluation=None, company_id=1)
+
+    assert ("commit",) not in db.events
+    assert invalidated == []
+
+
+def test_summaries_are_rebuilt_with_the_evaluations_locked():
+    db = RecordingSession()
+
+    assert crud.rebuild_company_rating_summaries(db) == 2
+    assert db.events == [
+        ("execute", "LOCK TABLE company_evaluations IN SHARE MODE"),
+        ("execute", "INSERT INTO company_rating_summaries"),
+        ("execute", "DELETE FROM company_rating_summaries WHERE NOT"),
+        ("commit",),
+    ]
+
+
+def test_rebuilt_summaries_are_only_updated_when_they_differ():
+    db = RecordingSession()
+    statements = []
+    execute = db.execute
+    db.execute = lambda statement: statements.append(statement) or execute(statement)
+
+    crud.rebuild_company_rating_summaries(db)
+
+    sql = " ".join(str(compile_statement(statements[1])).split())
+    assert "GROUP BY company_evaluations.company_id" in sql
+    assert "ON CONFLICT (company_id) DO UPDATE SET" in sql
+    assert "total_reviews = excluded.total_reviews" in sql
+    assert (
+        "WHERE company_rating_summaries.total_reviews != excluded.total_reviews OR"
+        in sql
+    )
@@ -0,0 +1,142 @@
+# Python
+from datetime import date, datetime
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from sqlalchemy.dialects import postgresql
+
+# Project
+from ratings.cruds import crud
+from ratings.utils import enums
+
+
+WEEK, MONTH = enums.TrendPeriod.week, enums.TrendPeriod.month
+
+
+@pytest.mark.parametrize(
+    "period, day, period_start",
+    [
+        # 2024-05-13 is a Monday
+        (WEEK, date(2024, 5, 13), date(2024, 5, 13)),
+        (WEEK, date(2024, 5, 15), date(2024, 5, 13)),
+        (WEEK, date(2024, 5, 19), date(2024, 5, 13)),
+        # Weeks can start in the previous month or year
+        (WEEK, date(2024, 6, 1), date(2024, 5, 27)),
+        (WEEK, date(2025, 1, 1), date(2024, 12, 30)),
+        (MONTH, date(2024, 5, 1), date(2024, 5, 1)),
+        (MONTH, date(2024, 5, 31), date(2024, 5, 1)),
+        (MONTH, date(2024, 2, 29), date(2024, 2, 1)),
+    ],
+)
+def test_period_start_is_the_monday_or_first_day_of_the_month(
+    period, day, period_start
+):
+    assert crud.rating_trend_period_start(period, day) == period_start
+
+
+@pytest.mark.parametrize(
+    "period, period_start, previous",
+    [
+        (WEEK, date(2024, 5, 13), date(2024, 5, 6)),
+        (WEEK, date(2024, 1, 1), date(2023, 12, 25)),
+        (MONTH, date(2024, 5, 1), date(2024, 4, 1)),
+        (MONTH, date(2024, 3, 1), date(2024, 2, 1)),
+        (MONTH, date(2024, 1, 1), date(2023, 12, 1)),
+    ],
+)
+def test_previous_period_start(period, period_start, previous):
+    assert crud.previous_rating_trend_period_start(period, period_start) == previous
+
+
+@pytest.mark.parametrize(
+    "period, periods, period_starts",
+    [
+        (WEEK, 1, [date(2024, 1, 15)]),
+        (WEEK, 3, [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]),
+        (
+            MONTH,
+            4,
+            [date(2023, 10, 1), date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1)],
+        ),
+    ],
+)
+def test_last_period_starts_are_oldest_first(period, periods, period_starts):
+    today = date(2024, 1, 17)
+
+    assert crud.rating_trend_period_starts(period, periods, today) == period_starts
+
+
+def test_evaluation_is_added_to_the_buckets_of_its_week_and_month():
+    values = {
+        "company_id": 3,
+        "career_development_rating": "Good",
+        "diversity_equal_opportunity_rating": "Regular",
+        "working_environment_rating": "Bad",
+        "salary_rating": "Good",
+        "created_at": datetime(2024, 6, 1, 23, 59),
+    }
+
+    trends = {
+        trend["period_type"]: trend
+        for trend in crud.company_evaluation_rating_trends(values)
+    }
+
+    assert trends.keys() == {"week", "month"}
+    assert trends["week"]["period_start"] == date(2024, 5, 27)
+    assert trends["month"]["period_start"] == date(2024, 6, 1)
+    for trend in trends.values():
+        assert trend["company_id"] == 3
+        assert trend["total_reviews"] == 1
+        assert trend["career_development_rating_sum"] == 5
+        assert trend["working_environment_rating_sum_of_squares"] == 1
+
+
+def test_trend_increment_is_an_upsert_keyed_by_company_and_period():
+    values = {
+        "company_id": 3,
+        **{criteria: "Good" for criteria in crud.COMPANY_RATING_CRITERIA},
+        "created_at": datetime(2024, 6, 1),
+    }
+
+    statement = crud.increment_company_rating_trends(
+        crud.company_evaluation_rating_trends(values)
+    )
+    sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+    assert sql.startswith("INSERT INTO company_rating_trends")
+    assert "ON CONFLICT (company_id, period_type, period_start) DO UPDATE SET" in sql
+    assert (
+        "total_reviews = (company_rating_trends.total_reviews "
+        "+ excluded.total_reviews)" in sql
+    )
+
+
+def bucket(period_start, total_reviews, weight):
+    return SimpleNamespace(
+        period_start=period_start,
+        total_reviews=total_reviews,
+        **{
+            f"{criteria}_sum": weight * total_reviews
+            for criteria in crud.COMPANY_RATING_CRITERIA
+        },
+        **{
+            f"{criteria}_sum_of_squares": weight ** 2 * total_reviews
+            for criteria in crud.COMPANY_RATING_CRITERIA
+        },
+    )
+
+
+def test_periods_without_evaluations_are_returned_empty():
+    period_starts = [date(2024, 3, 1), date(2024, 4, 1), date(2024, 5, 1)]
+    trends = [bucket(date(2024, 3, 1), 2, 5), bucket(date(2024, 5, 1), 1, 1)]
+
+    ratings = crud.build_company_rating_trends(period_starts, trends)
+
+    assert [rating["period_start"] for rating in ratings] == [
+        "2024-03-01",
+        "2024-04-01",
+        "2024-05-01",
+    ]
+    assert [rating["total_reviews"] for rating in ratings] == [2, 0, 1]
+    assert [rating["company_rating"] for rating in ratings] == [5, 0, 1]
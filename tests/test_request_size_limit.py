@@ -0,0 +1,79 @@
+# Third-party libraries
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.testclient import TestClient
+
+# Project
+from ratings.utils.uploads import RequestSizeLimitMiddleware
+
+
+def create_client(received: list) -> TestClient:
+    app = Starlette()
+
+    @app.route("/upload", methods=["POST"])
+    @app.route("/other", methods=["POST"])
+    async def upload(request: Request):
+        body = await request.body()
+        received.append(len(body))
+        return JSONResponse({"size": len(body)})
+
+    app.add_middleware(RequestSizeLimitMiddleware, max_sizes={"/upload": 100})
+    return TestClient(app)
+
+
+def chunks(amount: int, size: int = 30):
+    for _ in range(amount):
+        yield b"x" * size
+
+
+def test_bodies_within_the_limit_reach_the_app():
+    received = []
+    client = create_client(received)
+
+    response = client.post("/upload", data=b"x" * 100)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+    assert received == [100]
+
+
+def test_larger_content_length_is_rejected_before_the_app_runs():
+    received = []
+    client = create_client(received)
+
+    response = client.post("/upload", data=b"x" * 101)
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "The request exceeds 100 bytes"}
+    assert received == []
+
+
+def test_streamed_body_is_cut_once_it_goes_over_the_limit():
+    received = []
+    client = create_client(received)
+
+    response = client.post("/upload", data=chunks(10))
+
+    assert response.status_code == 413
+    assert received == []
+
+
+def test_streamed_body_within_the_limit_reaches_the_app():
+    received = []
+    client = create_client(received)
+
+    response = client.post("/upload", data=chunks(3))
+
+    assert response.status_code == 200
+    assert received == [90]
+
+
+def test_other_paths_are_not_limited():
+    received = []
+    client = create_client(received)
+
+    response = client.post("/other", data=b"x" * 1000)
+
+    assert response.status_code == 200
+    assert received == [1000]
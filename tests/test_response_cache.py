@@ -0,0 +1,153 @@
+# Python
+import re
+
+# Third-party libraries
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.testclient import TestClient
+
+# Project
+from ratings.response_cache import company_tag
+from ratings.response_cache.cache import ResponseCache, strong_etag
+from ratings.response_cache.memory import MemoryBackend
+from ratings.response_cache.middleware import (
+    CacheRule,
+    ResponseCacheMiddleware,
+    etag_matches,
+)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(backend=MemoryBackend(max_entries=10), ttl=60)
+
+
+@pytest.fixture
+def client(calls, cache):
+    app = Starlette()
+
+    @app.route("/companies/{company_id:int}/ratings")
+    async def ratings(request: Request):
+        calls.append(request.url.path)
+        company_id = request.path_params["company_id"]
+        if company_id == 404:
+            return JSONResponse({"detail": "Company Not Found"}, status_code=404)
+        return JSONResponse({"company_id": company_id})
+
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=cache,
+        rules=[
+            CacheRule(
+                re.compile(r"/companies/(?P<id>\d+)/ratings"),
+                lambda match, query: [company_tag(int(match["id"]))],
+            )
+        ],
+        cache_control="no-cache",
+    )
+    return TestClient(app)
+
+
+def test_second_request_is_served_from_the_cache(client, calls):
+    first = client.get("/companies/1/ratings")
+    second = client.get("/companies/1/ratings")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json() == {"company_id": 1}
+    assert second.headers["etag"] == first.headers["etag"]
+    assert first.headers["etag"] == strong_etag(first.content)
+    assert second.headers["cache-control"] == "no-cache"
+    assert second.headers["content-type"] == "application/json"
+    assert len(calls) == 1
+
+
+def test_query_parameters_are_part_of_the_key_in_any_order(client, calls):
+    client.get("/companies/1/ratings?a=1&b=2")
+    same = client.get("/companies/1/ratings?b=2&a=1")
+    other = client.get("/companies/1/ratings?a=2&b=2")
+
+    assert same.headers["x-cache"] == "HIT"
+    assert other.headers["x-cache"] == "MISS"
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("cache_status", ["HIT", "MISS"])
+def test_matching_if_none_match_gets_a_304_without_a_body(client, cache, cache_status):
+    etag = client.get("/companies/1/ratings").headers["etag"]
+    if cache_status == "MISS":
+        # A response just computed is compared too
+        cache.invalidate([company_tag(1)])
+
+    response = client.get("/companies/1/ratings", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["x-cache"] == cache_status
+
+
+def test_stale_if_none_match_gets_the_response(client):
+    client.get("/companies/1/ratings")
+
+    response = client.get("/companies/1/ratings", headers={"If-None-Match": '"old"'})
+
+    assert response.status_code == 200
+    assert response.json()["company_id"] == 1
+
+
+def test_responses_other_than_200_are_not_cached(client, calls):
+    first = client.get("/companies/404/ratings")
+    second = client.get("/companies/404/ratings")
+
+    assert first.status_code == second.status_code == 404
+    assert "x-cache" not in second.headers
+    assert second.json() == {"detail": "Company Not Found"}
+    assert len(calls) == 2
+
+
+def test_invalidated_tag_gives_a_new_key(client, cache, calls):
+    client.get("/companies/1/ratings")
+    client.get("/companies/2/ratings")
+
+    cache.invalidate([company_tag(1)])
+    invalidated = client.get("/companies/1/ratings")
+    other = client.get("/companies/2/ratings")
+
+    assert invalidated.headers["x-cache"] == "MISS"
+    assert len(calls) == 3
+    assert other.headers["x-cache"] == "HIT"
+    assert client.get("/companies/1/ratings").headers["x-cache"] == "HIT"
+
+
+def test_other_methods_are_not_cached(client, calls):
+    client.head("/companies/1/ratings")
+    response = client.head("/companies/1/ratings")
+
+    assert "x-cache" not in response.headers
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('"xyz",W/"abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+        ("abc", False),
+        ('"ABC"', False),
+        ("", False),
+    ],
+)
+def test_etag_matches(if_none_match, matches):
+    assert etag_matches(if_none_match, '"abc"') is matches
@@ -0,0 +1,98 @@
+# Python
+import asyncio
+
+# Third-party libraries
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import ANY, Stubber
+
+# Project
+from ratings.storage.s3 import S3Storage, S3Writer
+
+
+@pytest.fixture
+def storage():
+    return S3Storage(
+        bucket="documents",
+        prefix="documents/",
+        endpoint_url="http://s3.test",
+        public_endpoint_url=None,
+        region="us-east-1",
+        access_key_id="key",
+        secret_access_key="secret",
+        part_size=5 * 1024 * 1024,
+        url_expiration=300,
+    )
+
+
+def write_and_commit(writer: S3Writer):
+    async def run():
+        await writer.write(b"%PDF-1.4")
+        await writer.commit("cv_digest.pdf")
+
+    asyncio.run(run())
+
+
+def stub_upload(stubber: Stubber):
+    staging = {"Bucket": "documents", "Key": "documents/.staging/cv", "UploadId": "1"}
+    stubber.add_response(
+        "upload_part", {"ETag": '"etag"'}, {**staging, "PartNumber": 1, "Body": ANY}
+    )
+    stubber.add_response(
+        "complete_multipart_upload", {}, {**staging, "MultipartUpload": ANY}
+    )
+
+
+def test_abort_before_completing_aborts_the_multipart_upload(storage):
+    writer = S3Writer(storage, staging_key="documents/.staging/cv", upload_id="1")
+
+    with Stubber(storage.client) as stubber:
+        stubber.add_response(
+            "abort_multipart_upload",
+            {},
+            {"Bucket": "documents", "Key": "documents/.staging/cv", "UploadId": "1"},
+        )
+        asyncio.run(writer.abort())
+        stubber.assert_no_pending_responses()
+
+
+def test_abort_after_a_failed_copy_deletes_the_staging_object(storage):
+    writer = S3Writer(storage, staging_key="documents/.staging/cv", upload_id="1")
+
+    with Stubber(storage.client) as stubber:
+        stub_upload(stubber)
+        stubber.add_client_error("copy_object", "InternalError")
+        stubber.add_response(
+            "delete_object", {}, {"Bucket": "documents", "Key": "documents/.staging/cv"}
+        )
+
+        with pytest.raises(ClientError) as error:
+            write_and_commit(writer)
+        assert error.value.response["Error"]["Code"] == "InternalError"
+
+        asyncio.run(writer.abort())
+        stubber.assert_no_pending_responses()
+
+
+def test_commit_publishes_the_file_and_deletes_the_staging_object(storage):
+    writer = S3Writer(storage, staging_key="documents/.staging/cv", upload_id="1")
+
+    with Stubber(storage.client) as stubber:
+        stub_upload(stubber)
+        stubber.add_response(
+            "copy_object",
+            {},
+            {
+                "Bucket": "documents",
+                "Key": "documents/cv_digest.pdf",
+                "CopySource": {"Bucket": "documents", "Key": "documents/.staging/cv"},
+                "ContentType": "application/pdf",
+                "MetadataDirective": "REPLACE",
+            },
+        )
+        stubber.add_response(
+            "delete_object", {}, {"Bucket": "documents", "Key": "documents/.staging/cv"}
+        )
+
+        write_and_commit(writer)
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,185 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import column, create_engine, select, table
+from sqlalchemy.dialects import postgresql
+
+# Project
+from ratings.cruds import crud
+from ratings.utils import enums
+
+
+# The salaries are Numeric, which SQLite returns as floats
+pytestmark = pytest.mark.filterwarnings("ignore:Dialect sqlite")
+
+FX_RATES = {"USD": 1, "EUR": 1.25, "MXN": 0.05}
+
+EVALUATIONS = table(
+    "company_evaluations",
+    column("salary"),
+    column("salary_frequency"),
+    column("currency_type"),
+)
+
+
+@pytest.fixture(autouse=True)
+def fx_rates(monkeypatch):
+    monkeypatch.setattr(crud, "SALARY_FX_RATES", FX_RATES)
+
+
+@pytest.fixture
+def connection():
+    """SQLite connection with the salary columns of company_evaluations"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE company_evaluations "
+            "(salary NUMERIC, salary_frequency TEXT, currency_type TEXT)"
+        )
+        yield connection
+
+
+def yearly_salaries(connection, currency, *salaries):
+    for salary, frequency, currency_type in salaries:
+        connection.execute(
+            EVALUATIONS.insert().values(
+                salary=salary, salary_frequency=frequency, currency_type=currency_type
+            )
+        )
+    return [
+        salary for (salary,) in connection.execute(select(crud.yearly_salary(currency)))
+    ]
+
+
+@pytest.mark.parametrize(
+    "frequency, salary, yearly",
+    [
+        ("Hour", 10, 20800),
+        ("Day", 100, 26000),
+        ("Week", 500, 26000),
+        ("Month", 2000, 24000),
+        ("Year", 30000, 30000),
+    ],
+)
+def test_salaries_are_made_yearly(connection, frequency, salary, yearly):
+    (result,) = yearly_salaries(
+        connection, enums.CurrencyCodeISO4217.usd, (salary, frequency, "USD")
+    )
+
+    assert result == pytest.approx(yearly)
+
+
+@pytest.mark.parametrize(
+    "currency_type, currency, yearly",
+    [
+        ("MXN", enums.CurrencyCodeISO4217.usd, 12000 * 0.05),
+        ("USD", enums.CurrencyCodeISO4217.mxn, 12000 / 0.05),
+        ("EUR", enums.CurrencyCodeISO4217.mxn, 12000 * 1.25 / 0.05),
+        ("MXN", enums.CurrencyCodeISO4217.mxn, 12000),
+    ],
+)
+def test_salaries_are_converted_to_the_currency(
+    connection, currency_type, currency, yearly
+):
+    (result,) = yearly_salaries(connection, currency, (1000, "Month", currency_type))
+
+    assert result == pytest.approx(yearly)
+
+
+def test_salaries_in_currencies_without_exchange_rate_are_left_out(connection):
+    salaries = yearly_salaries(
+        connection,
+        enums.CurrencyCodeISO4217.usd,
+        (1000, "Month", "CLP"),
+        (1000, "Month", "USD"),
+        (None, "Month", "USD"),
+    )
+
+    assert salaries == [None, 12000, None]
+
+
+def test_currency_without_exchange_rate_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        crud.get_company_salary_insights(
+            db=None,
+            company_id=1,
+            job_title=None,
+            currency=enums.CurrencyCodeISO4217.cop,
+        )
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Currency Without Exchange Rate"
+
+
+def test_insights_query_aggregates_every_job_title_and_all_of_them_together():
+    statement = crud.select_company_salary_insights(
+        company_id=1,
+        job_title=" backend developer",
+        currency=enums.CurrencyCodeISO4217.usd,
+    )
+
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = " ".join(str(compiled).split())
+
+    assert "GROUP BY GROUPING SETS((company_evaluations.job_title), ())" in sql
+    assert "percentile_cont(%(percentile_cont_2)s) WITHIN GROUP" in sql
+    assert "Backend Developer" in compiled.params.values()
+
+
+def insights_row(job_title, total_salaries, p25=None, median=None, p75=None):
+    return SimpleNamespace(
+        job_title=job_title,
+        all_job_titles=int(job_title is None),
+        total_salaries=total_salaries,
+        p25=p25,
+        median=median,
+        p75=p75,
+    )
+
+
+def test_insights_have_the_percentiles_of_all_and_every_job_title():
+    rows = [
+        insights_row(None, 3, 10000.123, 20000, 30000.456),
+        insights_row("Backend Developer", 2, 15000, 20000, 25000),
+        insights_row("Designer", 1, 30000, 30000, 30000),
+    ]
+
+    insights = crud.build_salary_insights(rows, enums.CurrencyCodeISO4217.usd)
+
+    assert insights == {
+        "currency": "USD",
+        "frequency": "Year",
+        "total_salaries": 3,
+        "p25": 10000.12,
+        "median": 20000,
+        "p75": 30000.46,
+        "job_titles": [
+            {
+                "job_title": "Backend Developer",
+                "total_salaries": 2,
+                "p25": 15000,
+                "median": 20000,
+                "p75": 25000,
+            },
+            {
+                "job_title": "Designer",
+                "total_salaries": 1,
+                "p25": 30000,
+                "median": 30000,
+                "p75": 30000,
+            },
+        ],
+    }
+
+
+def test_insights_without_salaries_have_no_percentiles():
+    insights = crud.build_salary_insights(
+        [insights_row(None, 0)], enums.CurrencyCodeISO4217.eur
+    )
+
+    assert insights["total_salaries"] == 0
+    assert insights["median"] is None
+    assert insights["job_titles"] == []
@@ -0,0 +1,65 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+
+# Project
+from ratings.cruds import crud
+
+
+class Row(tuple):
+    """Row of select_company_evaluations_search"""
+
+    @property
+    def total(self):
+        return self[2]
+
+
+class SearchSession:
+    """Session that returns the rows of the page and then the total of matches"""
+
+    def __init__(self, rows, total):
+        self.rows = rows
+        self.total = total
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+        return SimpleNamespace(all=lambda: self.rows, scalar_one=lambda: self.total)
+
+
+@pytest.mark.parametrize("page, total", [(1, 0), (4, 5)])
+def test_empty_page_reports_the_total_of_matches(page, total):
+    db = SearchSession(rows=[], total=total)
+
+    result = crud.search_company_evaluations(
+        db, search="remote work", company_id=1, page=page, size=2
+    )
+
+    assert result == {"items": [], "total": total, "page": page, "size": 2}
+    # The first page can't be past the last match
+    assert len(db.statements) == (1 if page == 1 else 2)
+    if page > 1:
+        assert "count(company_evaluations.id)" in db.statements[1]
+        assert "company_evaluations.company_id = " in db.statements[1]
+
+
+def test_total_is_not_counted_again_for_a_page_with_matches(monkeypatch):
+    monkeypatch.setattr(
+        crud.schemas.CompanyEvaluationOut, "from_orm", lambda evaluation: evaluation
+    )
+    evaluation = SimpleNamespace(dict=lambda: {"id": 7})
+    db = SearchSession(
+        rows=[Row((evaluation, 0.5, 3, "\x02remote\x03 <work>"))], total=0
+    )
+
+    result = crud.search_company_evaluations(
+        db, search="remote", company_id=None, page=2, size=1
+    )
+
+    assert result["total"] == 3
+    assert result["items"] == [
+        {"id": 7, "rank": 0.5, "snippet": "<mark>remote</mark> &lt;work&gt;"}
+    ]
+    assert len(db.statements) == 1
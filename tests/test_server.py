@@ -0,0 +1,83 @@
+# Python
+import logging
+
+# Third-party libraries
+import pytest
+
+# Project
+from ratings.config import server
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Record the options of the servers started, without starting them"""
+    started = []
+
+    class RecordingServer:
+        def __init__(self, options):
+            self.options = options
+
+        def run(self):
+            started.append(self.options)
+
+    monkeypatch.setattr(server, "ProductionServer", RecordingServer)
+    monkeypatch.setattr(server, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(server, "RESPONSE_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(server, "DB_MAX_CONNECTIONS_PER_PROCESS", 10)
+    monkeypatch.setattr(server, "SERVER_DB_CONNECTIONS", 40)
+    return started
+
+
+def test_workers_are_started_with_the_server_options(started):
+    server.run_production("127.0.0.1", 8000, workers=4)
+
+    (options,) = started
+    assert options["bind"] == "127.0.0.1:8000"
+    assert options["workers"] == 4
+    assert options["worker_class"] == "ratings.config.server.RatingsUvicornWorker"
+    assert options["graceful_timeout"] == server.SERVER_GRACEFUL_TIMEOUT
+    assert options["when_ready"] is server.dispose_preloaded_connections
+
+
+def test_memory_cache_with_several_workers_is_refused(started, monkeypatch):
+    monkeypatch.setattr(server, "RESPONSE_CACHE_BACKEND", "memory")
+
+    with pytest.raises(RuntimeError, match="RESPONSE_CACHE_BACKEND=redis"):
+        server.run_production("127.0.0.1", 8000, workers=2)
+
+    assert started == []
+
+
+@pytest.mark.parametrize(
+    "backend, enabled, workers",
+    [
+        ("memory", True, 1),
+        ("memory", False, 4),
+        ("redis", True, 4),
+    ],
+)
+def test_cache_shared_or_in_one_worker_is_allowed(
+    started, monkeypatch, backend, enabled, workers
+):
+    monkeypatch.setattr(server, "RESPONSE_CACHE_BACKEND", backend)
+    monkeypatch.setattr(server, "RESPONSE_CACHE_ENABLED", enabled)
+
+    server.run_production("127.0.0.1", 8000, workers=workers)
+
+    assert started[0]["workers"] == workers
+
+
+def test_workers_over_the_connection_budget_are_warned(started, caplog):
+    with caplog.at_level(logging.WARNING, logger=server.__name__):
+        server.run_production("127.0.0.1", 8000, workers=5)
+
+    assert "5 workers can open up to 50 database connections" in caplog.text
+    assert "40 of SERVER_DB_CONNECTIONS" in caplog.text
+    assert len(started) == 1
+
+
+def test_workers_within_the_connection_budget_are_not_warned(started, caplog):
+    with caplog.at_level(logging.WARNING, logger=server.__name__):
+        server.run_production("127.0.0.1", 8000, workers=4)
+
+    assert caplog.records == []
@@ -0,0 +1,115 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+# Project
+from ratings.cruds import crud
+from ratings.models import models
+from ratings.utils.utils import TRACKING_CODE_ALPHABET, TRACKING_CODE_LENGTH, Util
+
+
+def integrity_error(constraint_name):
+    """IntegrityError as raised by psycopg2 for a violated constraint"""
+    orig = Exception(f'duplicate key value violates "{constraint_name}"')
+    orig.diag = SimpleNamespace(constraint_name=constraint_name)
+    return IntegrityError("INSERT INTO applicants", {}, orig)
+
+
+class Savepoint:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        self.session.savepoints += 1
+
+    def __exit__(self, *exc_info):
+        # The applicant is flushed when the savepoint is released
+        if self.session.errors:
+            self.session.rolled_back += 1
+            raise self.session.errors.pop(0)
+
+
+class SavepointSession:
+    """Session whose savepoints fail with the planned errors, then succeed"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.savepoints = 0
+        self.rolled_back = 0
+        self.added = []
+
+    def begin_nested(self):
+        return Savepoint(self)
+
+    def add(self, applicant):
+        self.added.append(applicant.tracking_code)
+
+
+@pytest.fixture
+def codes(monkeypatch):
+    codes = iter(["CODE0001", "CODE0002", "CODE0003", "CODE0004", "CODE0005"])
+    monkeypatch.setattr(Util, "create_tracking_code", lambda: next(codes))
+    monkeypatch.setattr(crud, "TRACKING_CODE_MAX_ATTEMPTS", 3)
+
+
+def test_applicant_is_inserted_with_a_new_tracking_code(codes):
+    db = SavepointSession()
+    applicant = models.Applicant()
+
+    crud.add_applicant(db, applicant)
+
+    assert applicant.tracking_code == "CODE0001"
+    assert db.savepoints == 1
+
+
+def test_taken_tracking_code_is_retried_with_a_new_one(codes):
+    db = SavepointSession(
+        integrity_error("tracking_code_unique"), integrity_error("tracking_code_unique")
+    )
+    applicant = models.Applicant()
+
+    crud.add_applicant(db, applicant)
+
+    assert applicant.tracking_code == "CODE0003"
+    assert db.added == ["CODE0001", "CODE0002", "CODE0003"]
+    assert db.rolled_back == 2
+
+
+def test_taken_tracking_codes_are_raised_after_every_attempt(codes):
+    db = SavepointSession(*[integrity_error("tracking_code_unique")] * 4)
+
+    with pytest.raises(IntegrityError) as error:
+        crud.add_applicant(db, models.Applicant())
+
+    assert crud.is_tracking_code_collision(error.value)
+    assert db.savepoints == 3
+
+
+@pytest.mark.parametrize(
+    "constraint_name", ["applicants_vacancy_id_fkey", "applicants_pkey", None]
+)
+def test_other_integrity_errors_are_not_retried(codes, constraint_name):
+    db = SavepointSession(integrity_error(constraint_name))
+
+    with pytest.raises(IntegrityError):
+        crud.add_applicant(db, models.Applicant())
+
+    assert db.savepoints == 1
+
+
+def test_integrity_error_without_diagnostics_is_not_a_collision():
+    error = IntegrityError("INSERT", {}, Exception("tracking_code_unique"))
+
+    assert not crud.is_tracking_code_collision(error)
+
+
+def test_tracking_code_is_random_from_the_alphabet():
+    codes = {Util.create_tracking_code() for _ in range(100)}
+
+    assert len(codes) == 100
+    for code in codes:
+        assert len(code) == TRACKING_CODE_LENGTH
+        assert set(code) <= set(TRACKING_CODE_ALPHABET)
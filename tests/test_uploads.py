@@ -0,0 +1,124 @@
+# Python
+import asyncio
+import hashlib
+import io
+
+# Third-party libraries
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.exc import OperationalError
+
+# Project
+from ratings.utils import uploads
+from ratings.utils.uploads import StagedUploads
+
+
+class RecordingWriter:
+    def __init__(self, events, prefix, fail_commit=False):
+        self.events = events
+        self.prefix = prefix
+        self.fail_commit = fail_commit
+        self.content = b""
+
+    async def write(self, chunk: bytes):
+        self.content += chunk
+
+    async def commit(self, name: str):
+        if self.fail_commit:
+            raise OSError("disk full")
+        self.events.append(("commit", name))
+
+    async def abort(self):
+        self.events.append(("abort", self.prefix))
+
+
+class RecordingStorage:
+    def __init__(self, failing_commits=()):
+        self.events = []
+        self.failing_commits = set(failing_commits)
+
+    async def create_writer(self, prefix: str) -> RecordingWriter:
+        return RecordingWriter(self.events, prefix, prefix in self.failing_commits)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = RecordingStorage()
+    monkeypatch.setattr(uploads, "storage", storage)
+    return storage
+
+
+def pdf_upload(content: bytes = b"%PDF-1.4 document", content_type="application/pdf"):
+    return UploadFile(
+        filename="document.pdf", file=io.BytesIO(content), content_type=content_type
+    )
+
+
+def pdf_name(prefix: str, content: bytes = b"%PDF-1.4 document") -> str:
+    return f"{prefix}_{hashlib.sha256(content).hexdigest()}.pdf"
+
+
+def register(uploads_to_stage, insert=lambda: None):
+    """Stage the uploads and insert the record in a StagedUploads block"""
+
+    async def run():
+        async with StagedUploads() as documents:
+            names = [
+                await documents.stage(upload, prefix)
+                for prefix, upload in uploads_to_stage
+            ]
+            insert()
+        return names
+
+    return asyncio.run(run())
+
+
+def test_uploads_are_published_when_the_block_succeeds(storage):
+    names = register([("cv", pdf_upload()), ("ml", pdf_upload(b"%PDF-1.7"))])
+
+    assert names == [pdf_name("cv"), pdf_name("ml", b"%PDF-1.7")]
+    assert storage.events == [("commit", names[0]), ("commit", names[1])]
+
+
+def test_failed_insert_publishes_nothing(storage):
+    def insert():
+        raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+    with pytest.raises(OperationalError):
+        register([("cv", pdf_upload()), ("ml", pdf_upload())], insert)
+
+    assert storage.events == [("abort", "cv"), ("abort", "ml")]
+
+
+@pytest.mark.parametrize(
+    "upload, status_code",
+    [
+        (pdf_upload(b"not a pdf"), 400),
+        (pdf_upload(content_type="text/plain"), 400),
+        (pdf_upload(b"%PDF-" + b"x" * 20), 413),
+    ],
+)
+def test_rejected_second_upload_aborts_the_first(
+    storage, monkeypatch, upload, status_code
+):
+    monkeypatch.setattr(uploads, "UPLOAD_MAX_SIZE", 20)
+
+    with pytest.raises(HTTPException) as error:
+        register([("cv", pdf_upload()), ("ml", upload)])
+
+    assert error.value.status_code == status_code
+    assert ("commit", pdf_name("cv")) not in storage.events
+    assert ("abort", "cv") in storage.events
+
+
+def test_failed_publication_aborts_the_uploads_left(storage):
+    storage.failing_commits = {"ml"}
+
+    with pytest.raises(OSError):
+        register([("cv", pdf_upload()), ("ml", pdf_upload()), ("xx", pdf_upload())])
+
+    assert storage.events == [
+        ("commit", pdf_name("cv")),
+        ("abort", "ml"),
+        ("abort", "xx"),
+    ]
@@ -0,0 +1,165 @@
+# Python
+import asyncio
+
+# Third-party libraries
+import httpx
+import pytest
+
+# Project
+from ratings.clients import upstream
+from ratings.clients.upstream import UpstreamClient
+
+
+URL = "http://companies/api/v1/companies/1"
+
+
+class Upstream:
+    """Upstream service answering the planned responses, then 200"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0) if self.responses else 200
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(response, json={"id": 1}, request=request)
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Record the backoff delays, sleeping for the longest delay possible"""
+    delays = []
+
+    async def asleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(upstream.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(upstream.time, "sleep", delays.append)
+    monkeypatch.setattr(upstream.asyncio, "sleep", asleep)
+    return delays
+
+
+def create_client(service, retries=3):
+    client = UpstreamClient(
+        timeout=1,
+        retries=retries,
+        backoff=0.1,
+        max_connections=1,
+        max_keepalive_connections=1,
+    )
+    transport = httpx.MockTransport(service)
+    client._client = httpx.Client(transport=transport)
+    client._get_async_client = lambda: httpx.AsyncClient(transport=transport)
+    return client
+
+
+def request(client, mode, method="GET", **kwargs):
+    if mode == "async":
+        return asyncio.run(client.arequest(method, URL, **kwargs))
+    return client.request(method, URL, **kwargs)
+
+
+MODES = ["sync", "async"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize(
+    "failure",
+    [503, 429, 502, 504, httpx.ConnectError("refused"), httpx.ReadTimeout("slow")],
+)
+def test_failed_get_is_retried(mode, failure, delays):
+    service = Upstream(failure, failure)
+
+    response = request(create_client(service), mode)
+
+    assert response.status_code == 200
+    assert len(service.requests) == 3
+    assert delays == [pytest.approx(0.1), pytest.approx(0.2)]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_backoff_is_exponential_with_full_jitter(mode, delays, monkeypatch):
+    bounds = []
+    monkeypatch.setattr(
+        upstream.random, "uniform", lambda low, high: bounds.append((low, high)) or 0
+    )
+    service = Upstream(503, 503, 503)
+
+    request(create_client(service), mode)
+
+    assert bounds == [
+        (0, pytest.approx(0.1)),
+        (0, pytest.approx(0.2)),
+        (0, pytest.approx(0.4)),
+    ]
+    assert delays == [0, 0, 0]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_last_error_is_raised_after_every_retry(mode, delays):
+    service = Upstream(503, 503, 503, 503)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        request(create_client(service), mode)
+
+    assert error.value.response.status_code == 503
+    assert len(service.requests) == 4
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_transport_error_is_raised_after_every_retry(mode, delays):
+    service = Upstream(*[httpx.ConnectError("refused")] * 4)
+
+    with pytest.raises(httpx.ConnectError):
+        request(create_client(service), mode)
+
+    assert len(service.requests) == 4
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("status_code", [400, 404, 500])
+def test_other_errors_are_not_retried(mode, status_code, delays):
+    service = Upstream(status_code)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        request(create_client(service), mode)
+
+    assert len(service.requests) == 1
+    assert delays == []
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_post_without_idempotency_key_is_not_retried(mode, delays):
+    service = Upstream(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        request(create_client(service), mode, "POST", json={})
+
+    assert len(service.requests) == 1
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_post_with_idempotency_key_is_retried(mode, delays):
+    service = Upstream(503)
+
+    response = request(
+        create_client(service),
+        mode,
+        "POST",
+        json={},
+        headers={"Idempotency-Key": "abc"},
+    )
+
+    assert response.status_code == 200
+    assert len(service.requests) == 2
+    assert service.requests[1].headers["Idempotency-Key"] == "abc"
+
+
+def test_json_helpers_return_the_body(delays):
+    client = create_client(Upstream(503))
+
+    assert client.get_json(URL) == {"id": 1}
+    assert asyncio.run(client.aget_json(URL)) == {"id": 1}
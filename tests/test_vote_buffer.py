@@ -0,0 +1,204 @@
+# Python
+from types import SimpleNamespace
+
+# Third-party libraries
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+# Project
+from ratings.cruds import crud, vote_buffer
+from ratings.cruds.vote_buffer import VoteBuffer, buffer_evaluation_vote
+from ratings.response_cache import company_tag
+
+
+class UpdateSession:
+    """Session that returns the row of the UPDATE and records the commits"""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(first=lambda: self.row)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(
+        crud.response_cache, "invalidate", lambda tags: invalidated.extend(tags)
+    )
+    return invalidated
+
+
+def compile_postgresql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+# Atomic votes
+
+
+@pytest.mark.parametrize("counter", ["utility_counter", "non_utility_counter"])
+def test_vote_increases_the_counter_in_the_update_statement(counter):
+    sql = compile_postgresql(crud.increment_evaluation_counter_statement(1, counter))
+
+    assert sql.startswith("UPDATE company_evaluations SET")
+    assert f"{counter}=(coalesce(company_evaluations.{counter}, " in sql
+    assert "WHERE company_evaluations.id = " in sql
+    assert "RETURNING company_evaluations.id" in sql
+    assert "SELECT" not in sql
+
+
+def test_vote_returns_the_updated_evaluation_and_invalidates_its_company(
+    invalidated,
+):
+    row = SimpleNamespace(id=1, company_id=7, utility_counter=5)
+    db = UpdateSession(row)
+
+    company_evaluation = crud.increse_evaluation_utility_rating(
+        db=db, company_evaluation_id=1
+    )
+
+    assert company_evaluation is row
+    assert len(db.statements) == 1
+    assert db.commits == 1
+    assert invalidated == [company_tag(7)]
+
+
+def test_vote_of_a_missing_evaluation_returns_none(invalidated):
+    db = UpdateSession(None)
+
+    assert crud.increase_evaluation_non_utility_rating(db, 1) is None
+    assert invalidated == []
+
+
+def test_votes_of_many_evaluations_are_added_in_one_statement(invalidated):
+    class VotesSession(UpdateSession):
+        def execute(self, statement):
+            self.statements.append(statement)
+            return SimpleNamespace(scalars=lambda: iter([7, 7, 8]))
+
+    db = VotesSession(None)
+
+    crud.add_evaluation_votes(
+        db, votes={1: {"utility_counter": 2}, 2: {"non_utility_counter": 1}}
+    )
+
+    (statement,) = db.statements
+    sql = compile_postgresql(statement)
+    assert sql.startswith("UPDATE company_evaluations SET")
+    assert "FROM (VALUES " in sql
+    assert db.commits == 1
+    assert sorted(invalidated) == [company_tag(7), company_tag(8)]
+
+
+# Buffered votes
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Record the votes written by the flushes, failing while written.fail is set"""
+    written = SimpleNamespace(votes=[], fail=False)
+
+    def add_evaluation_votes(db, votes):
+        if written.fail:
+            raise OperationalError("UPDATE", {}, Exception("connection lost"))
+        written.votes.append({id: dict(counters) for id, counters in votes.items()})
+
+    monkeypatch.setattr(crud, "add_evaluation_votes", add_evaluation_votes)
+    monkeypatch.setattr(
+        vote_buffer, "SessionLocal", lambda: SimpleNamespace(close=lambda: None)
+    )
+    return written
+
+
+def test_votes_are_coalesced_and_written_by_one_flush(written):
+    buffer = VoteBuffer(flush_interval=60, max_pending=100)
+
+    buffer.add(1, "utility_counter")
+    buffer.add(1, "utility_counter")
+    buffer.add(1, "non_utility_counter")
+    buffer.add(2, "utility_counter")
+    assert buffer.pending(1) == {"utility_counter": 2, "non_utility_counter": 1}
+
+    buffer.flush()
+    buffer.flush()
+
+    assert written.votes == [
+        {
+            1: {"utility_counter": 2, "non_utility_counter": 1},
+            2: {"utility_counter": 1},
+        }
+    ]
+    assert buffer.pending(1) == {}
+
+
+def test_votes_of_a_failed_flush_are_written_by_the_next_one(written):
+    buffer = VoteBuffer(flush_interval=60, max_pending=100)
+    buffer.add(1, "utility_counter")
+
+    written.fail = True
+    buffer.flush()
+    assert buffer.pending(1) == {"utility_counter": 1}
+
+    buffer.add(1, "utility_counter")
+    written.fail = False
+    buffer.flush()
+
+    assert written.votes == [{1: {"utility_counter": 2}}]
+
+
+def test_flush_is_requested_once_max_pending_votes_wait(written):
+    buffer = VoteBuffer(flush_interval=60, max_pending=3)
+
+    buffer.add(1, "utility_counter")
+    buffer.add(2, "utility_counter")
+    assert not buffer._flush_requested.is_set()
+
+    buffer.add(3, "utility_counter")
+    assert buffer._flush_requested.is_set()
+
+
+def test_stop_writes_the_pending_votes(written):
+    buffer = VoteBuffer(flush_interval=60, max_pending=100)
+    buffer.start()
+    buffer.add(1, "utility_counter")
+
+    buffer.stop()
+
+    assert written.votes == [{1: {"utility_counter": 1}}]
+
+
+def test_buffered_vote_returns_the_counters_with_the_pending_votes(
+    written, monkeypatch
+):
+    buffer = VoteBuffer(flush_interval=60, max_pending=100)
+    monkeypatch.setattr(vote_buffer, "vote_buffer", buffer)
+    monkeypatch.setattr(
+        vote_buffer.schemas.CompanyEvaluationOut,
+        "from_orm",
+        lambda evaluation: vote_buffer.schemas.CompanyEvaluationOut.construct(
+            **vars(evaluation)
+        ),
+    )
+    evaluation = SimpleNamespace(id=1, utility_counter=4, non_utility_counter=None)
+    monkeypatch.setattr(
+        crud,
+        "get_company_evaluation_by_id",
+        lambda db, id: evaluation if id == 1 else None,
+    )
+
+    buffer_evaluation_vote(None, 1, "utility_counter")
+    voted = buffer_evaluation_vote(None, 1, "non_utility_counter")
+
+    assert voted.utility_counter == 5
+    assert voted.non_utility_counter == 1
+    assert buffer_evaluation_vote(None, 2, "utility_counter") is None
+    assert buffer.pending(2) == {}
+    assert written.votes == []